@@ -2,19 +2,31 @@
 """Batch ingestion script for GitHub repositories into RAG system."""
 
 import argparse
+import asyncio
 import logging
+import pickle
+import queue
 import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
 
+from haystack import Document
 from rich.console import Console
 from rich.logging import RichHandler
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
 
 from src.config import Config
 from src.github_loader import GitHubRepositoryLoader
 from src.indexing_pipeline import IndexingPipeline
 
+if TYPE_CHECKING:
+    from rich.progress import Progress, TaskID
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +36,239 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Minimum seconds between progress description refreshes
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+# Maximum number of loaded repositories waiting to be indexed
+DOCUMENT_QUEUE_SIZE = 32
+
+
+def iter_repo_identifiers(repos_file: Path) -> Iterator[str]:
+    """Lazily yield repository identifiers from a file, skipping blanks and comments."""
+    with open(repos_file, "r") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                yield line.strip()
+
+
+class DocumentSpillFile:
+    """Append-only pickle stream of per-repository document lists in a temporary file.
+
+    Lets a batch larger than RAM be loaded completely before indexing starts.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._lock = threading.Lock()
+
+    def put(self, documents: List[Document]) -> None:
+        """Append one repository's documents to the stream."""
+        data = pickle.dumps(documents, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._file.write(data)
+
+    def __iter__(self) -> Iterator[List[Document]]:
+        """Read the document lists back in the order they were written."""
+        self._file.seek(0)
+        while True:
+            try:
+                yield pickle.load(self._file)
+            except EOFError:
+                return
+
+    def __enter__(self) -> "DocumentSpillFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._file.close()
+
+
+def iter_documents(
+    document_lists: Iterable[List[Document]], categories: Counter
+) -> Iterator[Document]:
+    """Flatten per-repository document lists, counting each document's category."""
+    for documents in document_lists:
+        categories.update(doc.meta.get("category", "unknown") for doc in documents)
+        yield from documents
+
+
+def index_document_lists(
+    pipeline: IndexingPipeline,
+    document_lists: Iterable[List[Document]],
+    batch_size: int,
+    workers: int,
+    bulk_mode: bool,
+    recreate: bool,
+    categories: Counter,
+) -> Dict[str, Any]:
+    """Set up the document store once the first document arrives, then index the stream.
+
+    Deferring the setup means --clear-store never drops the collection for a batch in which
+    every repository failed to load.
+
+    Args:
+        pipeline: Indexing pipeline
+        document_lists: Per-repository document lists
+        batch_size: Number of documents to split, embed and write per batch
+        workers: Number of indexing processes
+        bulk_mode: Defer HNSW index construction until the upload finishes
+        recreate: Drop and recreate the collection before writing
+        categories: Counter that receives the category of each indexed document
+
+    Returns:
+        Aggregated processing results
+    """
+    documents = iter_documents(document_lists, categories)
+    first_document = next(documents, None)
+    if first_document is None:
+        logger.warning("No documents loaded; leaving the vector store untouched")
+        return {"documents_processed": 0, "chunks_created": 0, "chunks_written": 0}
+
+    if recreate:
+        logger.info("Clearing existing vector store...")
+    pipeline.setup_document_store(recreate=recreate)
+
+    return pipeline.process_documents_hierarchical_batched(
+        chain([first_document], documents),
+        batch_size=batch_size,
+        workers=workers,
+        bulk_mode=bulk_mode,
+    )
+
+
+def index_queued_documents(
+    pipeline: IndexingPipeline,
+    document_queue: "queue.Queue[Optional[List[Document]]]",
+    batch_size: int,
+    workers: int,
+    bulk_mode: bool,
+    recreate: bool,
+    categories: Counter,
+    stop_loading: threading.Event,
+) -> Dict[str, Any]:
+    """Index per-repository document lists from a queue until the None sentinel arrives.
+
+    Args:
+        pipeline: Indexing pipeline
+        document_queue: Queue of document lists, terminated by None
+        batch_size: Number of documents to split, embed and write per batch
+        workers: Number of indexing processes
+        bulk_mode: Defer HNSW index construction until the upload finishes
+        recreate: Drop and recreate the collection before writing
+        categories: Counter that receives the category of each indexed document
+        stop_loading: Set if indexing fails, telling the loaders to stop cloning
+
+    Returns:
+        Aggregated processing results
+    """
+    finished = False
+
+    def queued_document_lists() -> Iterator[List[Document]]:
+        nonlocal finished
+        yield from iter(document_queue.get, None)
+        finished = True
+
+    try:
+        return index_document_lists(
+            pipeline,
+            queued_document_lists(),
+            batch_size,
+            workers,
+            bulk_mode,
+            recreate,
+            categories,
+        )
+    except BaseException:
+        stop_loading.set()
+        raise
+    finally:
+        # Keep draining after a failure so loader threads never block on a full queue
+        while not finished and document_queue.get() is not None:
+            pass
+
+
+async def load_repositories(
+    loader: GitHubRepositoryLoader,
+    repo_identifiers: Iterable[str],
+    args: argparse.Namespace,
+    progress: "Progress",
+    task: "TaskID",
+    repo_stats: List[Dict[str, Any]],
+    document_sink: "queue.Queue[Optional[List[Document]]] | DocumentSpillFile",
+    stop_loading: Optional[threading.Event] = None,
+) -> None:
+    """Clone/load repositories concurrently, handing their documents to the indexer.
+
+    Args:
+        loader: Configured GitHub repository loader
+        repo_identifiers: Repository identifiers to process
+        args: Parsed command line arguments
+        progress: Progress display to update
+        task: Progress task ID
+        repo_stats: List that receives one status entry per repository
+        document_sink: Bounded queue consumed by the indexer, or an on-disk spill file
+        stop_loading: When set, workers stop picking up new repositories
+    """
+
+    async def load_repository(repo_identifier: str) -> Dict[str, Any]:
+        try:
+            documents, status = await loader.process_repository_async(
+                repo_identifier,
+                local_dir=loader.local_repos_dir,
+                force_clone=args.force_clone,
+                update_existing=not args.no_update,
+                max_documents=args.max_docs_per_repo,
+            )
+            # Blocks while the indexer is behind, bounding the documents held in memory
+            await asyncio.to_thread(document_sink.put, documents)
+
+            return {
+                "repo": repo_identifier,
+                "status": "✅ Success",
+                "documents": len(documents),
+                "message": status,
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing {repo_identifier}: {e}")
+            return {
+                "repo": repo_identifier,
+                "status": "❌ Failed",
+                "documents": 0,
+                "message": str(e),
+            }
+
+    repo_iter = iter(repo_identifiers)
+    completed = 0
+    last_update = 0.0
+
+    async def worker() -> None:
+        nonlocal completed, last_update
+        # Each worker pulls the next repository only when it is free, so a long repository
+        # list never turns into one pending task per line
+        for repo_identifier in repo_iter:
+            # The indexer failed, so anything cloned from here on would be thrown away
+            if stop_loading is not None and stop_loading.is_set():
+                logger.error("Indexing failed; not loading any more repositories")
+                return
+            stat = await load_repository(repo_identifier)
+            repo_stats.append(stat)
+            completed += 1
+
+            # Re-rendering the live display is costly, so cap description updates at ~10 Hz
+            now = time.monotonic()
+            if now - last_update > PROGRESS_UPDATE_INTERVAL:
+                progress.update(task, description=f"[{completed}] Processed {stat['repo']}")
+                last_update = now
+
+            progress.advance(task)
+
+    # Git runs as async subprocesses, so args.jobs workers bound concurrency without threads
+    await asyncio.gather(*(worker() for _ in range(max(1, args.jobs))))
+    progress.update(
+        task, total=completed, description=f"[{completed}/{completed}] Processed all repositories"
+    )
+
 
 def main():
     """Main entry point for GitHub batch ingestion."""
@@ -66,11 +311,59 @@ def main():
         default=10.0,
         help="Maximum file size in MB to process (default: 10MB, only .md files are processed)",
     )
+    parser.add_argument(
+        "--full-history",
+        action="store_true",
+        help="Clone full git history instead of a shallow, blob-filtered clone",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=16,
+        help="Number of repositories to clone/load concurrently (default: 16)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=2000,
+        help="Number of documents to split, embed and write per indexing batch (default: 2000)",
+    )
+    parser.add_argument(
+        "--index-workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes splitting/embedding/writing batches (default: 1). Each process "
+            "keeps up to OLLAMA_CONCURRENCY embedding requests in flight, so Ollama sees "
+            "workers x OLLAMA_CONCURRENCY concurrent requests"
+        ),
+    )
+    parser.add_argument(
+        "--bulk-mode",
+        action="store_true",
+        help="Defer building the HNSW index until all documents are uploaded",
+    )
+    parser.add_argument(
+        "--spill-to-disk",
+        action="store_true",
+        help="Hold loaded documents in a temporary file and index after all repos are loaded",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=["none", "scalar", "binary"],
+        help="Vector quantization for new collections (default: QDRANT_QUANTIZATION or none)",
+    )
 
     args = parser.parse_args()
 
+    # Progress and Table are only needed once arguments are parsed, so defer importing them
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.table import Table
+
     # Initialize configuration
     config = Config()
+    if args.quantization:
+        config.qdrant_quantization = args.quantization
 
     try:
         # Validate configuration
@@ -82,21 +375,21 @@ def main():
 
     # Resolve paths
     repos_file = Path(args.repos_file)
-    local_dir = Path(args.local_dir).expanduser()
+    local_dir = Path(args.local_dir).expanduser().resolve()
 
     if not repos_file.exists():
         console.print(f"[red]❌ Repository list file not found: {repos_file}[/red]")
         sys.exit(1)
 
-    # Read repository list
-    with open(repos_file, "r") as f:
-        repo_list = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    # Stream the repository list so work starts before the whole file is read
+    repo_identifiers = iter_repo_identifiers(repos_file)
+    first_repo = next(repo_identifiers, None)
 
-    if not repo_list:
+    if first_repo is None:
         console.print(f"[red]❌ No repositories found in {repos_file}[/red]")
         sys.exit(1)
 
-    console.print(f"[cyan]Loading {len(repo_list)} repositories from {repos_file}[/cyan]")
+    console.print(f"[cyan]Loading repositories from {repos_file}[/cyan]")
     console.print(f"[cyan]Local directory: {local_dir}[/cyan]")
     console.print("[cyan]Processing only: Markdown files (.md)[/cyan]")
     console.print()
@@ -105,55 +398,86 @@ def main():
     loader = GitHubRepositoryLoader(config)
     loader.local_repos_dir = local_dir
     loader.max_file_size_mb = args.max_file_size
+    loader.shallow_clone = not args.full_history
+
+    # Initialize indexing pipeline up front so documents are indexed as repositories finish.
+    # The document store is set up (and cleared) only once the first documents have loaded
+    pipeline = IndexingPipeline(config)
+
+    if args.clear_store:
+        console.print(
+            "[yellow]Existing vector store will be cleared once documents are loaded[/yellow]"
+        )
 
     # Process repositories
-    all_documents = []
-    repo_stats = []
+    repo_stats: List[Dict[str, Any]] = []
+    categories: Counter = Counter()
 
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        task = progress.add_task("Processing repositories...", total=len(repo_list))
-
-        for idx, repo_identifier in enumerate(repo_list, 1):
-            progress.update(
-                task, description=f"[{idx}/{len(repo_list)}] Processing {repo_identifier}..."
-            )
-
-            try:
-                # Process repository
-                documents, status = loader.process_repository(
-                    repo_identifier,
-                    local_dir=local_dir,
-                    force_clone=args.force_clone,
-                    update_existing=not args.no_update,
-                    max_documents=args.max_docs_per_repo,
+        task = progress.add_task("Processing repositories...", total=None)
+
+        if args.spill_to_disk:
+            # Park loaded documents on disk and index them once loading has finished
+            with DocumentSpillFile() as spill:
+                asyncio.run(
+                    load_repositories(
+                        loader,
+                        chain([first_repo], repo_identifiers),
+                        args,
+                        progress,
+                        task,
+                        repo_stats,
+                        spill,
+                    )
                 )
-
-                all_documents.extend(documents)
-                repo_stats.append(
-                    {
-                        "repo": repo_identifier,
-                        "status": "✅ Success",
-                        "documents": len(documents),
-                        "message": status,
-                    }
+                result = index_document_lists(
+                    pipeline,
+                    spill,
+                    args.batch_size,
+                    args.index_workers,
+                    args.bulk_mode,
+                    args.clear_store,
+                    categories,
                 )
-
-            except Exception as e:
-                logger.error(f"Error processing {repo_identifier}: {e}")
-                repo_stats.append(
-                    {
-                        "repo": repo_identifier,
-                        "status": "❌ Failed",
-                        "documents": 0,
-                        "message": str(e),
-                    }
+        else:
+            # Embed/write on a dedicated thread so indexing overlaps with cloning
+            document_queue: "queue.Queue[Optional[List[Document]]]" = queue.Queue(
+                maxsize=DOCUMENT_QUEUE_SIZE
+            )
+            stop_loading = threading.Event()
+            with ThreadPoolExecutor(max_workers=1) as indexer:
+                index_future = indexer.submit(
+                    index_queued_documents,
+                    pipeline,
+                    document_queue,
+                    args.batch_size,
+                    args.index_workers,
+                    args.bulk_mode,
+                    args.clear_store,
+                    categories,
+                    stop_loading,
                 )
-
-            progress.advance(task)
+                try:
+                    asyncio.run(
+                        load_repositories(
+                            loader,
+                            chain([first_repo], repo_identifiers),
+                            args,
+                            progress,
+                            task,
+                            repo_stats,
+                            document_queue,
+                            stop_loading,
+                        )
+                    )
+                finally:
+                    document_queue.put(None)
+
+                result = index_future.result()
 
     # Display results summary
     console.print()
@@ -179,33 +503,14 @@ def main():
     successful_repos = sum(1 for s in repo_stats if s["status"] == "✅ Success")
     console.print()
     console.print("[bold]Statistics:[/bold]")
-    console.print(f"  • Successful repositories: {successful_repos}/{len(repo_list)}")
-    console.print(f"  • Total documents loaded: {len(all_documents)}")
+    console.print(f"  • Successful repositories: {successful_repos}/{len(repo_stats)}")
+    console.print(f"  • Total documents loaded: {result['documents_processed']}")
 
-    if not all_documents:
+    if not result["documents_processed"]:
         console.print("[yellow]⚠️  No documents were loaded. Exiting.[/yellow]")
         sys.exit(0)
 
-    # Index documents
     console.print()
-    console.print("[cyan]Indexing documents into vector store...[/cyan]")
-
-    # Initialize indexing pipeline
-    pipeline = IndexingPipeline(config)
-
-    # Clear store if requested
-    if args.clear_store:
-        console.print("[yellow]Clearing existing vector store...[/yellow]")
-        pipeline.document_store = None
-        pipeline.setup_document_store()
-        # Force recreate
-        pipeline.document_store.recreate_index = True
-
-    pipeline.setup_document_store()
-
-    # Process with hierarchical splitting
-    result = pipeline.process_documents_hierarchical(all_documents)
-
     console.print(f"[green]✅ Created {result['chunks_created']} chunks[/green]")
     console.print(f"[green]✅ Indexed {result['chunks_written']} chunks successfully[/green]")
 
@@ -218,11 +523,6 @@ def main():
     console.print(f"  • Qdrant URL: {info['url']}")
 
     # Show category distribution
-    categories = {}
-    for doc in all_documents:
-        cat = doc.meta.get("category", "unknown")
-        categories[cat] = categories.get(cat, 0) + 1
-
     console.print()
     console.print("[bold]Repository Distribution in Vector Store:[/bold]")
     for cat, count in sorted(categories.items()):
@@ -4,10 +4,10 @@
 import argparse
 import logging
 import sys
+from collections import Counter
 
 from rich.console import Console
 from rich.logging import RichHandler
-from rich.table import Table
 
 from src.chat_interface import ChatInterface
 from src.config import Config
@@ -27,6 +27,9 @@ console = Console()
 
 def load_google_drive_folder(folder_id: str, config: Config, max_docs: int = None):
     """Load documents from Google Drive with hierarchical categorization."""
+    # Imported here so --chat-only startup doesn't pay for it
+    from rich.table import Table
+
     console.print(f"[cyan]Loading documents from Google Drive folder: {folder_id}[/cyan]")
     console.print("[cyan]Traversing folder hierarchy...[/cyan]")
 
@@ -66,10 +69,7 @@ def load_google_drive_folder(folder_id: str, config: Config, max_docs: int = Non
         console.print(table)
 
         # Show category distribution
-        categories = {}
-        for doc in documents:
-            cat = doc.meta.get("category", "root")
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(doc.meta.get("category", "root") for doc in documents)
 
         console.print("\n[bold]Category Distribution:[/bold]")
         for cat, count in sorted(categories.items()):
@@ -83,16 +83,19 @@ def load_google_drive_folder(folder_id: str, config: Config, max_docs: int = Non
         return None
 
 
-def index_documents(documents, config: Config):
+def index_documents(documents, config: Config, bulk_mode: bool = False, recreate: bool = False):
     """Index documents with hierarchical splitting."""
     console.print("\n[cyan]Indexing documents with hierarchical splitting...[/cyan]")
 
     # Initialize indexing pipeline
     pipeline = IndexingPipeline(config)
-    pipeline.setup_document_store()
+    pipeline.setup_document_store(recreate=recreate)
 
     # Process with hierarchical splitting
-    result = pipeline.process_documents_hierarchical(documents)
+    if bulk_mode:
+        result = pipeline.process_documents_hierarchical_batched(documents, bulk_mode=True)
+    else:
+        result = pipeline.process_documents_hierarchical(documents)
 
     console.print(f"[green]✅ Created {result['chunks_created']} chunks[/green]")
     console.print(f"[green]✅ Indexed {result['chunks_written']} chunks successfully[/green]")
@@ -130,11 +133,23 @@ def main():
         action="store_true",
         help="Clear the vector store before indexing",
     )
+    parser.add_argument(
+        "--bulk-mode",
+        action="store_true",
+        help="Defer building the HNSW index until all documents are uploaded",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=["none", "scalar", "binary"],
+        help="Vector quantization for new collections (default: QDRANT_QUANTIZATION or none)",
+    )
 
     args = parser.parse_args()
 
     # Initialize configuration
     config = Config()
+    if args.quantization:
+        config.qdrant_quantization = args.quantization
 
     try:
         # Validate configuration
@@ -173,14 +188,9 @@ def main():
         # Clear store if requested
         if args.clear_store:
             console.print("[yellow]Clearing existing vector store...[/yellow]")
-            pipeline = IndexingPipeline(config)
-            pipeline.setup_document_store()
-            # Recreate the collection
-            pipeline.document_store.recreate_index = True
-            pipeline.setup_document_store()
 
         # Index documents
-        index_documents(documents, config)
+        index_documents(documents, config, bulk_mode=args.bulk_mode, recreate=args.clear_store)
 
         # Ask if user wants to start chat
         console.print("\n[cyan]Documents indexed successfully![/cyan]")
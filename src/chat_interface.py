@@ -1,9 +1,11 @@
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 from rich.console import Console
+from rich.live import Live
 from rich.markup import escape
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.spinner import Spinner
 from rich.text import Text
 
 from src.config import Config
@@ -24,6 +26,13 @@ class ChatInterface:
         self.query_pipeline = query_pipeline
         self.console = Console()
         self.history: List[Dict[str, str]] = []
+        self._commands: Dict[str, Callable[[], bool]] = {
+            "/help": self._help_command,
+            "/history": self._history_command,
+            "/clear": self._clear_command,
+            "/quit": self._quit_command,
+            "/exit": self._quit_command,
+        }
 
     def display_welcome(self) -> None:
         """Display welcome message."""
@@ -95,11 +104,10 @@ Simply type your questions to get answers based on your documents.
             metadata = source.get("metadata", {})
             name = metadata.get("name", f"Document {i}")
 
-            # Truncate content for display
-            if len(content) > max_length:
-                content = content[:max_length] + "..."
+            # Truncate before escaping so markup escaping only scans the preview
+            preview = content[:max_length] + ("..." if len(content) > max_length else "")
 
-            formatted_sources.append(f"[bold]{i}. {name}[/bold]\n{escape(content)}")
+            formatted_sources.append(f"[bold]{i}. {name}[/bold]\n{escape(preview)}")
 
         return "\n\n".join(formatted_sources)
 
@@ -141,10 +149,10 @@ Simply type your questions to get answers based on your documents.
 
         history_text = []
         for i, entry in enumerate(self.history, 1):
-            history_text.append(f"[bold cyan]{i}. Q:[/bold cyan] {escape(entry['query'])}")
-            history_text.append(
-                f"[bold green]   A:[/bold green] {escape(entry['answer'][:200])}{'...' if len(entry['answer']) > 200 else ''}"
-            )
+            if "query_markup" not in entry:
+                entry.update(self._history_markup(entry["query"], entry["answer"]))
+            history_text.append(f"[bold cyan]{i}. Q:[/bold cyan] {entry['query_markup']}")
+            history_text.append(f"[bold green]   A:[/bold green] {entry['answer_markup']}")
             history_text.append("")
 
         panel = Panel(
@@ -157,6 +165,19 @@ Simply type your questions to get answers based on your documents.
         self.console.print(panel)
         self.console.print()
 
+    def _history_markup(self, query: str, answer: str) -> Dict[str, str]:
+        """Escape a history entry for display once, so /history doesn't rescan it.
+
+        Args:
+            query: User query
+            answer: Generated answer
+
+        Returns:
+            Escaped query and truncated, escaped answer preview
+        """
+        answer_preview = answer[:200] + ("..." if len(answer) > 200 else "")
+        return {"query_markup": escape(query), "answer_markup": escape(answer_preview)}
+
     def process_query(self, user_input: str) -> bool:
         """Process user query or command.
 
@@ -171,43 +192,45 @@ Simply type your questions to get answers based on your documents.
 
         # Handle commands
         if user_input.startswith("/"):
-            command = user_input.lower()
+            handler = self._commands.get(user_input.lower())
+            if handler:
+                return handler()
 
-            if command == "/help":
-                self.display_help()
-                return True
-
-            elif command == "/quit" or command == "/exit":
-                self.console.print("[yellow]Goodbye! 👋[/yellow]")
-                return False
-
-            elif command == "/history":
-                self.display_history()
-                return True
-
-            elif command == "/clear":
-                self.console.clear()
-                self.history.clear()
-                self.display_welcome()
-                return True
-
-            else:
-                self.console.print(f"[red]Unknown command: {user_input}[/red]")
-                self.console.print("[yellow]Type /help for available commands.[/yellow]")
-                self.console.print()
-                return True
+            self.console.print(f"[red]Unknown command: {user_input}[/red]")
+            self.console.print("[yellow]Type /help for available commands.[/yellow]")
+            self.console.print()
+            return True
 
         # Process regular query
         try:
-            with self.console.status(
-                "[bold green]Searching and generating answer...", spinner="dots"
-            ):
-                result = self.query_pipeline.query(user_input)
+            # Show the answer as it streams in; the final panel replaces it once complete
+            streamed_answer = Text()
+            streaming_panel = Panel(
+                streamed_answer, title="🤖 Assistant", border_style="green", padding=(1, 2)
+            )
+            with Live(
+                Spinner("dots", text="[bold green]Searching and generating answer..."),
+                console=self.console,
+                transient=True,
+            ) as live:
+
+                def on_token(token: str) -> None:
+                    if not streamed_answer:
+                        live.update(streaming_panel)
+                    streamed_answer.append(token)
+
+                result = self.query_pipeline.query(user_input, streaming_callback=on_token)
 
             self.display_answer(result)
 
             # Add to history
-            self.history.append({"query": result["query"], "answer": result["answer"]})
+            self.history.append(
+                {
+                    "query": result["query"],
+                    "answer": result["answer"],
+                    **self._history_markup(result["query"], result["answer"]),
+                }
+            )
 
         except Exception as e:
             self.console.print(f"[red]Error processing query: {str(e)}[/red]")
@@ -216,6 +239,28 @@ Simply type your questions to get answers based on your documents.
 
         return True
 
+    def _help_command(self) -> bool:
+        """Handle /help."""
+        self.display_help()
+        return True
+
+    def _history_command(self) -> bool:
+        """Handle /history."""
+        self.display_history()
+        return True
+
+    def _clear_command(self) -> bool:
+        """Handle /clear by resetting the screen and conversation history."""
+        self.console.clear()
+        self.history.clear()
+        self.display_welcome()
+        return True
+
+    def _quit_command(self) -> bool:
+        """Handle /quit and /exit."""
+        self.console.print("[yellow]Goodbye! 👋[/yellow]")
+        return False
+
     def start(self) -> None:
         """Start the chat interface."""
         self.display_welcome()
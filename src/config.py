@@ -11,47 +11,89 @@ load_dotenv()
 class Config:
     """Configuration class for RAG system using singleton pattern."""
 
+    __slots__ = (
+        "google_credentials_path",
+        "CREDENTIALS_PATH",
+        "GOOGLE_DRIVE_FOLDER_ID",
+        "google_drive_max_workers",
+        "qdrant_url",
+        "QDRANT_URL",
+        "qdrant_collection_name",
+        "COLLECTION_NAME",
+        "qdrant_quantization",
+        "qdrant_write_batch_size",
+        "qdrant_write_concurrency",
+        "ollama_base_url",
+        "OLLAMA_URL",
+        "ollama_model_name",
+        "CHAT_MODEL",
+        "ollama_embedding_model",
+        "EMBEDDING_MODEL",
+        "ollama_embedding_batch_size",
+        "ollama_concurrency",
+        "embedding_cache_path",
+        "log_level",
+        "max_documents_per_batch",
+        "chunk_size",
+        "CHUNK_SIZE",
+        "chunk_overlap",
+        "CHUNK_OVERLAP",
+    )
+
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Config, cls).__new__(cls)
-            cls._instance._initialized = False
+            instance = super(Config, cls).__new__(cls)
+            instance._load(os.environ)
+            cls._instance = instance
         return cls._instance
 
-    def __init__(self):
-        if self._initialized:
-            return
+    def _load(self, env) -> None:
+        """Parse environment variables into attributes once per singleton.
 
+        Args:
+            env: Mapping of environment variables
+        """
         # Google Drive API Configuration
-        self.google_credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+        self.google_credentials_path = env.get("GOOGLE_APPLICATION_CREDENTIALS")
         self.CREDENTIALS_PATH = self.google_credentials_path  # Alias for main.py compatibility
-        self.GOOGLE_DRIVE_FOLDER_ID = os.getenv("GOOGLE_DRIVE_FOLDER_ID")  # New field for main.py
+        self.GOOGLE_DRIVE_FOLDER_ID = env.get("GOOGLE_DRIVE_FOLDER_ID")  # New field for main.py
+        self.google_drive_max_workers = int(env.get("GOOGLE_DRIVE_MAX_WORKERS", "8"))
 
         # Qdrant Configuration
-        self.qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
+        self.qdrant_url = env.get("QDRANT_URL", "http://localhost:6333")
         self.QDRANT_URL = self.qdrant_url  # Alias for main.py compatibility
-        self.qdrant_collection_name = os.getenv("QDRANT_COLLECTION_NAME", "documents")
+        self.qdrant_collection_name = env.get("QDRANT_COLLECTION_NAME", "documents")
         self.COLLECTION_NAME = self.qdrant_collection_name  # Alias for main.py compatibility
+        self.qdrant_quantization = env.get("QDRANT_QUANTIZATION", "none")  # none|scalar|binary
+        # Points per upsert request when writing embedded chunks
+        self.qdrant_write_batch_size = int(env.get("QDRANT_WRITE_BATCH_SIZE", "64"))
+        # Upsert requests in flight at once; more than 2 tends to slow uploads down
+        self.qdrant_write_concurrency = int(env.get("QDRANT_WRITE_CONCURRENCY", "2"))
 
         # Ollama Configuration
-        self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.ollama_base_url = env.get("OLLAMA_BASE_URL", "http://localhost:11434")
         self.OLLAMA_URL = self.ollama_base_url  # Alias for main.py compatibility
-        self.ollama_model_name = os.getenv("OLLAMA_MODEL_NAME", "llama3.2:latest")
+        self.ollama_model_name = env.get("OLLAMA_MODEL_NAME", "llama3.2:latest")
         self.CHAT_MODEL = self.ollama_model_name  # Alias for main.py compatibility
-        self.ollama_embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "mxbai-embed-large")
+        self.ollama_embedding_model = env.get("OLLAMA_EMBEDDING_MODEL", "mxbai-embed-large")
         self.EMBEDDING_MODEL = self.ollama_embedding_model  # Alias for main.py compatibility
+        # Texts sent per /api/embed request
+        self.ollama_embedding_batch_size = int(env.get("OLLAMA_EMBEDDING_BATCH_SIZE", "32"))
+        # Embedding requests in flight at once; Ollama works through each batch sequentially
+        self.ollama_concurrency = int(env.get("OLLAMA_CONCURRENCY", "2"))
+        # SQLite file caching embeddings across runs; unset disables the cache
+        self.embedding_cache_path = env.get("EMBEDDING_CACHE_PATH")
 
         # Application Configuration
-        self.log_level = os.getenv("LOG_LEVEL", "INFO")
-        self.max_documents_per_batch = int(os.getenv("MAX_DOCUMENTS_PER_BATCH", "10"))
-        self.chunk_size = int(os.getenv("CHUNK_SIZE", "500"))
+        self.log_level = env.get("LOG_LEVEL", "INFO")
+        self.max_documents_per_batch = int(env.get("MAX_DOCUMENTS_PER_BATCH", "10"))
+        self.chunk_size = int(env.get("CHUNK_SIZE", "500"))
         self.CHUNK_SIZE = self.chunk_size  # Alias for main.py compatibility
-        self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "50"))
+        self.chunk_overlap = int(env.get("CHUNK_OVERLAP", "50"))
         self.CHUNK_OVERLAP = self.chunk_overlap  # Alias for main.py compatibility
 
-        self._initialized = True
-
     def validate(self) -> None:
         """Validate configuration settings."""
         if not self.google_credentials_path:
@@ -68,11 +110,18 @@ class Config:
         return {
             "google_credentials_path": self.google_credentials_path,
             "google_drive_folder_id": self.GOOGLE_DRIVE_FOLDER_ID,
+            "google_drive_max_workers": self.google_drive_max_workers,
             "qdrant_url": self.qdrant_url,
             "qdrant_collection_name": self.qdrant_collection_name,
+            "qdrant_quantization": self.qdrant_quantization,
+            "qdrant_write_batch_size": self.qdrant_write_batch_size,
+            "qdrant_write_concurrency": self.qdrant_write_concurrency,
             "ollama_base_url": self.ollama_base_url,
             "ollama_model_name": self.ollama_model_name,
             "ollama_embedding_model": self.ollama_embedding_model,
+            "ollama_embedding_batch_size": self.ollama_embedding_batch_size,
+            "ollama_concurrency": self.ollama_concurrency,
+            "embedding_cache_path": self.embedding_cache_path,
             "log_level": self.log_level,
             "max_documents_per_batch": self.max_documents_per_batch,
             "chunk_size": self.chunk_size,
@@ -1,9 +1,20 @@
+import asyncio
 import io
+import json
 import logging
-from typing import Any, Dict, List, Optional
-
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+from google.auth.transport.requests import Request
 from google.oauth2 import service_account
 from googleapiclient.discovery import build  # type: ignore
+from googleapiclient.errors import HttpError  # type: ignore
 from googleapiclient.http import MediaIoBaseDownload  # type: ignore
 
 from src.config import Config
@@ -11,6 +22,20 @@ from src.config import Config
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _load_credentials(
+    credentials_path: str, scopes: Tuple[str, ...]
+) -> service_account.Credentials:
+    """Load service account credentials once per key file and scope set.
+
+    The credentials refresh their own access token, so one object can be shared by every
+    loader instance instead of re-parsing the key file each time.
+    """
+    return service_account.Credentials.from_service_account_file(
+        credentials_path, scopes=list(scopes)
+    )
+
+
 class GoogleDriveLoader:
     """Google Drive document loader for RAG system."""
 
@@ -21,6 +46,28 @@ class GoogleDriveLoader:
         "application/vnd.google-apps.document",
     ]
 
+    # Drive search clauses built once rather than on every list_documents() call
+    _MIME_TYPE_QUERY = " or ".join(f"mimeType='{mt}'" for mt in SUPPORTED_MIME_TYPES)
+    _DEFAULT_QUERY = f"trashed=false and ({_MIME_TYPE_QUERY})"
+
+    # Bytes fetched per download request; most documents then arrive in a single round trip
+    DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+    # Maximum number of calls Drive accepts in one batch request
+    BATCH_SIZE = 100
+
+    # Largest page Drive returns from files().list (the default is 100)
+    LIST_PAGE_SIZE = 1000
+
+    # HTTP statuses worth retrying: rate limiting and transient server errors
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+    # 403 error reasons that mean "slow down" rather than "permission denied"
+    RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+    # Drive REST endpoint used by the async downloader
+    FILES_URL = "https://www.googleapis.com/drive/v3/files"
+
     def __init__(self, config: Config):
         """Initialize the Google Drive loader.
 
@@ -31,14 +78,16 @@ class GoogleDriveLoader:
         self.credentials_path = config.google_credentials_path
         self.service = None
         self._credentials = None
+        self.max_workers = config.google_drive_max_workers
+        self.max_retries = 5
+        # Per-thread Drive services: the httplib2 transport is not thread-safe
+        self._local = threading.local()
 
     def authenticate(self) -> None:
         """Authenticate with Google Drive API."""
         try:
-            scopes = ["https://www.googleapis.com/auth/drive.readonly"]
-            self._credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_path, scopes=scopes
-            )
+            scopes = ("https://www.googleapis.com/auth/drive.readonly",)
+            self._credentials = _load_credentials(self.credentials_path, scopes)
             self.service = build("drive", "v3", credentials=self._credentials)
         except Exception as e:
             raise Exception(f"Authentication failed: {e}")
@@ -56,29 +105,41 @@ class GoogleDriveLoader:
             raise ValueError("Not authenticated. Call authenticate() first.")
 
         # Build query
-        mime_type_query = " or ".join([f"mimeType='{mt}'" for mt in self.SUPPORTED_MIME_TYPES])
-
         if folder_id:
-            query = f"trashed=false and '{folder_id}' in parents and ({mime_type_query})"
+            query = f"trashed=false and '{folder_id}' in parents and ({self._MIME_TYPE_QUERY})"
         else:
-            query = f"trashed=false and ({mime_type_query})"
+            query = self._DEFAULT_QUERY
+
+        documents: List[Dict[str, Any]] = []
+        page_token = None
 
         try:
-            results = (
-                self.service.files()
-                .list(q=query, fields="files(id, name, mimeType, modifiedTime)")
-                .execute()
-            )
+            while True:
+                results = (
+                    self.service.files()
+                    .list(
+                        q=query,
+                        fields="nextPageToken, files(id, name, mimeType, modifiedTime)",
+                        pageSize=self.LIST_PAGE_SIZE,
+                        pageToken=page_token,
+                    )
+                    .execute()
+                )
+
+                documents.extend(results.get("files", []))
+                page_token = results.get("nextPageToken")
 
-            return results.get("files", [])
+                if not page_token:
+                    return documents
         except Exception as e:
             raise Exception(f"Failed to list documents: {e}")
 
-    def download_document(self, file_id: str) -> bytes:
+    def download_document(self, file_id: str, mime_type: Optional[str] = None) -> bytes:
         """Download document content.
 
         Args:
             file_id: Google Drive file ID
+            mime_type: MIME type from the file listing; looked up with an extra request if omitted
 
         Returns:
             Document content as bytes
@@ -86,21 +147,24 @@ class GoogleDriveLoader:
         if not self.service:
             raise ValueError("Not authenticated. Call authenticate() first.")
 
+        service = getattr(self._local, "service", None) or self.service
+
         try:
-            # First, get file metadata to check MIME type
-            file_metadata = self.service.files().get(fileId=file_id).execute()
-            mime_type = file_metadata.get("mimeType", "")
+            if mime_type is None:
+                # Get file metadata to check MIME type
+                file_metadata = service.files().get(fileId=file_id).execute()
+                mime_type = file_metadata.get("mimeType", "")
 
             # Handle Google Docs (need to export as text)
             if mime_type == "application/vnd.google-apps.document":
-                request = self.service.files().export_media(fileId=file_id, mimeType="text/plain")
+                request = service.files().export_media(fileId=file_id, mimeType="text/plain")
             else:
                 # For other files, download directly
-                request = self.service.files().get_media(fileId=file_id)
+                request = service.files().get_media(fileId=file_id)
 
             # Download file content
             buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(buffer, request)
+            downloader = MediaIoBaseDownload(buffer, request, chunksize=self.DOWNLOAD_CHUNK_SIZE)
 
             done = False
             while not done:
@@ -109,7 +173,70 @@ class GoogleDriveLoader:
             return buffer.getvalue()
 
         except Exception as e:
-            raise Exception(f"Failed to download document {file_id}: {e}")
+            raise Exception(f"Failed to download document {file_id}: {e}") from e
+
+    def _init_download_worker(self) -> None:
+        """Build a Drive service for the current download worker thread."""
+        self._local.service = build("drive", "v3", credentials=self._credentials)
+
+    def _download_with_retry(self, file_id: str, mime_type: Optional[str] = None) -> bytes:
+        """Download a document, backing off exponentially on rate limits and server errors.
+
+        Args:
+            file_id: Google Drive file ID
+            mime_type: MIME type from the file listing
+
+        Returns:
+            Document content as bytes
+        """
+        attempt = 0
+        while True:
+            try:
+                return self.download_document(file_id, mime_type)
+            except Exception as e:
+                cause = e.__cause__
+                retryable = isinstance(cause, HttpError) and self._is_retryable(cause)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = 2**attempt + random.random()
+                attempt += 1
+                logger.warning(f"Retrying download of {file_id} in {delay:.1f}s: {cause}")
+                time.sleep(delay)
+
+    def _is_retryable(self, error: HttpError) -> bool:
+        """Check whether a failed request is worth retrying.
+
+        Drive reports rate limiting as 403 as well as 429, so a 403 is only retried when its
+        error reason says so; any other 403 (e.g. permission denied) fails immediately.
+
+        Args:
+            error: Error raised by the Drive client
+
+        Returns:
+            True if the request should be retried
+        """
+        return self._is_retryable_status(error.resp.status, error.content)
+
+    def _is_retryable_status(self, status: int, content: Any) -> bool:
+        """Check whether an HTTP status and error body are worth retrying.
+
+        Args:
+            status: HTTP status code
+            content: Raw error response body
+
+        Returns:
+            True if the request should be retried
+        """
+        if status in self.RETRYABLE_STATUSES:
+            return True
+        if status != 403:
+            return False
+
+        try:
+            errors = json.loads(content)["error"]["errors"]
+            return any(item.get("reason") in self.RATE_LIMIT_REASONS for item in errors)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return False
 
     def load_documents(
         self, folder_id: Optional[str] = None, max_documents: Optional[int] = None
@@ -123,6 +250,66 @@ class GoogleDriveLoader:
         Returns:
             List of documents with content and metadata
         """
+        results = dict(self._iter_downloads(self._list_for_download(folder_id, max_documents)))
+
+        # Keep the listing order regardless of completion order
+        return [results[idx] for idx in sorted(results)]
+
+    def iter_documents(
+        self, folder_id: Optional[str] = None, max_documents: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield documents from Google Drive as their downloads complete.
+
+        Lets callers start embedding the first documents while the rest are still downloading.
+        Documents are yielded in completion order, not listing order.
+
+        Args:
+            folder_id: Optional folder ID to filter documents
+            max_documents: Maximum number of documents to load
+
+        Yields:
+            Documents with content and metadata
+        """
+        for _, document in self._iter_downloads(self._list_for_download(folder_id, max_documents)):
+            yield document
+
+    def iter_folder_documents(
+        self, folder_ids: Iterable[str], max_documents: Optional[int] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield documents from several folders through one shared download pool.
+
+        Each folder is listed on the calling thread while the previous folders' downloads are
+        still running, so the pool doesn't drain at every folder boundary. Documents are
+        yielded in completion order.
+
+        Args:
+            folder_ids: IDs of the folders to load (subfolders are not included)
+            max_documents: Maximum number of documents to load across all folders
+
+        Yields:
+            Tuples of (ID of the folder listing the document, document)
+        """
+        if not self.service:
+            raise ValueError("Not authenticated. Call authenticate() first.")
+
+        # Folder of each listed document, indexed like the download results
+        listed_in: List[str] = []
+
+        def doc_list() -> Iterator[Dict[str, Any]]:
+            for folder_id in folder_ids:
+                for doc_meta in self.list_documents(folder_id):
+                    listed_in.append(folder_id)
+                    yield doc_meta
+                    if max_documents and len(listed_in) >= max_documents:
+                        return
+
+        for idx, document in self._iter_downloads(doc_list()):
+            yield listed_in[idx], document
+
+    def _list_for_download(
+        self, folder_id: Optional[str], max_documents: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """List the documents to download, applying the document limit."""
         if not self.service:
             raise ValueError("Not authenticated. Call authenticate() first.")
 
@@ -133,26 +320,185 @@ class GoogleDriveLoader:
         if max_documents:
             doc_list = doc_list[:max_documents]
 
-        documents = []
-        for doc_meta in doc_list:
-            try:
-                content_bytes = self.download_document(doc_meta["id"])
-                # Convert bytes to string - decode as UTF-8
-                content = content_bytes.decode("utf-8", errors="ignore")
-                documents.append(
-                    {
-                        "content": content,
-                        "metadata": {
-                            "id": doc_meta["id"],
-                            "name": doc_meta["name"],
-                            "mimeType": doc_meta["mimeType"],
-                            "source": "google_drive",
-                        },
-                    }
+        return doc_list
+
+    def _iter_downloads(
+        self, doc_list: Iterable[Dict[str, Any]]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Download documents across worker threads, yielding them as they complete.
+
+        At most ``max_workers * 2`` downloads are pending, so a slow consumer holds back the
+        downloads instead of letting finished content pile up in memory.
+
+        Args:
+            doc_list: File metadata from the Drive listing
+
+        Yields:
+            Tuple of (index in doc_list, document); failed downloads are logged and skipped
+        """
+        max_workers = max(1, self.max_workers)
+        pending: Dict[Future, Tuple[int, Dict[str, Any]]] = {}
+
+        def drain() -> Iterator[Tuple[int, Dict[str, Any]]]:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx, doc_meta = pending.pop(future)
+                try:
+                    yield idx, self._document_record(doc_meta, future.result())
+                except Exception as e:
+                    logger.error(f"Failed to download document {doc_meta['name']}: {e}")
+
+        # Downloads are network-bound, so fan them out across worker threads
+        with ThreadPoolExecutor(
+            max_workers=max_workers, initializer=self._init_download_worker
+        ) as executor:
+            for idx, doc_meta in enumerate(doc_list):
+                future = executor.submit(
+                    self._download_with_retry, doc_meta["id"], doc_meta.get("mimeType")
                 )
-            except Exception as e:
-                logger.error(f"Failed to download document {doc_meta['name']}: {e}")
+                pending[future] = (idx, doc_meta)
+                if len(pending) >= max_workers * 2:
+                    yield from drain()
+
+            while pending:
+                yield from drain()
+
+    def _document_record(self, doc_meta: Dict[str, Any], content_bytes: bytes) -> Dict[str, Any]:
+        """Build the document dictionary returned by the load methods.
+
+        Args:
+            doc_meta: File metadata from the Drive listing
+            content_bytes: Downloaded file content
+
+        Returns:
+            Document with content and metadata
+        """
+        return {
+            # Convert bytes to string - decode as UTF-8
+            "content": content_bytes.decode("utf-8", errors="ignore"),
+            "metadata": {
+                "id": doc_meta["id"],
+                "name": doc_meta["name"],
+                # One of a handful of values, so share one string object across documents
+                "mimeType": sys.intern(doc_meta["mimeType"]),
+                "source": "google_drive",
+            },
+        }
+
+    async def _access_token(self, lock: asyncio.Lock, force_refresh: bool = False) -> str:
+        """Return a current bearer token, refreshing the credentials when they have expired.
+
+        Args:
+            lock: Lock shared by the downloads of one batch so only one of them refreshes
+            force_refresh: Refresh even if the credentials still report themselves valid
+
+        Returns:
+            Access token for the Authorization header
+        """
+        async with lock:
+            if force_refresh or not self._credentials.valid:
+                # refresh() does blocking HTTP, so keep it off the event loop
+                await asyncio.to_thread(self._credentials.refresh, Request())
+            return self._credentials.token
+
+    async def _download_async(
+        self,
+        client: httpx.AsyncClient,
+        token_lock: asyncio.Lock,
+        file_id: str,
+        mime_type: Optional[str],
+    ) -> bytes:
+        """Download a document over the shared async HTTP client, retrying like the sync path.
+
+        Args:
+            client: HTTP/2 client shared by the batch
+            token_lock: Lock guarding credential refreshes
+            file_id: Google Drive file ID
+            mime_type: MIME type from the file listing
+
+        Returns:
+            Document content as bytes
+        """
+        # Google Docs have no binary content and must be exported as text
+        if mime_type == "application/vnd.google-apps.document":
+            url, params = f"{self.FILES_URL}/{file_id}/export", {"mimeType": "text/plain"}
+        else:
+            url, params = f"{self.FILES_URL}/{file_id}", {"alt": "media"}
+
+        attempt = 0
+        refreshed = False
+        while True:
+            # Checked per request: a large batch can outlive the token it started with
+            token = await self._access_token(token_lock)
+            response = await client.get(
+                url, params=params, headers={"Authorization": f"Bearer {token}"}
+            )
+            # The token was revoked or expired early; refresh once and try again
+            if response.status_code == 401 and not refreshed:
+                refreshed = True
+                await self._access_token(token_lock, force_refresh=True)
                 continue
+            if (
+                not self._is_retryable_status(response.status_code, response.content)
+                or attempt >= self.max_retries
+            ):
+                response.raise_for_status()
+                return response.content
+            delay = 2**attempt + random.random()
+            attempt += 1
+            logger.warning(
+                f"Retrying download of {file_id} in {delay:.1f}s: HTTP {response.status_code}"
+            )
+            await asyncio.sleep(delay)
+
+    async def load_documents_async(
+        self,
+        folder_id: Optional[str] = None,
+        max_documents: Optional[int] = None,
+        max_concurrency: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Load documents from Google Drive, downloading over one multiplexed HTTP/2 connection.
+
+        The googleapiclient transport is HTTP/1.1 and needs a connection per worker thread;
+        here all downloads share a single TLS session.
+
+        Args:
+            folder_id: Optional folder ID to filter documents
+            max_documents: Maximum number of documents to load
+            max_concurrency: Maximum number of downloads in flight
+
+        Returns:
+            List of documents with content and metadata
+        """
+        if not self._credentials:
+            raise ValueError("Not authenticated. Call authenticate() first.")
+
+        doc_list = await asyncio.to_thread(self._list_for_download, folder_id, max_documents)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        token_lock = asyncio.Lock()
+
+        async def download(client: httpx.AsyncClient, doc_meta: Dict[str, Any]) -> bytes:
+            async with semaphore:
+                return await self._download_async(
+                    client, token_lock, doc_meta["id"], doc_meta.get("mimeType")
+                )
+
+        async with httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=max(1, max_concurrency)),
+            follow_redirects=True,
+        ) as client:
+            contents = await asyncio.gather(
+                *(download(client, doc_meta) for doc_meta in doc_list), return_exceptions=True
+            )
+
+        documents = []
+        for doc_meta, content in zip(doc_list, contents):
+            if isinstance(content, BaseException):
+                logger.error(f"Failed to download document {doc_meta['name']}: {content}")
+                continue
+            documents.append(self._document_record(doc_meta, content))
 
         return documents
 
@@ -187,6 +533,7 @@ class GoogleDriveLoader:
                     .list(
                         q="mimeType='application/vnd.google-apps.folder'",
                         fields="nextPageToken, files(id, name, parents)",
+                        pageSize=self.LIST_PAGE_SIZE,
                         pageToken=page_token,
                     )
                     .execute()
@@ -202,3 +549,85 @@ class GoogleDriveLoader:
             logger.error(f"Failed to get folder structure: {e}")
 
         return folders
+
+    def get_subfolders_recursive(self, root_folder_id: str) -> List[Dict[str, Any]]:
+        """Get every folder under a root folder, walking the tree one level at a time.
+
+        All folders of a level are listed together, BATCH_SIZE list calls per batched HTTP
+        request, so round trips grow with the depth of the tree rather than its folder count.
+
+        Args:
+            root_folder_id: Root folder ID to start from
+
+        Returns:
+            List of folder dictionaries with id, name, and parents
+        """
+        if not self.service:
+            raise ValueError("Not authenticated. Call authenticate() first.")
+
+        all_folders: List[Dict[str, Any]] = []
+        seen = {root_folder_id}
+        level = [root_folder_id]
+
+        while level:
+            next_level = []
+            for folder in self._list_subfolders(level):
+                if folder["id"] not in seen:
+                    seen.add(folder["id"])
+                    all_folders.append(folder)
+                    next_level.append(folder["id"])
+            level = next_level
+
+        return all_folders
+
+    def _subfolder_request(self, folder_id: str, page_token: Optional[str] = None) -> Any:
+        """Build the files().list request for the direct subfolders of a folder."""
+        assert self.service is not None
+        return self.service.files().list(
+            q=f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.folder'",
+            fields="nextPageToken, files(id, name, parents)",
+            pageSize=self.LIST_PAGE_SIZE,
+            pageToken=page_token,
+        )
+
+    def _list_subfolders(self, folder_ids: List[str]) -> List[Dict[str, Any]]:
+        """List the direct subfolders of several folders using batched HTTP requests.
+
+        Args:
+            folder_ids: Folder IDs to list, each at most once
+
+        Returns:
+            Subfolders of all the given folders; folders that failed are logged and skipped
+        """
+        assert self.service is not None
+        subfolders: List[Dict[str, Any]] = []
+        next_pages: List[Tuple[str, str]] = []
+
+        def callback(request_id: str, response: Dict[str, Any], exception: Exception) -> None:
+            if exception is not None:
+                logger.warning(f"Error getting subfolders for {request_id}: {exception}")
+                return
+            subfolders.extend(response.get("files", []))
+            if response.get("nextPageToken"):
+                next_pages.append((request_id, response["nextPageToken"]))
+
+        for start in range(0, len(folder_ids), self.BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for folder_id in folder_ids[start : start + self.BATCH_SIZE]:
+                batch.add(self._subfolder_request(folder_id), request_id=folder_id)
+            try:
+                batch.execute()
+            except Exception as e:
+                logger.warning(f"Error getting subfolders: {e}")
+
+        # Folders with more than one page of subfolders: fetch the remaining pages directly
+        for folder_id, page_token in next_pages:
+            try:
+                while page_token:
+                    response = self._subfolder_request(folder_id, page_token).execute()
+                    subfolders.extend(response.get("files", []))
+                    page_token = response.get("nextPageToken")
+            except Exception as e:
+                logger.warning(f"Error getting subfolders for {folder_id}: {e}")
+
+        return subfolders
@@ -0,0 +1,85 @@
+"""Persistent content-addressed cache of embedding vectors."""
+
+import hashlib
+import logging
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Store embedding vectors in SQLite, keyed by a hash of the model name and text.
+
+    Unchanged chunks then skip the embedding model entirely when a corpus is re-indexed.
+    """
+
+    # Keys per SELECT ... IN (...) query, below SQLite's bound-parameter limit
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path: str, model: str):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            model: Embedding model name; vectors from other models are never returned
+        """
+        self.path = path
+        self.model = model
+        Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(Path(path).expanduser(), timeout=30)
+        # WAL lets worker processes indexing in parallel read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> bytes:
+        """Hash the model name and text into a cache key."""
+        digest = hashlib.blake2b(self.model.encode(), digest_size=16)
+        digest.update(b"\0")
+        digest.update(text.encode())
+        return digest.digest()
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """Look up cached vectors.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Mapping of each cached text to its vector; texts not in the cache are omitted
+        """
+        keys = {self._key(text): text for text in texts}
+        key_list = list(keys)
+        found: Dict[str, List[float]] = {}
+
+        for i in range(0, len(key_list), self.LOOKUP_BATCH_SIZE):
+            batch = key_list[i : i + self.LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            )
+            for key, vector in rows:
+                found[keys[key]] = array("d", vector).tolist()
+
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]]) -> None:
+        """Store vectors, replacing any cached for the same text.
+
+        Args:
+            items: Pairs of (text, vector)
+        """
+        rows = [(self._key(text), array("d", vector).tobytes()) for text, vector in items]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
@@ -1,9 +1,17 @@
 """GitHub Repository Loader for batch ingestion into RAG system."""
 
+import asyncio
 import logging
+import os
+import shutil
 import subprocess
+import sys
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 from haystack import Document
 
@@ -13,9 +21,45 @@ from .hierarchical_loader import HierarchicalDocumentLoader
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _parse_repo_name(repo_identifier: str) -> Tuple[str, str]:
+    """Split "owner/repo" once per identifier; the same repo is parsed at every stage."""
+    parts = repo_identifier.strip().split("/")
+    if len(parts) != 2:
+        raise ValueError(
+            f"Repository identifier must be in format 'owner/repo', got: {repo_identifier}"
+        )
+    return parts[0], parts[1]
+
+
+@lru_cache(maxsize=1024)
+def _local_repo_path(local_dir: Path, repo_identifier: str) -> Path:
+    """Build the checkout path for a repository under local_dir."""
+    _, repo_name = _parse_repo_name(repo_identifier)
+    return local_dir / repo_name
+
+
+def _log_rmtree_error(function, path: str, exc_info) -> None:
+    """shutil.rmtree error handler: log the failure and keep deleting the rest of the tree."""
+    logger.warning(f"Could not delete {path}: {exc_info[1]}")
+
+
+class RepositoryResult(NamedTuple):
+    """Outcome of processing a single repository from a repository list file."""
+
+    index: int
+    repo_identifier: str
+    documents: List[Document]
+    status: str
+    error: Optional[Exception] = None
+
+
 class GitHubRepositoryLoader:
     """Load documents from GitHub repositories with local caching."""
 
+    # Git config section marking shallow clones this loader created (and may hard-reset)
+    MANAGED_CLONE_SECTION = "rag-knowledge-system"
+
     def __init__(self, config: Config):
         """Initialize the GitHub repository loader.
 
@@ -28,8 +72,10 @@ class GitHubRepositoryLoader:
         # Default configurations
         self.local_repos_dir = Path.home() / "Coding"
         self.max_file_size_mb = 10.0
-        # Only process markdown files
-        self.allowed_extensions = [".md"]
+        # Only process markdown files (lowercase, for hash lookups against Path.suffix.lower())
+        self.allowed_extensions = frozenset({".md"})
+        # Only the current tree is indexed, so skip history and blobs we never read
+        self.shallow_clone = True
 
     def parse_repo_name(self, repo_identifier: str) -> Tuple[str, str]:
         """Parse repository identifier to extract owner and repo name.
@@ -43,12 +89,7 @@ class GitHubRepositoryLoader:
         Raises:
             ValueError: If repo_identifier is not in expected format
         """
-        parts = repo_identifier.strip().split("/")
-        if len(parts) != 2:
-            raise ValueError(
-                f"Repository identifier must be in format 'owner/repo', got: {repo_identifier}"
-            )
-        return parts[0], parts[1]
+        return _parse_repo_name(repo_identifier)
 
     def get_local_repo_path(self, repo_identifier: str, local_dir: Optional[Path] = None) -> Path:
         """Get the expected local path for a repository.
@@ -60,9 +101,7 @@ class GitHubRepositoryLoader:
         Returns:
             Path where the repository should exist locally
         """
-        local_dir = local_dir or self.local_repos_dir
-        _, repo_name = self.parse_repo_name(repo_identifier)
-        return local_dir / repo_name
+        return _local_repo_path(local_dir or self.local_repos_dir, repo_identifier)
 
     def check_local_repo(self, repo_path: Path) -> bool:
         """Check if a repository exists locally and is a valid git repo.
@@ -73,12 +112,99 @@ class GitHubRepositoryLoader:
         Returns:
             True if valid git repository exists at path
         """
-        if not repo_path.exists():
+        # A single stat: isdir() is False both when the repo is missing and when it is not a
+        # git repository
+        return os.path.isdir(os.path.join(repo_path, ".git"))
+
+    def _discard_directory(self, path: Path) -> None:
+        """Move a directory out of the way and delete it in the background.
+
+        The rename is a single syscall, so a fresh clone can start at once instead of waiting
+        for every file of the old checkout to be unlinked. Falls back to deleting in place if
+        the directory cannot be renamed.
+
+        Args:
+            path: Directory to remove
+        """
+        trash_path = path.with_name(f".{path.name}.trash-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(path, trash_path)
+        except OSError as e:
+            logger.debug(f"Could not move {path} aside, deleting in place: {e}")
+            shutil.rmtree(path)
+            return
+
+        # Not a daemon thread, so the interpreter waits for the delete before exiting
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(trash_path,),
+            # Log whatever can't be deleted, so leftover trash directories don't go unnoticed
+            kwargs={"onerror": _log_rmtree_error},
+            name=f"discard-{path.name}",
+        ).start()
+
+    def _clone_command(self, repo_identifier: str, target_dir: Path) -> List[str]:
+        """Build the gh CLI command used to clone a repository."""
+        cmd = ["gh", "repo", "clone", repo_identifier, str(target_dir)]
+        if self.shallow_clone:
+            # Extra arguments after "--" are passed through to git clone
+            cmd += [
+                "--",
+                "--depth=1",
+                "--single-branch",
+                "--filter=blob:none",
+                "--config",
+                f"{self.MANAGED_CLONE_SECTION}.managed=true",
+            ]
+        return cmd
+
+    def _is_managed_clone(self, repo_path: Path) -> bool:
+        """Check whether a checkout was cloned by this loader rather than by the user."""
+        try:
+            git_config = (repo_path / ".git" / "config").read_text()
+        except OSError:
             return False
+        return f"[{self.MANAGED_CLONE_SECTION}]" in git_config
+
+    def _update_commands(self, repo_path: Path) -> List[List[str]]:
+        """Build the git commands used to update an existing repository."""
+        if not (self.shallow_clone and (repo_path / ".git" / "shallow").exists()):
+            return [["git", "-C", str(repo_path), "pull", "--ff-only"]]
+
+        if not self._is_managed_clone(repo_path):
+            # Someone else's shallow checkout may hold local work: only fast-forward it
+            return [
+                ["git", "-C", str(repo_path), "fetch", "--filter=blob:none", "origin", "HEAD"],
+                ["git", "-C", str(repo_path), "merge", "--ff-only", "FETCH_HEAD"],
+            ]
+
+        # Our own shallow clone: fetch only the latest commit and move the checkout to it
+        return [
+            [
+                "git",
+                "-C",
+                str(repo_path),
+                "fetch",
+                "--depth=1",
+                "--filter=blob:none",
+                "origin",
+                "HEAD",
+            ],
+            ["git", "-C", str(repo_path), "reset", "--hard", "FETCH_HEAD"],
+        ]
+
+    def _head_commands(self, repo_path: Path) -> Tuple[List[str], List[str]]:
+        """Build the git commands that read the local and remote HEAD commits."""
+        return (
+            ["git", "-C", str(repo_path), "rev-parse", "HEAD"],
+            ["git", "-C", str(repo_path), "ls-remote", "origin", "HEAD"],
+        )
 
-        # Check if it's a valid git repository
-        git_dir = repo_path / ".git"
-        return git_dir.exists() and git_dir.is_dir()
+    @staticmethod
+    def _heads_match(local_output: str, remote_output: str) -> bool:
+        """Compare `git rev-parse HEAD` output with `git ls-remote origin HEAD` output."""
+        remote = remote_output.split()
+        return bool(remote) and remote[0] == local_output.strip()
 
     def clone_repo(self, repo_identifier: str, target_dir: Path) -> bool:
         """Clone a repository using GitHub CLI.
@@ -94,11 +220,13 @@ class GitHubRepositoryLoader:
             # Ensure target directory exists
             target_dir.parent.mkdir(parents=True, exist_ok=True)
 
-            # Use gh CLI to clone
-            cmd = ["gh", "repo", "clone", repo_identifier, str(target_dir)]
+            # Use gh CLI to clone (only stderr is read, so don't pipe stdout)
+            cmd = self._clone_command(repo_identifier, target_dir)
             logger.info(f"Cloning repository: {repo_identifier} to {target_dir}")
 
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = subprocess.run(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+            )
 
             if result.returncode == 0:
                 logger.info(f"Successfully cloned: {repo_identifier}")
@@ -124,21 +252,148 @@ class GitHubRepositoryLoader:
             True if update succeeded
         """
         try:
-            cmd = ["git", "-C", str(repo_path), "pull", "--ff-only"]
             logger.info(f"Updating repository: {repo_path}")
 
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            for cmd in self._update_commands(repo_path):
+                result = subprocess.run(
+                    cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+                )
+
+                if result.returncode != 0:
+                    logger.warning(f"Could not update {repo_path}: {result.stderr}")
+                    return False
 
-            if result.returncode == 0:
-                logger.info(f"Successfully updated: {repo_path}")
+            logger.info(f"Successfully updated: {repo_path}")
+            return True
+
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Error updating {repo_path}: {e.stderr}")
+            return False
+        except Exception as e:
+            logger.warning(f"Unexpected error updating {repo_path}: {e}")
+            return False
+
+    def is_up_to_date(self, repo_path: Path) -> bool:
+        """Check whether a repository is already at the remote HEAD commit.
+
+        `git ls-remote` only transfers refs, so this is far cheaper than a fetch or pull for
+        repositories that have not changed since the last run.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            True if the local HEAD matches the remote HEAD; False if they differ or either
+            could not be read
+        """
+        try:
+            local_cmd, remote_cmd = self._head_commands(repo_path)
+            local = subprocess.run(local_cmd, capture_output=True, text=True, check=True)
+            remote = subprocess.run(remote_cmd, capture_output=True, text=True, check=True)
+            return self._heads_match(local.stdout, remote.stdout)
+        except Exception as e:
+            logger.debug(f"Could not compare HEAD with remote for {repo_path}: {e}")
+            return False
+
+    async def _run_async(self, cmd: List[str]) -> Tuple[int, str]:
+        """Run a command as a subprocess without holding a thread while it runs.
+
+        Args:
+            cmd: Command and arguments
+
+        Returns:
+            Tuple of (return code, stderr output)
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await proc.communicate()
+        return proc.returncode or 0, stderr.decode(errors="replace")
+
+    async def _read_async(self, cmd: List[str]) -> Optional[str]:
+        """Run a command as a subprocess and return its output.
+
+        Args:
+            cmd: Command and arguments
+
+        Returns:
+            Standard output, or None if the command failed
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await proc.communicate()
+        return stdout.decode(errors="replace") if proc.returncode == 0 else None
+
+    async def is_up_to_date_async(self, repo_path: Path) -> bool:
+        """Async variant of is_up_to_date; both HEADs are read concurrently.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            True if the local HEAD matches the remote HEAD
+        """
+        try:
+            local, remote = await asyncio.gather(
+                *(self._read_async(cmd) for cmd in self._head_commands(repo_path))
+            )
+            return local is not None and remote is not None and self._heads_match(local, remote)
+        except Exception as e:
+            logger.debug(f"Could not compare HEAD with remote for {repo_path}: {e}")
+            return False
+
+    async def clone_repo_async(self, repo_identifier: str, target_dir: Path) -> bool:
+        """Clone a repository using GitHub CLI from an asyncio event loop.
+
+        Args:
+            repo_identifier: Repository in format "owner/repo"
+            target_dir: Directory to clone into
+
+        Returns:
+            True if cloning succeeded
+        """
+        try:
+            target_dir.parent.mkdir(parents=True, exist_ok=True)
+
+            logger.info(f"Cloning repository: {repo_identifier} to {target_dir}")
+            returncode, stderr = await self._run_async(
+                self._clone_command(repo_identifier, target_dir)
+            )
+
+            if returncode == 0:
+                logger.info(f"Successfully cloned: {repo_identifier}")
                 return True
             else:
-                logger.warning(f"Could not fast-forward update {repo_path}: {result.stderr}")
+                logger.error(f"Failed to clone {repo_identifier}: {stderr}")
                 return False
 
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Error updating {repo_path}: {e.stderr}")
+        except Exception as e:
+            logger.error(f"Unexpected error cloning {repo_identifier}: {e}")
             return False
+
+    async def update_repo_async(self, repo_path: Path) -> bool:
+        """Update an existing repository from an asyncio event loop.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            True if update succeeded
+        """
+        try:
+            logger.info(f"Updating repository: {repo_path}")
+
+            for cmd in self._update_commands(repo_path):
+                returncode, stderr = await self._run_async(cmd)
+
+                if returncode != 0:
+                    logger.warning(f"Could not update {repo_path}: {stderr}")
+                    return False
+
+            logger.info(f"Successfully updated: {repo_path}")
+            return True
+
         except Exception as e:
             logger.warning(f"Unexpected error updating {repo_path}: {e}")
             return False
@@ -182,7 +437,10 @@ class GitHubRepositoryLoader:
             # Keep the original category as subcategory if it wasn't root
             original_category = doc.meta.get("category", "root")
             if original_category != "root":
-                doc.meta["subcategory"] = f"{original_category}/{doc.meta.get('subcategory', '')}"
+                # Interned: the same folder path repeats across every file in it
+                doc.meta["subcategory"] = sys.intern(
+                    f"{original_category}/{doc.meta.get('subcategory', '')}"
+                )
             doc.meta["category"] = repo_name
 
         # Limit documents if specified
@@ -202,9 +460,47 @@ class GitHubRepositoryLoader:
     ) -> Tuple[List[Document], str]:
         """Process a single repository - check locally, clone if needed, and load documents.
 
+        Must not be called from a running event loop; use process_repository_async() there.
+
         Args:
             repo_identifier: Repository in format "owner/repo"
-            local_dir: Directory to check/clone repos (default: ~/Coding)
+            local_dir: Directory to check/clone repos (default: ~/Coding); pass an already
+                expanded, absolute path, it is not re-resolved per repository
+            force_clone: Force fresh clone even if exists locally
+            update_existing: Update existing repos with git pull
+            max_documents: Maximum number of documents to load
+
+        Returns:
+            Tuple of (documents, status_message)
+        """
+        # One implementation for both paths: run the async variant on a private event loop
+        return asyncio.run(
+            self.process_repository_async(
+                repo_identifier,
+                local_dir=local_dir,
+                force_clone=force_clone,
+                update_existing=update_existing,
+                max_documents=max_documents,
+            )
+        )
+
+    async def process_repository_async(
+        self,
+        repo_identifier: str,
+        local_dir: Optional[Path] = None,
+        force_clone: bool = False,
+        update_existing: bool = True,
+        max_documents: Optional[int] = None,
+    ) -> Tuple[List[Document], str]:
+        """Async variant of process_repository.
+
+        Git runs in subprocesses awaited on the event loop, so many clones can be in flight
+        without a thread each; document scanning runs in the default thread pool.
+
+        Args:
+            repo_identifier: Repository in format "owner/repo"
+            local_dir: Directory to check/clone repos (default: ~/Coding); pass an already
+                expanded, absolute path, it is not re-resolved per repository
             force_clone: Force fresh clone even if exists locally
             update_existing: Update existing repos with git pull
             max_documents: Maximum number of documents to load
@@ -219,39 +515,52 @@ class GitHubRepositoryLoader:
         if self.check_local_repo(repo_path) and not force_clone:
             logger.info(f"Found local repository: {repo_identifier} at {repo_path}")
 
-            # Optionally update the repository
+            # Optionally update the repository, skipping the fetch when nothing changed
             if update_existing:
-                self.update_repo(repo_path)
+                if await self.is_up_to_date_async(repo_path):
+                    logger.info(f"Already up to date: {repo_path}")
+                else:
+                    await self.update_repo_async(repo_path)
 
             status = f"Found local: {repo_identifier} at {repo_path}"
         else:
             # Clone the repository
             if force_clone and repo_path.exists():
                 logger.info(f"Force clone requested, removing existing: {repo_path}")
-                import shutil
-
-                shutil.rmtree(repo_path)
+                # Off the loop: if the rename fails the checkout is deleted in place
+                await asyncio.to_thread(self._discard_directory, repo_path)
 
-            success = self.clone_repo(repo_identifier, repo_path)
+            success = await self.clone_repo_async(repo_identifier, repo_path)
             if not success:
                 return [], f"Failed to clone: {repo_identifier}"
 
             status = f"Cloned: {repo_identifier} to {repo_path}"
 
         # Load documents from the repository
-        documents = self.load_repository(repo_identifier, repo_path, max_documents)
+        documents = await asyncio.to_thread(
+            self.load_repository, repo_identifier, repo_path, max_documents
+        )
 
         return documents, status
 
-    def process_repositories_from_file(
+    def iter_repositories_from_file(
         self,
         repos_file: Path,
         local_dir: Optional[Path] = None,
         force_clone: bool = False,
         update_existing: bool = True,
         max_documents_per_repo: Optional[int] = None,
-    ) -> Tuple[List[Document], List[str]]:
-        """Process multiple repositories from a file.
+        max_workers: int = 8,
+    ) -> Iterator[RepositoryResult]:
+        """Stream per-repository results for the repositories listed in a file.
+
+        The file is read lazily and at most ``max_workers * 2`` repositories are in flight, so
+        only a handful of repositories' documents are held in memory at a time. Results are
+        yielded in completion order; use ``RepositoryResult.index`` to recover file order.
+
+        Each worker thread runs its own event loop per repository; callers that already have
+        an event loop should use process_repository_async() instead, which reaps all git
+        subprocesses from the loop without a thread per repository.
 
         Args:
             repos_file: Path to file containing repository identifiers (one per line)
@@ -259,42 +568,118 @@ class GitHubRepositoryLoader:
             force_clone: Force fresh clone even if exists locally
             update_existing: Update existing repos with git pull
             max_documents_per_repo: Maximum documents per repository
+            max_workers: Maximum number of repositories processed concurrently
 
-        Returns:
-            Tuple of (all_documents, status_messages)
+        Yields:
+            RepositoryResult for each repository in the file
         """
         if not repos_file.exists():
             raise ValueError(f"Repository list file not found: {repos_file}")
 
-        # Read repository list
-        with open(repos_file, "r") as f:
-            repo_list = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        logger.info(f"Processing repositories from {repos_file}")
+        max_pending = max(1, max_workers) * 2
+
+        # Clone/pull is subprocess I/O, so overlap repositories across threads
+        # (the hierarchical loader is stateless and safe to share)
+        with (
+            open(repos_file, "r") as f,
+            ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor,
+        ):
+            repo_identifiers = (
+                line.strip() for line in f if line.strip() and not line.startswith("#")
+            )
+            pending: Dict[Future, Tuple[int, str]] = {}
+
+            for idx, repo_identifier in enumerate(repo_identifiers, 1):
+                future = executor.submit(
+                    self.process_repository,
+                    repo_identifier,
+                    local_dir,
+                    force_clone,
+                    update_existing,
+                    max_documents_per_repo,
+                )
+                pending[future] = (idx, repo_identifier)
 
-        logger.info(f"Processing {len(repo_list)} repositories from {repos_file}")
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield self._repository_result(future, *pending.pop(future))
 
-        all_documents = []
-        status_messages = []
+            for future in as_completed(pending):
+                yield self._repository_result(future, *pending[future])
 
-        for idx, repo_identifier in enumerate(repo_list, 1):
-            logger.info(f"[{idx}/{len(repo_list)}] Processing: {repo_identifier}")
+    def _repository_result(
+        self, future: Future, idx: int, repo_identifier: str
+    ) -> RepositoryResult:
+        """Convert a finished process_repository future into a RepositoryResult.
 
-            try:
-                documents, status = self.process_repository(
-                    repo_identifier, local_dir, force_clone, update_existing, max_documents_per_repo
-                )
+        Args:
+            future: Completed future returned by process_repository
+            idx: 1-based position of the repository in the list file
+            repo_identifier: Repository identifier
 
-                all_documents.extend(documents)
-                status_messages.append(
-                    f"[{idx}/{len(repo_list)}] {status} - {len(documents)} documents"
-                )
+        Returns:
+            RepositoryResult with the documents, or the error if processing failed
+        """
+        logger.info(f"[{idx}] Processed: {repo_identifier}")
+        try:
+            documents, status = future.result()
+            return RepositoryResult(idx, repo_identifier, documents, status)
+        except Exception as e:
+            error_msg = f"Error processing {repo_identifier}: {e}"
+            logger.error(f"[{idx}] {error_msg}")
+            return RepositoryResult(idx, repo_identifier, [], error_msg, e)
+
+    def process_repositories_from_file(
+        self,
+        repos_file: Path,
+        local_dir: Optional[Path] = None,
+        force_clone: bool = False,
+        update_existing: bool = True,
+        max_documents_per_repo: Optional[int] = None,
+        max_workers: int = 8,
+    ) -> Tuple[List[Document], List[str]]:
+        """Process multiple repositories from a file.
+
+        Collects every document in memory; prefer iter_repositories_from_file() to stream
+        large repository lists straight into the document store.
 
-            except Exception as e:
-                error_msg = f"[{idx}/{len(repo_list)}] Error processing {repo_identifier}: {e}"
-                logger.error(error_msg)
-                status_messages.append(error_msg)
-                continue
+        Args:
+            repos_file: Path to file containing repository identifiers (one per line)
+            local_dir: Directory to check/clone repos (default: ~/Coding)
+            force_clone: Force fresh clone even if exists locally
+            update_existing: Update existing repos with git pull
+            max_documents_per_repo: Maximum documents per repository
+            max_workers: Maximum number of repositories processed concurrently
 
-        logger.info(
-            f"Processed {len(repo_list)} repositories, loaded {len(all_documents)} total documents"
+        Returns:
+            Tuple of (all_documents, status_messages)
+        """
+        results = sorted(
+            self.iter_repositories_from_file(
+                repos_file,
+                local_dir,
+                force_clone,
+                update_existing,
+                max_documents_per_repo,
+                max_workers,
+            ),
+            key=lambda result: result.index,
         )
+
+        # Report in file order regardless of completion order
+        all_documents = []
+        status_messages = []
+        total = len(results)
+        for result in results:
+            all_documents.extend(result.documents)
+            if result.error is None:
+                status_messages.append(
+                    f"[{result.index}/{total}] {result.status} - {len(result.documents)} documents"
+                )
+            else:
+                status_messages.append(f"[{result.index}/{total}] {result.status}")
+
+        logger.info(f"Processed {total} repositories, loaded {len(all_documents)} total documents")
         return all_documents, status_messages
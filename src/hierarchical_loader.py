@@ -1,29 +1,100 @@
 """Hierarchical Document Loader for folder-based categorization."""
 
+import codecs
 import logging
+import mmap
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from haystack import Document
 
 from .config import Config
-from .document_loader import GoogleDriveLoader
+
+if TYPE_CHECKING:
+    from .document_loader import GoogleDriveLoader
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8192)
+def _iso_ts(timestamp: float) -> str:
+    """Format a POSIX timestamp as a local ISO 8601 string (memoized).
+
+    Full precision is kept: the string is stored in chunk metadata, which Haystack hashes
+    into document IDs, so rounding would change the ID of every existing point.
+    """
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+@lru_cache(maxsize=None)
+def _pdf_reader_class() -> Optional[type]:
+    """Return pypdf's PdfReader if pypdf is installed, else None (looked up once)."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.info("pypdf is not installed; PDF files are loaded as raw text placeholders")
+        return None
+    return PdfReader
+
+
 class HierarchicalDocumentLoader:
     """Load documents with hierarchical folder metadata for categorization."""
 
-    def __init__(self):
-        """Initialize the hierarchical document loader."""
-        self.supported_extensions = {".txt", ".md", ".pdf", ".doc", ".docx"}
+    # Files at least this large (in bytes) are memory-mapped rather than read into a buffer
+    MMAP_THRESHOLD = 1024 * 1024
+
+    # Characters kept from a PDF's raw bytes when no PDF parser is available
+    PDF_PLACEHOLDER_CHARS = 1000
+
+    # Bytes read at a time when only the start of a file is needed
+    PREFIX_READ_SIZE = 64 * 1024
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize the hierarchical document loader.
+
+        Args:
+            max_workers: Threads used to read local files (default: min(32, 4 x CPU count))
+        """
+        self.supported_extensions = frozenset({".txt", ".md", ".pdf", ".doc", ".docx"})
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        # Created on first use and shared by every load, so repeated loads (e.g. one per
+        # GitHub repository) reuse warm threads and together never exceed max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self) -> "HierarchicalDocumentLoader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the file-reading thread pool, waiting for in-flight reads to finish."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared file-reading thread pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="file-loader"
+                )
+            return self._executor
 
     def load_from_directory(
         self,
         root_path: Path,
-        allowed_extensions: Optional[List[str]] = None,
+        allowed_extensions: Optional[Iterable[str]] = None,
         max_file_size_mb: Optional[float] = None,
         additional_metadata: Optional[Dict[str, Any]] = None,
     ) -> List[Document]:
@@ -32,13 +103,49 @@ class HierarchicalDocumentLoader:
 
         Args:
             root_path: Root directory to traverse
-            allowed_extensions: List of allowed file extensions (e.g., ['.txt', '.pdf'])
+            allowed_extensions: Allowed file extensions (e.g., ['.txt', '.pdf']); a frozenset of
+                lowercase extensions is used as-is
             max_file_size_mb: Maximum file size in megabytes
             additional_metadata: Additional metadata to add to all documents
 
         Returns:
             List of Document objects with hierarchical metadata
 
+        Raises:
+            ValueError: If directory does not exist
+            PermissionError: If access is denied to directory
+        """
+        documents = list(
+            self.iter_from_directory(
+                root_path, allowed_extensions, max_file_size_mb, additional_metadata
+            )
+        )
+        logger.info(f"Loaded {len(documents)} documents from {root_path}")
+        return documents
+
+    def iter_from_directory(
+        self,
+        root_path: Path,
+        allowed_extensions: Optional[Iterable[str]] = None,
+        max_file_size_mb: Optional[float] = None,
+        additional_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Document]:
+        """
+        Yield documents from a directory with hierarchical metadata, in traversal order.
+
+        At most ``max_workers * 2`` files are loaded ahead of the consumer, so memory stays
+        bounded however large the directory is.
+
+        Args:
+            root_path: Root directory to traverse
+            allowed_extensions: Allowed file extensions (e.g., ['.txt', '.pdf']); a frozenset of
+                lowercase extensions is used as-is
+            max_file_size_mb: Maximum file size in megabytes
+            additional_metadata: Additional metadata to add to all documents
+
+        Yields:
+            Document objects with hierarchical metadata
+
         Raises:
             ValueError: If directory does not exist
             PermissionError: If access is denied to directory
@@ -50,50 +157,117 @@ class HierarchicalDocumentLoader:
             raise ValueError(f"Path is not a directory: {root_path}")
 
         # Use provided extensions or defaults
-        extensions = set(allowed_extensions) if allowed_extensions else self.supported_extensions
+        if not allowed_extensions:
+            extensions = self.supported_extensions
+        elif isinstance(allowed_extensions, frozenset):
+            extensions = allowed_extensions
+        else:
+            extensions = frozenset(ext.lower() for ext in allowed_extensions)
 
-        documents = []
         max_size_bytes = (max_file_size_mb * 1024 * 1024) if max_file_size_mb else None
 
-        # Recursively traverse directory
-        for file_path in self._traverse_directory(root_path):
-            # Check file extension
-            if file_path.suffix.lower() not in extensions:
-                logger.debug(f"Skipping unsupported file type: {file_path}")
-                continue
+        def load_file(entry: os.DirEntry) -> Optional[Document]:
+            # DirEntry caches its stat result, and on some platforms gets it from the listing
+            return self._load_file(
+                Path(entry.path),
+                root_path,
+                max_size_bytes,
+                max_file_size_mb,
+                additional_metadata,
+                entry.stat(),
+            )
 
-            # Check file size
-            if max_size_bytes and file_path.stat().st_size > max_size_bytes:
-                logger.warning(f"Skipping large file: {file_path} (size > {max_file_size_mb}MB)")
-                continue
+        # Recursively traverse directory, keeping only supported file types
+        file_entries = (
+            entry
+            for entry in self._traverse_directory(root_path)
+            if self._has_allowed_extension(entry.path, extensions)
+        )
+
+        # Reads block on disk I/O and release the GIL, so overlap them across threads;
+        # futures are consumed first-in first-out to keep the traversal order
+        executor = self._get_executor()
+        pending: Deque[Future] = deque()
+        try:
+            for entry in file_entries:
+                pending.append(executor.submit(load_file, entry))
+                if len(pending) >= self.max_workers * 2:
+                    document = pending.popleft().result()
+                    if document is not None:
+                        yield document
+
+            while pending:
+                document = pending.popleft().result()
+                if document is not None:
+                    yield document
+        finally:
+            # The pool outlives this call; drop reads nobody will consume
+            for future in pending:
+                future.cancel()
+
+    def _has_allowed_extension(self, file_path: str, extensions: frozenset) -> bool:
+        """Check a file against the allowed extensions, logging skipped files."""
+        # splitext() treats leading dots like Path.suffix, without building a Path per entry
+        if os.path.splitext(file_path)[1].lower() in extensions:
+            return True
+        logger.debug(f"Skipping unsupported file type: {file_path}")
+        return False
+
+    def _load_file(
+        self,
+        file_path: Path,
+        root_path: Path,
+        max_size_bytes: Optional[float],
+        max_file_size_mb: Optional[float],
+        additional_metadata: Optional[Dict[str, Any]],
+        file_stats: Optional[os.stat_result] = None,
+    ) -> Optional[Document]:
+        """
+        Load a single file as a Document with hierarchical metadata.
 
-            # Load file content
-            try:
-                content = self._read_file_content(file_path)
-                if not content:
-                    logger.warning(f"Empty file skipped: {file_path}")
-                    continue
-
-                # Extract hierarchical metadata
-                metadata = self._extract_hierarchical_metadata(file_path, root_path)
-
-                # Add additional metadata if provided
-                if additional_metadata:
-                    metadata.update(additional_metadata)
-
-                # Create Document
-                document = Document(content=content, meta=metadata)
-                documents.append(document)
-                logger.debug(
-                    f"Loaded document: {file_path} with category: {metadata.get('category')}"
-                )
+        Args:
+            file_path: File to load
+            root_path: Root directory being traversed
+            max_size_bytes: Maximum file size in bytes, if limited
+            max_file_size_mb: Maximum file size in megabytes, for log messages
+            additional_metadata: Additional metadata to add to the document
+            file_stats: Result of file_path.stat() if already known
+
+        Returns:
+            The Document, or None if the file was skipped or could not be loaded
+        """
+        # Check file size before opening; the same stat result feeds the metadata below
+        if file_stats is None:
+            file_stats = file_path.stat()
+        if max_size_bytes and file_stats.st_size > max_size_bytes:
+            logger.warning(f"Skipping large file: {file_path} (size > {max_file_size_mb}MB)")
+            return None
+        if file_stats.st_size == 0:
+            logger.warning(f"Empty file skipped: {file_path}")
+            return None
+
+        # Load file content
+        try:
+            content = self._read_file_content(file_path, file_stats.st_size)
+            if not content:
+                logger.warning(f"Empty file skipped: {file_path}")
+                return None
 
-            except Exception as e:
-                logger.error(f"Error loading file {file_path}: {e}")
-                continue
+            # Extract hierarchical metadata
+            metadata = self._extract_hierarchical_metadata(file_path, root_path, file_stats)
 
-        logger.info(f"Loaded {len(documents)} documents from {root_path}")
-        return documents
+            # Add additional metadata if provided
+            if additional_metadata:
+                metadata.update(additional_metadata)
+
+            # Create Document
+            document = Document(content=content, meta=metadata)
+            logger.debug(f"Loaded document: {file_path} with category: {metadata.get('category')}")
+            return document
+
+        except Exception as e:
+            logger.error(f"Error loading file {file_path}: {e}")
+            return None
 
     def load_from_google_drive(
         self, config: Config, folder_id: str, max_documents: Optional[int] = None
@@ -109,6 +283,29 @@ class HierarchicalDocumentLoader:
         Returns:
             List of Document objects with hierarchical metadata
         """
+        all_documents = list(self.iter_from_google_drive(config, folder_id, max_documents))
+        logger.info(f"Loaded {len(all_documents)} documents from Google Drive with hierarchy")
+        return all_documents
+
+    def iter_from_google_drive(
+        self, config: Config, folder_id: str, max_documents: Optional[int] = None
+    ) -> Iterator[Document]:
+        """
+        Yield documents from Google Drive with hierarchical folder metadata.
+
+        Documents are yielded as their downloads complete, not in folder or listing order.
+
+        Args:
+            config: Configuration object
+            folder_id: Google Drive folder ID
+            max_documents: Maximum number of documents to load
+
+        Yields:
+            Document objects with hierarchical metadata
+        """
+        # Imported here so local and GitHub loading don't pay for the Google API client
+        from .document_loader import GoogleDriveLoader
+
         loader = GoogleDriveLoader(config)
         loader.authenticate()
 
@@ -119,139 +316,214 @@ class HierarchicalDocumentLoader:
         # Build folder hierarchy map
         folder_map = self._build_folder_hierarchy_from_drive(all_folders, folder_id)
 
-        # Load documents from all folders (root + subfolders)
-        all_documents = []
+        # Load documents from all folders (root + subfolders); the loader lists folder after
+        # folder while earlier downloads are still in flight, sharing one download pool
         folders_to_process = [folder_id] + [f["id"] for f in all_folders]
 
         logger.info(f"Processing {len(folders_to_process)} folders...")
-        for idx, current_folder_id in enumerate(folders_to_process):
-            folder_name = folder_map.get(current_folder_id, {}).get("name", "root")
-            logger.debug(
-                f"Loading documents from folder {idx+1}/{len(folders_to_process)}: {folder_name}"
-            )
-
-            # Load documents from this specific folder
-            raw_documents = loader.load_documents(current_folder_id, max_documents=None)
-
-            for doc_data in raw_documents:
-                # Create Document object from raw data
-                content = doc_data.get("content", "")
-                metadata = doc_data.get("metadata", {})
-
-                # Add hierarchical metadata based on folder
-                hierarchical_meta = self._get_google_drive_hierarchy(
-                    [current_folder_id], folder_map
-                )
-                metadata.update(hierarchical_meta)
-                metadata["source"] = "google_drive"
-                metadata["file_name"] = metadata.get("name", "unknown")
-                metadata["folder_id"] = current_folder_id
-
-                # Create Document
-                document = Document(content=content, meta=metadata)
-                all_documents.append(document)
-
-                # Stop if we've reached max documents
-                if max_documents and len(all_documents) >= max_documents:
-                    break
-
-            if max_documents and len(all_documents) >= max_documents:
-                break
-
-        logger.info(f"Loaded {len(all_documents)} documents from Google Drive with hierarchy")
-        return all_documents
-
-    def _traverse_directory(self, directory: Path) -> List[Path]:
+        for current_folder_id, doc_data in loader.iter_folder_documents(
+            folders_to_process, max_documents
+        ):
+            # Create Document object from raw data
+            content = doc_data.get("content", "")
+            metadata = doc_data.get("metadata", {})
+
+            # Add hierarchical metadata based on folder
+            hierarchical_meta = self._get_google_drive_hierarchy([current_folder_id], folder_map)
+            metadata.update(hierarchical_meta)
+            metadata["source"] = "google_drive"
+            metadata["file_name"] = metadata.get("name", "unknown")
+            metadata["folder_id"] = current_folder_id
+
+            # Create Document
+            yield Document(content=content, meta=metadata)
+
+    def _traverse_directory(self, directory: Path) -> Iterator[os.DirEntry]:
         """
-        Recursively traverse directory and return all file paths.
+        Walk a directory tree and yield the directory entry of every file.
+
+        Uses an explicit stack over os.scandir(), whose entries answer is_dir()/is_file() from
+        the directory listing without an extra stat per entry. Symlinked files are loaded, but
+        symlinked directories are not descended into, so link cycles cannot loop forever.
 
         Args:
             directory: Directory to traverse
 
-        Returns:
-            List of file paths
-        """
-        file_paths = []
+        Yields:
+            os.DirEntry objects for files, whose stat() result is cached for reuse
 
-        try:
-            for item in directory.iterdir():
-                if item.is_dir():
-                    # Recursively traverse subdirectories
-                    file_paths.extend(self._traverse_directory(item))
-                elif item.is_file():
-                    file_paths.append(item)
-        except PermissionError as e:
-            logger.error(f"Permission denied accessing: {directory}")
-            raise e
-
-        return file_paths
-
-    def _read_file_content(self, file_path: Path) -> str:
+        Raises:
+            PermissionError: If access is denied to a directory
+        """
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(Path(entry.path))
+                            elif entry.is_file():
+                                yield entry
+                        except OSError as e:
+                            # One unreadable entry shouldn't abort the whole walk
+                            logger.warning(f"Skipping unreadable entry {entry.path}: {e}")
+            except PermissionError as e:
+                logger.error(f"Permission denied accessing: {current}")
+                raise e
+
+    def _read_file_content(self, file_path: Path, file_size: Optional[int] = None) -> str:
         """
         Read content from a file.
 
         Args:
             file_path: Path to the file
+            file_size: Size of the file in bytes if already known
 
         Returns:
             File content as string
         """
         try:
             if file_path.suffix.lower() == ".pdf":
-                # For PDF files, we'd use a PDF reader library
-                # For now, return placeholder
                 logger.debug(f"PDF file detected: {file_path}")
-                return file_path.read_bytes().decode("utf-8", errors="ignore")[:1000]
+                return self._read_pdf(file_path)
             else:
-                # Text-based files
-                return file_path.read_text(encoding="utf-8", errors="ignore")
+                content = self._decode_file(file_path, file_size)
+                if "\r" in content:
+                    # Match read_text()'s universal newline handling
+                    content = content.replace("\r\n", "\n").replace("\r", "\n")
+                return content
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
             return ""
 
-    def _extract_hierarchical_metadata(self, file_path: Path, root_path: Path) -> Dict[str, Any]:
+    def _read_pdf(self, file_path: Path) -> str:
+        """
+        Extract the text of a PDF file.
+
+        Uses pypdf when it is installed. Otherwise falls back to a placeholder: the first
+        PDF_PLACEHOLDER_CHARS characters of the raw file decoded as UTF-8.
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            Extracted text
+        """
+        pdf_reader_class = _pdf_reader_class()
+        if pdf_reader_class is None:
+            return self._decode_file_prefix(file_path, self.PDF_PLACEHOLDER_CHARS)
+
+        with open(file_path, "rb") as f:
+            reader = pdf_reader_class(f)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    def _decode_file_prefix(self, file_path: Path, num_chars: int) -> str:
+        """
+        Decode the start of a file as UTF-8, dropping undecodable bytes.
+
+        Reads PREFIX_READ_SIZE blocks only until num_chars characters have been decoded,
+        instead of decoding the whole file and slicing it.
+
+        Args:
+            file_path: Path to the file
+            num_chars: Number of characters to return
+
+        Returns:
+            Up to num_chars characters from the start of the file
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        pieces: List[str] = []
+        decoded = 0
+        with open(file_path, "rb") as f:
+            while decoded < num_chars:
+                block = f.read(self.PREFIX_READ_SIZE)
+                piece = decoder.decode(block, final=not block)
+                pieces.append(piece)
+                decoded += len(piece)
+                if not block:
+                    break
+        return "".join(pieces)[:num_chars]
+
+    def _decode_file(self, file_path: Path, file_size: Optional[int] = None) -> str:
+        """
+        Decode a whole file as UTF-8, dropping undecodable bytes.
+
+        Small files are read in a single unbuffered call. Files of MMAP_THRESHOLD bytes or more
+        are memory-mapped and decoded straight from the page cache, so a large file isn't held
+        in memory twice (as bytes and as str) while it is decoded.
+
+        Args:
+            file_path: Path to the file
+            file_size: Size of the file in bytes if already known, saving an fstat
+
+        Returns:
+            Decoded file content
+        """
+        with open(file_path, "rb", buffering=0) as f:
+            if file_size is None:
+                file_size = os.fstat(f.fileno()).st_size
+            if file_size < self.MMAP_THRESHOLD:
+                return f.read().decode("utf-8", errors="ignore")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8", "ignore")
+
+    def _extract_hierarchical_metadata(
+        self, file_path: Path, root_path: Path, file_stats: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """
         Extract hierarchical metadata from file path.
 
         Args:
             file_path: Path to the file
             root_path: Root directory path
+            file_stats: Result of file_path.stat() if already known
 
         Returns:
             Dictionary of metadata
         """
-        # Get relative path from root
-        relative_path = file_path.relative_to(root_path)
-        path_parts = relative_path.parts[:-1]  # Exclude the filename
-
-        # Extract category and subcategory
-        category = path_parts[0] if len(path_parts) > 0 else "root"
-        subcategory = path_parts[1] if len(path_parts) > 1 else None
+        # Get path components relative to root. Paths from the directory walk extend the root's
+        # string form, so slice and split that instead of building relative Path objects.
+        path_str = str(file_path)
+        root_prefix = os.path.join(str(root_path), "")
+        if path_str.startswith(root_prefix):
+            parts = path_str[len(root_prefix) :].split(os.sep)
+        else:
+            parts = list(file_path.relative_to(root_path).parts)
+        path_parts = parts[:-1]  # Exclude the filename
+        file_name = parts[-1]
+
+        # Extract category and subcategory (interned: they repeat for every file in a folder,
+        # so large loads share one string object per folder instead of one per document)
+        category = sys.intern(path_parts[0]) if len(path_parts) > 0 else "root"
+        subcategory = sys.intern(path_parts[1]) if len(path_parts) > 1 else None
 
         # Build hierarchy path
-        hierarchy_path = "/".join(path_parts) if path_parts else "root"
+        hierarchy_path = sys.intern("/".join(path_parts)) if path_parts else "root"
 
         # Get file stats
-        file_stats = file_path.stat()
+        if file_stats is None:
+            file_stats = file_path.stat()
 
         metadata = {
-            "file_name": file_path.name,
-            "file_path": str(file_path),
+            "file_name": file_name,
+            "file_path": path_str,
             "category": category,
             "subcategory": subcategory,
             "hierarchy_path": hierarchy_path,
             "hierarchy_level": len(path_parts),
-            "file_type": file_path.suffix.lower(),
+            "file_type": sys.intern(os.path.splitext(file_name)[1].lower()),
             "file_size_bytes": file_stats.st_size,
-            "modified_date": datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
-            "created_date": datetime.fromtimestamp(file_stats.st_ctime).isoformat(),
+            "modified_date": _iso_ts(file_stats.st_mtime),
+            "created_date": _iso_ts(file_stats.st_ctime),
             "source": "local",
         }
 
         return metadata
 
     def _get_all_folders_recursive(
-        self, loader: GoogleDriveLoader, folder_id: str
+        self, loader: "GoogleDriveLoader", folder_id: str
     ) -> List[Dict[str, Any]]:
         """
         Get all folders recursively under a root folder.
@@ -266,35 +538,8 @@ class HierarchicalDocumentLoader:
         if not loader.service:
             return []
 
-        all_folders = []
-        folders_to_process = [folder_id]
-        processed_folders = set()
-
-        while folders_to_process:
-            current_folder = folders_to_process.pop(0)
-            if current_folder in processed_folders:
-                continue
-
-            processed_folders.add(current_folder)
-
-            try:
-                # Query for subfolders in current folder
-                query = f"'{current_folder}' in parents and mimeType='application/vnd.google-apps.folder'"
-                response = (
-                    loader.service.files()
-                    .list(q=query, fields="files(id, name, parents)", pageSize=1000)
-                    .execute()
-                )
-
-                subfolders = response.get("files", [])
-                for folder in subfolders:
-                    all_folders.append(folder)
-                    folders_to_process.append(folder["id"])
-
-            except Exception as e:
-                logger.warning(f"Error getting subfolders for {current_folder}: {e}")
-
-        return all_folders
+        # Lists each level of the tree with batched requests rather than one call per folder
+        return loader.get_subfolders_recursive(folder_id)
 
     def _build_folder_hierarchy_from_drive(
         self, folders: List[Dict[str, Any]], root_folder_id: str
@@ -328,25 +573,39 @@ class HierarchicalDocumentLoader:
                     "path": None,  # Will be computed
                 }
 
+        # Path names each folder contributes to its descendants' paths (itself and its
+        # ancestors, minus any named "root"), memoized so shared ancestor chains are walked once
+        prefixes: Dict[str, Tuple[str, ...]] = {}
+
+        def parent_of(folder_id: str) -> Optional[str]:
+            parents = folder_map[folder_id]["parents"]
+            return parents[0] if parents and parents[0] in folder_map else None
+
+        def prefix_of(folder_id: Optional[str]) -> Tuple[str, ...]:
+            # Climb to the first folder with a known prefix (or the top), then fill in the
+            # prefixes of the climbed folders on the way back down
+            chain: List[str] = []
+            seen = set()
+            current = folder_id
+            while current is not None and current not in prefixes and current not in seen:
+                chain.append(current)
+                seen.add(current)
+                current = parent_of(current)
+
+            prefix = prefixes.get(current, ()) if current is not None else ()
+            for chain_id in reversed(chain):
+                name = folder_map[chain_id]["name"]
+                if name != "root":
+                    prefix = prefix + (name,)
+                prefixes[chain_id] = prefix
+            return prefixes[folder_id] if folder_id is not None else ()
+
         # Compute full paths for each folder
         for folder_id, folder_info in folder_map.items():
             if folder_id == root_folder_id:
                 continue  # Skip root, already has path
 
-            path_parts = [folder_info["name"]]
-            current_parents = folder_info["parents"]
-
-            # Traverse up the hierarchy
-            while current_parents:
-                parent_id = current_parents[0]
-                if parent_id in folder_map:
-                    parent_info = folder_map[parent_id]
-                    if parent_info["name"] != "root":
-                        path_parts.insert(0, parent_info["name"])
-                    current_parents = parent_info["parents"]
-                else:
-                    break
-
+            path_parts = prefix_of(parent_of(folder_id)) + (folder_info["name"],)
             folder_info["path"] = "/".join(path_parts)
 
         return folder_map
@@ -1,8 +1,8 @@
 """Hierarchical Document Splitter for multi-level chunking."""
 
-import hashlib
 import logging
-from typing import Dict, List, Optional
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from haystack import Document
 
@@ -63,12 +63,31 @@ class HierarchicalDocumentSplitter:
         Returns:
             List of chunked documents with hierarchy metadata
         """
+        all_chunks = list(self.iter_chunks(documents, levels))
+
+        logger.info(f"Created {len(all_chunks)} chunks from {len(documents)} documents")
+        return all_chunks
+
+    def iter_chunks(
+        self,
+        documents: Iterable[Document],
+        levels: Optional[List[str]] = None,
+    ) -> Iterator[Document]:
+        """
+        Split documents into hierarchical chunks one document at a time.
+
+        Args:
+            documents: Documents to split
+            levels: Which levels to create (["parent", "child", "grandchild"])
+                   If None, creates all levels
+
+        Yields:
+            Chunked documents with hierarchy metadata, in the same order as split_documents()
+        """
         if levels is None:
             levels = ["parent", "child", "grandchild"]
 
-        all_chunks = []
-
-        for doc_idx, doc in enumerate(documents):
+        for doc in documents:
             if not doc.content:
                 logger.warning(f"Skipping empty document: {doc.meta.get('file_name', 'unknown')}")
                 continue
@@ -79,8 +98,13 @@ class HierarchicalDocumentSplitter:
             if not words:
                 continue
 
+            # Join once per document; every chunk at every level is then a slice of this
+            # text, located through the character offset of each word
+            text = " ".join(words)
+            word_offsets = list(accumulate((len(word) + 1 for word in words), initial=0))
+
             # Generate document ID for tracking
-            doc_id = self._generate_doc_id(doc, doc_idx)
+            doc_id = self._generate_doc_id(doc)
 
             # Create chunks at each level
             doc_chunks = []
@@ -103,7 +127,8 @@ class HierarchicalDocumentSplitter:
                 # Create parent chunks
                 if "parent" in levels:
                     parent_chunks = self._create_chunks(
-                        words=words,
+                        text=text,
+                        word_offsets=word_offsets,
                         chunk_size=self.parent_chunk_size,
                         overlap=self.chunk_overlap,
                         level="parent",
@@ -115,7 +140,8 @@ class HierarchicalDocumentSplitter:
                 # Create child chunks
                 if "child" in levels:
                     child_chunks = self._create_chunks(
-                        words=words,
+                        text=text,
+                        word_offsets=word_offsets,
                         chunk_size=self.child_chunk_size,
                         overlap=self.chunk_overlap,
                         level="child",
@@ -136,7 +162,8 @@ class HierarchicalDocumentSplitter:
                 # Create grandchild chunks
                 if "grandchild" in levels:
                     grandchild_chunks = self._create_chunks(
-                        words=words,
+                        text=text,
+                        word_offsets=word_offsets,
                         chunk_size=self.grandchild_chunk_size,
                         overlap=self.chunk_overlap,
                         level="grandchild",
@@ -156,14 +183,12 @@ class HierarchicalDocumentSplitter:
 
                     doc_chunks.extend(grandchild_chunks)
 
-            all_chunks.extend(doc_chunks)
-
-        logger.info(f"Created {len(all_chunks)} chunks from {len(documents)} documents")
-        return all_chunks
+            yield from doc_chunks
 
     def _create_chunks(
         self,
-        words: List[str],
+        text: str,
+        word_offsets: List[int],
         chunk_size: int,
         overlap: int,
         level: str,
@@ -174,7 +199,8 @@ class HierarchicalDocumentSplitter:
         Create chunks of a specific size from words.
 
         Args:
-            words: List of words to chunk
+            text: Document words joined by single spaces
+            word_offsets: Character offset of each word in text, plus one past the end
             chunk_size: Size of each chunk
             overlap: Overlap between chunks
             level: Hierarchy level (parent/child/grandchild)
@@ -184,57 +210,35 @@ class HierarchicalDocumentSplitter:
         Returns:
             List of chunk documents
         """
-        chunks = []
-        total_words = len(words)
+        total_words = len(word_offsets) - 1
 
         # Calculate step size (chunk_size - overlap)
         step = max(1, chunk_size - overlap)
 
-        # Create chunks
-        chunk_index = 0
-        start = 0
+        # Windows start every `step` words; the first one reaching the end is the last
+        num_chunks = max(0, -(-(total_words - chunk_size) // step)) + 1
+        starts = range(0, total_words, step)[:num_chunks]
 
-        while start < total_words:
+        chunks = []
+        for chunk_index, start in enumerate(starts):
             end = min(start + chunk_size, total_words)
 
-            # Extract chunk words
-            chunk_words = words[start:end]
-            chunk_content = " ".join(chunk_words)
-
-            # Generate chunk ID
-            chunk_id = self._generate_chunk_id(doc_id, level, chunk_index)
-
             # Create chunk metadata
-            chunk_meta = original_meta.copy()
-            chunk_meta.update(
-                {
-                    "chunk_id": chunk_id,
-                    "chunk_level": level,
-                    "chunk_index": chunk_index,
-                    "chunk_start": start,
-                    "chunk_end": end,
-                    "total_chunks": -1,  # Will be updated later
-                    "parent_id": None,  # Will be assigned later if applicable
-                    "doc_id": doc_id,
-                }
-            )
+            chunk_meta = {
+                **original_meta,
+                "chunk_id": self._generate_chunk_id(doc_id, level, chunk_index),
+                "chunk_level": level,
+                "chunk_index": chunk_index,
+                "chunk_start": start,
+                "chunk_end": end,
+                "total_chunks": num_chunks,
+                "parent_id": None,  # Will be assigned later if applicable
+                "doc_id": doc_id,
+            }
 
             # Create chunk document
-            chunk = Document(content=chunk_content, meta=chunk_meta)
-            chunks.append(chunk)
-
-            chunk_index += 1
-
-            # Move to next chunk position
-            start += step
-
-            # If we've reached the end, break
-            if end >= total_words:
-                break
-
-        # Update total chunks count
-        for chunk in chunks:
-            chunk.meta["total_chunks"] = len(chunks)
+            content = text[word_offsets[start] : word_offsets[end] - 1]
+            chunks.append(Document(content=content, meta=chunk_meta))
 
         return chunks
 
@@ -260,19 +264,17 @@ class HierarchicalDocumentSplitter:
         chunk_content = " ".join(words)
         chunk_id = self._generate_chunk_id(doc_id, level, 0)
 
-        chunk_meta = original_meta.copy()
-        chunk_meta.update(
-            {
-                "chunk_id": chunk_id,
-                "chunk_level": level,
-                "chunk_index": 0,
-                "chunk_start": 0,
-                "chunk_end": len(words),
-                "total_chunks": 1,
-                "parent_id": None,
-                "doc_id": doc_id,
-            }
-        )
+        chunk_meta = {
+            **original_meta,
+            "chunk_id": chunk_id,
+            "chunk_level": level,
+            "chunk_index": 0,
+            "chunk_start": 0,
+            "chunk_end": len(words),
+            "total_chunks": 1,
+            "parent_id": None,
+            "doc_id": doc_id,
+        }
 
         return Document(content=chunk_content, meta=chunk_meta)
 
@@ -284,55 +286,59 @@ class HierarchicalDocumentSplitter:
         """
         Assign parent IDs to child chunks based on overlap.
 
+        Both lists come from _create_chunks and are ordered by chunk_start with non-decreasing
+        chunk_end, so a single forward sweep finds each child's overlapping parents and the
+        whole assignment is O(children + parents).
+
         Args:
             child_chunks: List of child chunks
             parent_chunks: List of parent chunks
         """
+        parent_starts = [parent.meta["chunk_start"] for parent in parent_chunks]
+        parent_ends = [parent.meta["chunk_end"] for parent in parent_chunks]
+        num_parents = len(parent_chunks)
+        first = 0
+
         for child in child_chunks:
             child_start = child.meta["chunk_start"]
             child_end = child.meta["chunk_end"]
 
-            # Find the parent chunk that best contains this child
+            # Parents ending before this child starts can't overlap it or any later child
+            while first < num_parents and parent_ends[first] <= child_start:
+                first += 1
+
+            # Find the parent chunk that best contains this child (earliest wins ties)
             best_parent = None
             best_overlap = 0
 
-            for parent in parent_chunks:
-                parent_start = parent.meta["chunk_start"]
-                parent_end = parent.meta["chunk_end"]
-
-                # Calculate overlap
-                overlap_start = max(child_start, parent_start)
-                overlap_end = min(child_end, parent_end)
-                overlap = max(0, overlap_end - overlap_start)
-
+            i = first
+            while i < num_parents and parent_starts[i] < child_end:
+                overlap = min(child_end, parent_ends[i]) - max(child_start, parent_starts[i])
                 if overlap > best_overlap:
                     best_overlap = overlap
-                    best_parent = parent
+                    best_parent = i
+                i += 1
 
-            if best_parent:
-                child.meta["parent_id"] = best_parent.meta["chunk_id"]
+            if best_parent is not None:
+                child.meta["parent_id"] = parent_chunks[best_parent].meta["chunk_id"]
 
-    def _generate_doc_id(self, doc: Document, doc_idx: int) -> str:
+    def _generate_doc_id(self, doc: Document) -> str:
         """
-        Generate a unique document ID.
+        Generate a document ID that is stable across batches.
+
+        The ID comes from the Document's own ID (a hash of its content and metadata) rather
+        than its position in the batch, so documents split in different batches never share
+        chunk or parent IDs.
 
         Args:
             doc: Document
-            doc_idx: Document index
 
         Returns:
             Document ID
         """
-        # Use file name if available, otherwise use content hash
-        if "file_name" in doc.meta:
-            base = doc.meta["file_name"]
-        else:
-            # Create hash of content for uniqueness
-            content = doc.content if doc.content else ""
-            content_hash = hashlib.md5(content.encode()).hexdigest()[:8]
-            base = f"doc_{content_hash}"
-
-        return f"{base}_{doc_idx}"
+        # Keep the file name as a readable prefix when there is one
+        base = doc.meta.get("file_name", "doc")
+        return f"{base}_{doc.id[:16]}"
 
     def _generate_chunk_id(self, doc_id: str, level: str, chunk_index: int) -> str:
         """
@@ -1,25 +1,57 @@
-from typing import Any, Dict, List, Optional, cast
+import logging
+import multiprocessing
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, cast
 
 from haystack import Document, Pipeline
 from haystack.components.preprocessors import DocumentSplitter
 from haystack.components.writers import DocumentWriter
 from haystack_integrations.components.embedders.ollama import OllamaDocumentEmbedder
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
+from haystack_integrations.document_stores.qdrant.converters import (
+    convert_haystack_documents_to_qdrant_points,
+    convert_id,
+)
+from qdrant_client import QdrantClient, models
 
 from src.config import Config
+from src.embedding_cache import EmbeddingCache
 from src.hierarchical_splitter import HierarchicalDocumentSplitter
 
+logger = logging.getLogger(__name__)
+
 
 class IndexingPipeline:
     """Indexing pipeline for RAG system using Haystack and Qdrant."""
 
     # Supported MIME types for document processing
-    SUPPORTED_MIME_TYPES = [
-        "text/plain",
-        "application/vnd.google-apps.document",  # Google Docs
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",  # Word docs
-    ]
+    SUPPORTED_MIME_TYPES = frozenset(
+        {
+            "text/plain",
+            "application/vnd.google-apps.document",  # Google Docs
+            "application/pdf",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",  # Word docs
+        }
+    )
+
+    # Metadata fields queries filter on, indexed so filtered searches skip non-matching points
+    PAYLOAD_INDEX_FIELDS = ("meta.mimeType", "meta.category", "meta.file_type")
+
+    # Qdrant's default threshold (in KB of vectors) before a segment gets an HNSW index, assumed
+    # when a collection doesn't report its own
+    DEFAULT_INDEXING_THRESHOLD = 20000
+
+    # Chunks split, embedded and written together by process_documents_hierarchical()
+    CHUNK_SLAB_SIZE = 512
 
     def __init__(self, config: Config):
         """Initialize the indexing pipeline.
@@ -30,27 +62,97 @@ class IndexingPipeline:
         self.config = config
         self.document_store: Optional[QdrantDocumentStore] = None
         self.pipeline: Optional[Pipeline] = None
+        # Document store and settings self.pipeline was built with
+        self._pipeline_key: Optional[Tuple[Any, ...]] = None
         self.use_hierarchical = False  # Flag to enable hierarchical processing
+        # Embedder shared by the indexing pipeline and process_documents_hierarchical(),
+        # keeping its HTTP connection to Ollama alive between batches
+        self._embedder: Optional[OllamaDocumentEmbedder] = None
+        # Opened on first use when config.embedding_cache_path is set
+        self._embedding_cache: Optional[EmbeddingCache] = None
+
+    def setup_document_store(self, recreate: bool = False) -> None:
+        """Setup Qdrant document store.
+
+        Args:
+            recreate: Drop and recreate the collection, clearing all indexed documents
+        """
+        store_kwargs: Dict[str, Any] = {}
+        quantization_config = self.get_quantization_config()
+        if quantization_config is not None:
+            # Only applied when Qdrant creates the collection. The quantized copy is kept in RAM
+            # for search, so the full-precision vectors (only read for rescoring) go on disk
+            store_kwargs["quantization_config"] = quantization_config
+            store_kwargs["on_disk"] = True
 
-    def setup_document_store(self) -> None:
-        """Setup Qdrant document store."""
         self.document_store = QdrantDocumentStore(
             url=self.config.qdrant_url,
             index=self.config.qdrant_collection_name,
             embedding_dim=1024,  # mxbai-embed-large dimension
             wait_result_from_api=True,
-            recreate_index=False,
+            recreate_index=recreate,
+            # Created along with the collection
+            payload_fields_to_index=[
+                {"field_name": field, "field_schema": models.PayloadSchemaType.KEYWORD}
+                for field in self.PAYLOAD_INDEX_FIELDS
+            ],
+            **store_kwargs,
+        )
+
+        if recreate:
+            # The store connects lazily; recreate now so the collection is cleared up front
+            self.document_store._initialize_client()
+
+    def get_quantization_config(self) -> Optional[models.QuantizationConfig]:
+        """Build the Qdrant vector quantization config from configuration.
+
+        Returns:
+            Scalar (int8) or binary quantization config, or None for full-precision vectors
+        """
+        quantization = (self.config.qdrant_quantization or "none").lower()
+
+        if quantization == "none":
+            return None
+        if quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+
+        raise ValueError(
+            f"Unsupported quantization: {self.config.qdrant_quantization}. "
+            "Expected one of: none, scalar, binary."
         )
 
     def create_indexing_pipeline(self) -> None:
-        """Create the indexing pipeline with all components."""
+        """Create the indexing pipeline with all components.
+
+        The pipeline is only rebuilt when the document store or a setting it depends on has
+        changed, so repeated initialization reuses the connected and validated graph.
+        """
         if not self.document_store:
             raise ValueError("Document store not initialized. Call setup_document_store() first.")
 
-        # Initialize components
-        embedder = OllamaDocumentEmbedder(
-            model=self.config.ollama_embedding_model, url=self.config.ollama_base_url
+        pipeline_key = (
+            self.document_store,
+            self.config.chunk_size,
+            self.config.chunk_overlap,
+            self.config.ollama_embedding_model,
+            self.config.ollama_base_url,
+            self.config.ollama_embedding_batch_size,
         )
+        if self.pipeline is not None and self._pipeline_key == pipeline_key:
+            return
+
+        # Initialize components; the embedder is shared with the hierarchical path so both
+        # reuse one HTTP client to Ollama
+        embedder = self._create_embedder()
+        self._embedder = embedder
 
         splitter = DocumentSplitter(
             split_by="word",  # Split by word count
@@ -69,6 +171,89 @@ class IndexingPipeline:
         # Connect components
         self.pipeline.connect("splitter", "embedder")
         self.pipeline.connect("embedder", "writer")
+        self._pipeline_key = pipeline_key
+
+    def _create_embedder(self) -> OllamaDocumentEmbedder:
+        """Create a document embedder that sends texts to Ollama's /api/embed in batches.
+
+        Returns:
+            Configured OllamaDocumentEmbedder
+        """
+        return OllamaDocumentEmbedder(
+            model=self.config.ollama_embedding_model,
+            url=self.config.ollama_base_url,
+            batch_size=self.config.ollama_embedding_batch_size,
+            # Progress bars would interleave across concurrent batches and the scripts'
+            # own progress displays
+            progress_bar=False,
+        )
+
+    def _embed_documents(self, documents: List[Document]) -> List[Document]:
+        """Embed documents, reusing vectors for repeated and previously embedded text.
+
+        Args:
+            documents: Documents to embed
+
+        Returns:
+            The documents with embeddings attached, in input order
+        """
+        # Hierarchy levels repeat text (a short document is its own parent, child and
+        # grandchild chunk), so embed each distinct text once and share the vector
+        unique: Dict[str, Document] = {}
+        for doc in documents:
+            unique.setdefault(doc.content or "", doc)
+
+        cache = self._get_embedding_cache()
+        if cache is None:
+            misses = list(unique.values())
+        else:
+            cached = cache.get_many(unique)
+            for text, vector in cached.items():
+                unique[text].embedding = vector
+            misses = [doc for text, doc in unique.items() if text not in cached]
+
+        if misses:
+            self._embed_uncached(misses)
+            if cache is not None:
+                cache.put_many((doc.content or "", doc.embedding) for doc in misses)
+
+        for doc in documents:
+            doc.embedding = unique[doc.content or ""].embedding
+        return documents
+
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Return the persistent embedding cache, or None if it isn't configured."""
+        if self._embedding_cache is None and self.config.embedding_cache_path:
+            self._embedding_cache = EmbeddingCache(
+                self.config.embedding_cache_path, self.config.ollama_embedding_model
+            )
+        return self._embedding_cache
+
+    def _embed_uncached(self, documents: List[Document]) -> List[Document]:
+        """Embed documents, keeping up to ollama_concurrency embedding batches in flight.
+
+        Ollama embeds the texts of one request sequentially, so throughput comes from running
+        several requests at once over the embedder's shared HTTP client.
+
+        Args:
+            documents: Documents to embed
+
+        Returns:
+            The documents with embeddings attached, in input order
+        """
+        if self._embedder is None:
+            self._embedder = self._create_embedder()
+        embedder = self._embedder
+
+        batch_size = max(1, self.config.ollama_embedding_batch_size)
+        concurrency = max(1, self.config.ollama_concurrency)
+        if concurrency == 1 or len(documents) <= batch_size:
+            return cast(List[Document], embedder.run(documents)["documents"])
+
+        batches = [documents[i : i + batch_size] for i in range(0, len(documents), batch_size)]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = executor.map(lambda batch: embedder.run(batch)["documents"], batches)
+            return [doc for embedded in results for doc in cast(List[Document], embedded)]
 
     def convert_documents(self, raw_documents: List[Dict[str, Any]]) -> List[Document]:
         """Convert raw documents to Haystack Document format.
@@ -79,11 +264,21 @@ class IndexingPipeline:
         Returns:
             List of Haystack Document objects
         """
-        haystack_documents = []
+        return list(self.iter_documents(raw_documents))
+
+    def iter_documents(self, raw_documents: Iterable[Dict[str, Any]]) -> Iterator[Document]:
+        """Convert raw documents to Haystack Documents one at a time.
 
+        Args:
+            raw_documents: Iterable of raw documents with content and metadata
+
+        Yields:
+            Haystack Document objects, skipping unsupported MIME types
+        """
         for raw_doc in raw_documents:
             # Process text-based documents
-            mime_type = raw_doc["metadata"].get("mimeType", "")
+            metadata = raw_doc["metadata"]
+            mime_type = metadata.get("mimeType", "")
 
             # Skip non-text documents
             if mime_type and mime_type not in self.SUPPORTED_MIME_TYPES:
@@ -95,16 +290,17 @@ class IndexingPipeline:
                 content = content.decode("utf-8", errors="ignore")
 
             # Create Haystack Document
-            doc = Document(content=content, meta=raw_doc["metadata"])
-            haystack_documents.append(doc)
+            yield Document(content=content, meta=metadata)
 
-        return haystack_documents
-
-    def process_documents(self, raw_documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def process_documents(
+        self, raw_documents: List[Dict[str, Any]], bulk_mode: bool = False
+    ) -> Dict[str, Any]:
         """Process documents through the indexing pipeline.
 
         Args:
             raw_documents: List of raw documents to process
+            bulk_mode: Disable HNSW indexing during the upload and restore it afterwards,
+                so Qdrant builds the graph once instead of on every segment flush
 
         Returns:
             Processing results
@@ -123,7 +319,8 @@ class IndexingPipeline:
             }
 
         # Run pipeline
-        result = self.pipeline.run({"splitter": {"documents": documents}})
+        with self._indexing_paused(bulk_mode):
+            result = self.pipeline.run({"splitter": {"documents": documents}})
 
         return {
             "documents_processed": len(documents),
@@ -131,6 +328,41 @@ class IndexingPipeline:
             "result": result,
         }
 
+    def process_documents_streaming(
+        self,
+        raw_documents: Iterable[Dict[str, Any]],
+        batch_size: int = 256,
+        bulk_mode: bool = False,
+    ) -> Dict[str, Any]:
+        """Process a stream of raw documents through the indexing pipeline in fixed-size batches.
+
+        Only one batch of documents is held in memory at a time, so raw documents can come
+        straight from a streaming loader such as GoogleDriveLoader.iter_documents().
+
+        Args:
+            raw_documents: Iterable of raw documents to process
+            batch_size: Number of documents to split, embed and write per pipeline run
+            bulk_mode: Disable HNSW indexing during the upload and restore it afterwards,
+                so Qdrant builds the graph once instead of on every segment flush
+
+        Returns:
+            Aggregated processing results
+        """
+        if not self.pipeline:
+            raise ValueError("Pipeline not initialized. Call create_indexing_pipeline() first.")
+
+        totals = {"documents_processed": 0, "documents_written": 0}
+        doc_iter = self.iter_documents(raw_documents)
+        batches: Iterator[List[Document]] = iter(lambda: list(islice(doc_iter, batch_size)), [])
+
+        with self._indexing_paused(bulk_mode):
+            for batch in batches:
+                result = self.pipeline.run({"splitter": {"documents": batch}})
+                totals["documents_processed"] += len(batch)
+                totals["documents_written"] += result.get("writer", {}).get("documents_written", 0)
+
+        return totals
+
     def process_documents_hierarchical(self, documents: List[Document]) -> Dict[str, Any]:
         """Process documents with hierarchical splitting.
 
@@ -151,29 +383,204 @@ class IndexingPipeline:
             chunk_overlap=50,
         )
 
-        # Split documents hierarchically
-        chunks = hierarchical_splitter.split_documents(documents)
-
-        # Embed chunks
-        embedder = OllamaDocumentEmbedder(
-            model=self.config.ollama_embedding_model, url=self.config.ollama_base_url
+        # Split, embed and write chunks a slab at a time, so only a couple of slabs of chunks
+        # and their embeddings are held in memory
+        chunks = hierarchical_splitter.iter_chunks(documents)
+        slabs: Iterator[List[Document]] = iter(
+            lambda: list(islice(chunks, self.CHUNK_SLAB_SIZE)), []
         )
-
-        # Embed all chunks
-        embedded_result = embedder.run(chunks)
-        embedded_docs = cast(List[Document], embedded_result["documents"])
-
-        # Write to document store
-        writer = DocumentWriter(document_store=self.document_store)
-        result = writer.run(documents=embedded_docs)
+        chunks_created = 0
+        documents_written = 0
+        # Write each slab in the background while the next one is embedded
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-writer") as writer:
+            pending_write: Optional[Future] = None
+            for slab in slabs:
+                chunks_created += len(slab)
+                embedded = self._embed_documents(slab)
+                if pending_write is not None:
+                    documents_written += pending_write.result()
+                pending_write = writer.submit(self._write_documents, embedded)
+
+            if pending_write is not None:
+                documents_written += pending_write.result()
+
+        logger.info(f"Created {chunks_created} chunks from {len(documents)} documents")
 
         return {
             "documents_processed": len(documents),
-            "chunks_created": len(chunks),
-            "chunks_written": result.get("documents_written", 0),
-            "result": result,
+            "chunks_created": chunks_created,
+            "chunks_written": documents_written,
+            # Same shape as the DocumentWriter output this used to pass through
+            "result": {"documents_written": documents_written},
         }
 
+    def process_documents_hierarchical_batched(
+        self,
+        documents: Iterable[Document],
+        batch_size: int = 2000,
+        workers: int = 1,
+        bulk_mode: bool = False,
+    ) -> Dict[str, Any]:
+        """Process a stream of documents with hierarchical splitting in fixed-size batches.
+
+        Args:
+            documents: Iterable of Haystack Document objects with hierarchical metadata
+            batch_size: Number of documents to split, embed and write per batch
+            workers: Number of processes to index batches in; 1 indexes in this process.
+                Every process embeds with up to ollama_concurrency requests in flight, so
+                Ollama load grows with workers * ollama_concurrency
+            bulk_mode: Disable HNSW indexing during the upload and restore it afterwards,
+                so Qdrant builds the graph once instead of on every segment flush
+
+        Returns:
+            Aggregated processing results
+        """
+        if not self.document_store:
+            raise ValueError("Document store not initialized. Call setup_document_store() first.")
+
+        totals = {"documents_processed": 0, "chunks_created": 0, "chunks_written": 0}
+        doc_iter = iter(documents)
+        batches: Iterator[List[Document]] = iter(lambda: list(islice(doc_iter, batch_size)), [])
+
+        with self._indexing_paused(bulk_mode):
+            if workers > 1:
+                self._process_batches_in_processes(batches, workers, totals)
+            else:
+                for batch in batches:
+                    result = self.process_documents_hierarchical(batch)
+                    for key in totals:
+                        totals[key] += result[key]
+
+        return totals
+
+    def _process_batches_in_processes(
+        self, batches: Iterator[List[Document]], workers: int, totals: Dict[str, int]
+    ) -> None:
+        """Split, embed and write batches in a process pool, each worker writing to Qdrant.
+
+        Args:
+            batches: Iterator of document batches
+            workers: Number of worker processes
+            totals: Running totals, updated in place
+        """
+
+        def collect(done: Set[Future]) -> None:
+            for future in done:
+                result = future.result()
+                for key in totals:
+                    totals[key] += result[key]
+
+        # Spawn rather than fork: callers may have other threads (e.g. loaders) running
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_index_worker,
+            initargs=(self.config,),
+        ) as executor:
+            pending: Set[Future] = set()
+            for batch in batches:
+                # Keep only a couple of batches queued per worker to bound memory
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(_index_batch, batch))
+
+            collect(wait(pending).done)
+
+    def _write_documents(self, documents: List[Document]) -> int:
+        """Upsert embedded documents into the collection with concurrent batch requests.
+
+        Matches DocumentWriter's default (no duplicate check: existing IDs are overwritten),
+        but keeps up to qdrant_write_concurrency upserts of qdrant_write_batch_size points in
+        flight instead of sending batches one at a time. Each upsert's latency is logged at
+        debug level so both settings can be tuned against a real collection.
+
+        Args:
+            documents: Documents with embeddings
+
+        Returns:
+            Number of documents written
+        """
+        if not documents:
+            return 0
+
+        client = self._get_qdrant_client()
+        assert self.document_store is not None
+        use_sparse_embeddings = self.document_store.use_sparse_embeddings
+
+        def upsert(batch: List[Document]) -> None:
+            start = time.perf_counter()
+            client.upsert(
+                collection_name=self.config.qdrant_collection_name,
+                points=(
+                    convert_haystack_documents_to_qdrant_points(batch, use_sparse_embeddings=True)
+                    if use_sparse_embeddings
+                    else _to_qdrant_batch(batch)
+                ),
+                wait=True,
+            )
+            logger.debug(f"Upserted {len(batch)} points in {time.perf_counter() - start:.3f}s")
+
+        batch_size = max(1, self.config.qdrant_write_batch_size)
+        batches = [documents[i : i + batch_size] for i in range(0, len(documents), batch_size)]
+        concurrency = max(1, self.config.qdrant_write_concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # Consume the results so a failed upsert raises here
+            for _ in executor.map(upsert, batches):
+                pass
+
+        return len(documents)
+
+    def get_indexing_threshold(self) -> int:
+        """Read the collection's HNSW indexing threshold.
+
+        Returns:
+            Threshold in KB; DEFAULT_INDEXING_THRESHOLD if the collection doesn't set one
+        """
+        collection = self._get_qdrant_client().get_collection(self.config.qdrant_collection_name)
+        threshold = collection.config.optimizer_config.indexing_threshold
+        return self.DEFAULT_INDEXING_THRESHOLD if threshold is None else threshold
+
+    @contextmanager
+    def _indexing_paused(self, enabled: bool = True) -> Iterator[None]:
+        """Disable HNSW indexing for the duration of a bulk upload.
+
+        The collection's own threshold is read first and restored afterwards, even if the
+        upload fails, so a user-configured value survives the bulk load.
+
+        Args:
+            enabled: Whether to pause indexing; False makes this a no-op
+        """
+        if not enabled:
+            yield
+            return
+
+        previous_threshold = self.get_indexing_threshold()
+        self.set_indexing_threshold(0)
+        try:
+            yield
+        finally:
+            self.set_indexing_threshold(previous_threshold)
+
+    def set_indexing_threshold(self, indexing_threshold: int) -> None:
+        """Update the collection's HNSW indexing threshold.
+
+        Args:
+            indexing_threshold: Threshold in KB; 0 disables indexing
+        """
+        self._get_qdrant_client().update_collection(
+            collection_name=self.config.qdrant_collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=indexing_threshold),
+        )
+
+    def _get_qdrant_client(self) -> QdrantClient:
+        """Get the Qdrant client backing the document store, creating the collection if needed."""
+        if not self.document_store:
+            raise ValueError("Document store not initialized. Call setup_document_store() first.")
+
+        self.document_store._initialize_client()
+        return cast(QdrantClient, self.document_store._client)
+
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the document collection.
 
@@ -198,3 +605,49 @@ class IndexingPipeline:
         """Cleanup pipeline resources."""
         self.document_store = None
         self.pipeline = None
+        self._pipeline_key = None
+        self._embedder = None
+        if self._embedding_cache is not None:
+            self._embedding_cache.close()
+            self._embedding_cache = None
+
+
+def _to_qdrant_batch(documents: List[Document]) -> models.Batch:
+    """Convert embedded documents to a column-oriented Qdrant batch.
+
+    Produces the same IDs, vectors and payloads as convert_haystack_documents_to_qdrant_points()
+    for dense-only collections, without building a PointStruct per document.
+    """
+    payloads = []
+    for document in documents:
+        payload = document.to_dict(flatten=False)
+        del payload["embedding"]
+        payloads.append(payload)
+
+    return models.Batch(
+        ids=[convert_id(document.id) for document in documents],
+        vectors=[cast(List[float], document.embedding) for document in documents],
+        payloads=payloads,
+    )
+
+
+# Per-process pipeline used by process_documents_hierarchical_batched(workers > 1)
+_worker_pipeline: Optional[IndexingPipeline] = None
+
+
+def _init_index_worker(config: Config) -> None:
+    """Create the indexing pipeline for a worker process."""
+    global _worker_pipeline
+    _worker_pipeline = IndexingPipeline(config)
+    _worker_pipeline.setup_document_store()
+
+
+def _index_batch(documents: List[Document]) -> Dict[str, int]:
+    """Index one batch of documents in a worker process."""
+    assert _worker_pipeline is not None
+    result = _worker_pipeline.process_documents_hierarchical(documents)
+    return {
+        "documents_processed": result["documents_processed"],
+        "chunks_created": result["chunks_created"],
+        "chunks_written": result["chunks_written"],
+    }
@@ -2,7 +2,7 @@
 
 import logging
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from googleapiclient.errors import HttpError  # type: ignore
 from rich.console import Console
@@ -72,20 +72,34 @@ class RAGSystem:
             # Load documents
             loader = GoogleDriveLoader(self.config)
             loader.authenticate()  # Authenticate before loading documents
-            documents = loader.load_documents(actual_folder_id, max_documents=max_docs)
 
-            if not documents:
+            # Index documents as their downloads complete, keeping only the first few for the
+            # summary table rather than the whole folder in memory
+            shown: List[Dict[str, Any]] = []
+            loaded = 0
+
+            def track(documents: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+                nonlocal loaded
+                for doc in documents:
+                    loaded += 1
+                    if len(shown) < 10:
+                        shown.append(doc)
+                    yield doc
+
+            self.console.print("\n[cyan]Loading and indexing documents...[/cyan]")
+            self.indexing_pipeline.process_documents_streaming(
+                track(loader.iter_documents(actual_folder_id, max_documents=max_docs))
+            )
+
+            if not loaded:
                 self.console.print("[yellow]⚠️  No documents found in the specified folder[/yellow]")
                 return False
 
-            self.console.print(f"[green]✅ Loaded {len(documents)} documents[/green]")
+            self.console.print(f"[green]✅ Loaded {loaded} documents[/green]")
 
             # Display loaded documents
-            self._display_loaded_documents(documents)
+            self._display_loaded_documents(shown, total=loaded)
 
-            # Index documents
-            self.console.print("\n[cyan]Indexing documents...[/cyan]")
-            self.indexing_pipeline.process_documents(documents)
             self.console.print("[green]✅ Documents indexed successfully[/green]")
 
             return True
@@ -104,8 +118,16 @@ class RAGSystem:
             logger.exception("Document loading/indexing failed")
             return False
 
-    def _display_loaded_documents(self, documents: List[Dict[str, Any]]):
-        """Display a table of loaded documents."""
+    def _display_loaded_documents(
+        self, documents: List[Dict[str, Any]], total: Optional[int] = None
+    ):
+        """Display a table of loaded documents.
+
+        Args:
+            documents: Documents to list (only the first 10 are shown)
+            total: Number of documents loaded, if more than were passed in
+        """
+        total = len(documents) if total is None else total
         table = Table(title="Loaded Documents", show_header=True, header_style="bold magenta")
         table.add_column("Name", style="cyan", no_wrap=True)
         table.add_column("Type", style="green")
@@ -122,8 +144,8 @@ class RAGSystem:
                 f"{len(doc.get('content', ''))} chars",
             )
 
-        if len(documents) > 10:
-            table.add_row("...", "...", f"({len(documents) - 10} more)")
+        if total > 10:
+            table.add_row("...", "...", f"({total - 10} more)")
 
         self.console.print(table)
 
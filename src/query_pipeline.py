@@ -1,21 +1,39 @@
 import logging
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from haystack import Pipeline
-from haystack.components.builders import PromptBuilder
+from haystack import Document, Pipeline
 from haystack_integrations.components.embedders.ollama import OllamaTextEmbedder
 from haystack_integrations.components.generators.ollama import OllamaGenerator
 from haystack_integrations.components.retrievers.qdrant import QdrantEmbeddingRetriever
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
+from haystack_integrations.document_stores.qdrant.converters import (
+    convert_qdrant_point_to_haystack_document,
+)
+from haystack_integrations.document_stores.qdrant.filters import convert_filters_to_qdrant
+from qdrant_client import QdrantClient, models
 
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _prompt_format(template: str) -> str:
+    """Convert a template using only {{ context }} and {{ question }} to a str.format() string."""
+    escaped = template.replace("{", "{{").replace("}", "}}")
+    return escaped.replace("{{{{ context }}}}", "{context}").replace(
+        "{{{{ question }}}}", "{question}"
+    )
+
+
 class QueryPipeline:
     """Query pipeline for RAG system using Haystack, Qdrant, and Ollama."""
 
+    # Most recent question embeddings kept, so repeated questions skip Ollama
+    QUERY_EMBEDDING_CACHE_SIZE = 1024
+
     def __init__(self, config: Config):
         """Initialize the query pipeline.
 
@@ -28,8 +46,11 @@ class QueryPipeline:
         # Store components for direct access
         self.embedder: Optional[OllamaTextEmbedder] = None
         self.retriever: Optional[QdrantEmbeddingRetriever] = None
-        self.prompt_builder: Optional[PromptBuilder] = None
         self.generator: Optional[OllamaGenerator] = None
+        # Client for batched searches, which the document store has no public API for
+        self._client: Optional[QdrantClient] = None
+        # Embedder results by question, least recently used first
+        self._query_embeddings: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
     def setup_document_store(self) -> None:
         """Setup Qdrant document store."""
@@ -70,11 +91,10 @@ Answer:"""
 
         self.retriever = QdrantEmbeddingRetriever(document_store=self.document_store, top_k=5)
 
-        self.prompt_builder = PromptBuilder(template=self.get_default_prompt_template())
-
         self.generator = OllamaGenerator(
             model=self.config.ollama_model_name, url=self.config.ollama_base_url
         )
+        self._query_embeddings.clear()
 
         # Note: We're using direct component calls instead of pipeline execution
         # This gives us better control over the data flow and error handling
@@ -82,17 +102,26 @@ Answer:"""
 
         logger.info("Query pipeline components initialized successfully")
 
-    def query(self, question: str, top_k: int = 5) -> Dict[str, Any]:
+    def query(
+        self,
+        question: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        streaming_callback: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
         """Execute a query against the RAG system.
 
         Args:
             question: The question to ask
             top_k: Number of documents to retrieve
+            filters: Haystack metadata filters restricting the search, e.g.
+                {"field": "meta.category", "operator": "==", "value": "Health"}
+            streaming_callback: Called with each piece of the answer as Ollama generates it
 
         Returns:
             Query results with answer and sources
         """
-        if not self.embedder or not self.retriever or not self.prompt_builder or not self.generator:
+        if not self.embedder or not self.retriever or not self.generator:
             raise ValueError("Components not initialized. Call create_query_pipeline() first.")
 
         try:
@@ -100,51 +129,21 @@ Answer:"""
 
             # Step 1: Generate embedding for the question
             logger.debug("Generating embedding for query")
-            embedding_result = self.embedder.run(text=question)
-            query_embedding = embedding_result["embedding"]
+            embedding_result = self._embed_query(question)
+            query_embedding = self._query_vector(embedding_result)
 
             # Step 2: Retrieve relevant documents
-            # Ensure query_embedding is a list[float]
-            if isinstance(query_embedding, dict):
-                query_embedding = list(query_embedding.values())  # type: ignore
-
             logger.debug(f"Retrieving top {top_k} documents")
-            retrieval_result = self.retriever.run(query_embedding=query_embedding, top_k=top_k)
+            retrieval_result = self.retriever.run(
+                query_embedding=query_embedding, filters=filters, top_k=top_k
+            )
             documents = retrieval_result.get("documents", [])
             logger.info(f"Retrieved {len(documents)} documents")
 
-            # Step 3: Format retrieved documents into context string
-            context_parts = []
-            sources = []
-            for i, doc in enumerate(documents, 1):
-                # Format each document chunk
-                doc_text = f"[Document {i}]\n{doc.content}\n"
-                if doc.meta:
-                    doc_text += f"Source: {doc.meta.get('name', 'Unknown')}\n"
-                context_parts.append(doc_text)
-                sources.append({"content": doc.content, "metadata": doc.meta})
-
-            # Join all document chunks into context
-            context = (
-                "\n---\n".join(context_parts) if context_parts else "No relevant documents found."
+            # Steps 3-5: Build context and prompt, then generate the answer
+            answer, sources, prompt_result, generation_result = self._generate_answer(
+                question, documents, streaming_callback
             )
-            logger.debug(f"Formatted context with {len(context_parts)} document parts")
-
-            # Step 4: Build the prompt
-            logger.debug("Building prompt with context")
-            prompt_result = self.prompt_builder.run(question=question, context=context)
-            prompt = prompt_result["prompt"]
-
-            # Step 5: Generate the answer
-            logger.debug("Generating answer with LLM")
-            generation_result = self.generator.run(prompt=prompt)
-            answer = (
-                generation_result.get("replies", [""])[0]
-                if generation_result.get("replies")
-                else ""
-            )
-
-            logger.info(f"Successfully generated answer for query (length: {len(answer)} chars)")
 
             return {
                 "query": question,
@@ -162,6 +161,177 @@ Answer:"""
             logger.error(f"Error processing query: {str(e)}", exc_info=True)
             raise
 
+    def query_batch(
+        self,
+        questions: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Execute several queries, retrieving documents for all of them in one Qdrant request.
+
+        Useful for query expansions (rewrites, HyDE) where several related questions are
+        answered together.
+
+        Args:
+            questions: The questions to ask
+            top_k: Number of documents to retrieve per question
+            filters: Haystack metadata filters applied to every question, as in query()
+
+        Returns:
+            Query results with answer and sources, in the order of the questions
+        """
+        if not self.embedder or not self.retriever or not self.generator:
+            raise ValueError("Components not initialized. Call create_query_pipeline() first.")
+
+        if not questions:
+            return []
+
+        try:
+            embedding_results = [self._embed_query(question) for question in questions]
+            query_filter = convert_filters_to_qdrant(filters)
+
+            # Single round trip to Qdrant for all questions
+            logger.debug(f"Retrieving top {top_k} documents for {len(questions)} queries")
+            batch_results = self._get_qdrant_client().query_batch_points(
+                collection_name=self.config.qdrant_collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=self._query_vector(result),
+                        filter=query_filter,
+                        limit=top_k,
+                        with_payload=True,
+                    )
+                    for result in embedding_results
+                ],
+            )
+
+            results = []
+            for question, embedding_result, batch_result in zip(
+                questions, embedding_results, batch_results
+            ):
+                documents = [
+                    convert_qdrant_point_to_haystack_document(point, use_sparse_embeddings=False)
+                    for point in batch_result.points
+                ]
+                answer, sources, prompt_result, generation_result = self._generate_answer(
+                    question, documents
+                )
+                results.append(
+                    {
+                        "query": question,
+                        "answer": answer,
+                        "sources": sources,
+                        "raw_result": {
+                            "embedder": embedding_result,
+                            "retriever": {"documents": documents},
+                            "prompt_builder": prompt_result,
+                            "generator": generation_result,
+                        },
+                    }
+                )
+
+            logger.info(f"Successfully generated answers for {len(results)} queries")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error processing query batch: {str(e)}", exc_info=True)
+            raise
+
+    def _get_qdrant_client(self) -> QdrantClient:
+        """Get the client used for batched searches, connecting on first use."""
+        if self._client is None:
+            self._client = QdrantClient(url=self.config.qdrant_url)
+        return self._client
+
+    @staticmethod
+    def _query_vector(embedding_result: Dict[str, Any]) -> List[float]:
+        """Extract the query embedding from an embedder result as a list of floats."""
+        query_embedding = embedding_result["embedding"]
+        # Ensure query_embedding is a list[float]
+        if isinstance(query_embedding, dict):
+            query_embedding = list(query_embedding.values())
+        return query_embedding
+
+    def _embed_query(self, question: str) -> Dict[str, Any]:
+        """Embed a question, reusing the embedder result if it was asked recently.
+
+        Args:
+            question: The question to embed
+
+        Returns:
+            Embedder result with the question's embedding
+        """
+        assert self.embedder is not None
+
+        cached = self._query_embeddings.get(question)
+        if cached is not None:
+            self._query_embeddings.move_to_end(question)
+            return cached
+
+        embedding_result = self.embedder.run(text=question)
+        self._query_embeddings[question] = embedding_result
+        if len(self._query_embeddings) > self.QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_embeddings.popitem(last=False)
+        return embedding_result
+
+    def _generate_answer(
+        self,
+        question: str,
+        documents: List[Document],
+        streaming_callback: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any], Dict[str, Any]]:
+        """Build the prompt from retrieved documents and generate the answer.
+
+        Args:
+            question: The question to answer
+            documents: Retrieved documents to use as context
+            streaming_callback: Called with each piece of the answer as it is generated
+
+        Returns:
+            Tuple of answer, sources, prompt builder result and generator result
+        """
+        assert self.generator is not None
+
+        # Format retrieved documents into context string
+        context_parts = []
+        sources = []
+        for i, doc in enumerate(documents, 1):
+            # Format each document chunk
+            doc_text = f"[Document {i}]\n{doc.content}\n"
+            if doc.meta:
+                doc_text += f"Source: {doc.meta.get('name', 'Unknown')}\n"
+            context_parts.append(doc_text)
+            sources.append({"content": doc.content, "metadata": doc.meta})
+
+        # Join all document chunks into context
+        context = "\n---\n".join(context_parts) if context_parts else "No relevant documents found."
+        logger.debug(f"Formatted context with {len(context_parts)} document parts")
+
+        # Build the prompt; the template only substitutes these two values, so render it as
+        # a format string instead of through a Jinja PromptBuilder
+        logger.debug("Building prompt with context")
+        prompt = _prompt_format(self.get_default_prompt_template()).format(
+            context=context, question=question
+        )
+        prompt_result = {"prompt": prompt}
+
+        # Generate the answer
+        logger.debug("Generating answer with LLM")
+        if streaming_callback is None:
+            generation_result = self.generator.run(prompt=prompt)
+        else:
+            # Stream from Ollama; the full reply is still assembled into the result
+            generation_result = self.generator.run(
+                prompt=prompt, streaming_callback=lambda chunk: streaming_callback(chunk.content)
+            )
+        answer = (
+            generation_result.get("replies", [""])[0] if generation_result.get("replies") else ""
+        )
+
+        logger.info(f"Successfully generated answer for query (length: {len(answer)} chars)")
+
+        return answer, sources, prompt_result, generation_result
+
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the document collection.
 
@@ -189,5 +359,8 @@ Answer:"""
         self.pipeline = None
         self.embedder = None
         self.retriever = None
-        self.prompt_builder = None
         self.generator = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        self._query_embeddings.clear()
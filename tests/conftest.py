@@ -0,0 +1,12 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from src.config import Config
+
+
+@pytest.fixture(autouse=True)
+def reset_config():
+    """Give every test a fresh Config singleton."""
+    Config._instance = None
+    yield
@@ -1,127 +1,148 @@
-from unittest.mock import Mock, patch
+from operator import attrgetter
+from typing import List, Tuple
+from unittest.mock import ANY, Mock, patch
+
+import pytest
 
 from src.chat_interface import ChatInterface
 from src.config import Config
 
+# Result returned by the mocked query pipeline (never mutated by ChatInterface)
+QUERY_RESULT = {
+    "query": "test question",
+    "answer": "test answer",
+    "sources": [
+        {"content": "source 1", "metadata": {"name": "doc1.txt"}},
+        {"content": "source 2", "metadata": {"name": "doc2.txt"}},
+    ],
+}
+
+
+@pytest.fixture(scope="session")
+def sample_sources():
+    """Retrieved sources shared by the formatting and display tests (never mutated)."""
+    return [
+        {"content": "This is content 1", "metadata": {"name": "doc1.txt"}},
+        {
+            "content": "This is content 2 which is much longer and should be truncated when displayed",
+            "metadata": {"name": "doc2.pdf"},
+        },
+    ]
+
+
+class _StubConsole:
+    """Console stand-in recording print() calls, for tests that only inspect output."""
+
+    def __init__(self):
+        self.calls: List[Tuple[tuple, dict]] = []
+        self.cleared = False
+
+    def print(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+    def clear(self):
+        self.cleared = True
+
 
 class TestChatInterface:
     """Test terminal chat interface for RAG system."""
 
-    def setup_method(self):
-        """Setup test fixtures."""
-        # Reset singleton instance
-        Config._instance = None
+    @pytest.fixture
+    def interface(self):
+        """Chat interface over a mocked query pipeline."""
         self.config = Config()
         self.config.ollama_model_name = "llama3.2:latest"
 
         # Mock query pipeline
-        self.mock_query_pipeline = Mock()
-        self.mock_query_pipeline.query.return_value = {
-            "query": "test question",
-            "answer": "test answer",
-            "sources": [
-                {"content": "source 1", "metadata": {"name": "doc1.txt"}},
-                {"content": "source 2", "metadata": {"name": "doc2.txt"}},
-            ],
-        }
+        self.mock_query_pipeline = Mock(**{"query.return_value": QUERY_RESULT})
 
-    def test_interface_initialization(self):
-        """Test that chat interface initializes correctly."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+        return ChatInterface(self.config, self.mock_query_pipeline)
 
+    @pytest.fixture
+    def fake_input(self, monkeypatch):
+        """Answers for input() to return, in order."""
+        answers: List[str] = []
+        monkeypatch.setattr("builtins.input", lambda *args: answers.pop(0))
+        return answers
+
+    def test_interface_initialization(self, interface):
+        """Test that chat interface initializes correctly."""
         assert interface.config == self.config
         assert interface.query_pipeline == self.mock_query_pipeline
         assert interface.console is not None
         assert interface.history == []
 
-    def test_format_sources_with_sources(self):
+    def test_format_sources_with_sources(self, interface, sample_sources):
         """Test formatting sources for display."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
-        sources = [
-            {"content": "This is content 1", "metadata": {"name": "doc1.txt"}},
-            {
-                "content": "This is content 2 which is much longer and should be truncated when displayed",
-                "metadata": {"name": "doc2.pdf"},
-            },
-        ]
-
-        formatted = interface.format_sources(sources)
+        formatted = interface.format_sources(sample_sources)
 
         assert "doc1.txt" in formatted
         assert "This is content 1" in formatted
         assert "doc2.pdf" in formatted
         # Content should be truncated
-        assert len(formatted) < len(sources[1]["content"]) + 100
+        assert len(formatted) < len(sample_sources[1]["content"]) + 100
 
-    def test_format_sources_empty(self):
+    def test_format_sources_empty(self, interface):
         """Test formatting empty sources."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
         formatted = interface.format_sources([])
 
         assert "No sources found" in formatted
 
-    def test_display_welcome_message(self):
+    def test_display_welcome_message(self, interface):
         """Test welcome message display."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+        interface.console = _StubConsole()
 
-        with patch.object(interface.console, "print") as mock_print:
-            interface.display_welcome()
+        interface.display_welcome()
 
-            # Should print welcome message
-            assert mock_print.called
-            # Check that print was called multiple times (panels)
-            assert len(mock_print.call_args_list) >= 2
+        # Should print welcome message multiple times (panels)
+        assert len(interface.console.calls) >= 2
 
-    def test_display_help(self):
+    def test_display_help(self, interface):
         """Test help message display."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+        interface.console = _StubConsole()
 
-        with patch.object(interface.console, "print") as mock_print:
-            interface.display_help()
+        interface.display_help()
 
-            # Should print help commands
-            assert mock_print.called
-            # Check that print was called (at least for panel and newline)
-            assert len(mock_print.call_args_list) >= 1
+        # Should print help commands (at least for panel and newline)
+        assert len(interface.console.calls) >= 1
 
-    @patch("builtins.input", return_value="test question")
-    def test_get_user_input_normal(self, mock_input):
+    def test_get_user_input_normal(self, interface, fake_input):
         """Test getting normal user input."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+        fake_input.append("test question")
 
         user_input = interface.get_user_input()
 
         assert user_input == "test question"
 
-    @patch("builtins.input", return_value="/help")
-    def test_get_user_input_command(self, mock_input):
+    def test_get_user_input_command(self, interface, fake_input):
         """Test getting command user input."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+        fake_input.append("/help")
 
         user_input = interface.get_user_input()
 
         assert user_input == "/help"
 
-    @patch("builtins.input", side_effect=KeyboardInterrupt)
-    def test_get_user_input_keyboard_interrupt(self, mock_input):
+    def test_get_user_input_keyboard_interrupt(self, interface, monkeypatch):
         """Test handling keyboard interrupt during input."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+
+        def interrupt(*args):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr("builtins.input", interrupt)
 
         user_input = interface.get_user_input()
 
         assert user_input == "/quit"
 
-    def test_process_query_normal(self):
+    def test_process_query_normal(self, interface):
         """Test processing normal query."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
         with patch.object(interface, "display_answer") as mock_display:
             result = interface.process_query("What is Python?")
 
             assert result is True  # Continue chatting
-            self.mock_query_pipeline.query.assert_called_once_with("What is Python?")
+            self.mock_query_pipeline.query.assert_called_once_with(
+                "What is Python?", streaming_callback=ANY
+            )
             mock_display.assert_called_once()
 
             # Check history
@@ -129,79 +150,85 @@ class TestChatInterface:
             assert interface.history[0]["query"] == "test question"  # From mock result
             assert interface.history[0]["answer"] == "test answer"
 
-    def test_process_query_help_command(self):
-        """Test processing help command."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
-        with patch.object(interface, "display_help") as mock_help:
-            result = interface.process_query("/help")
-
-            assert result is True  # Continue chatting
-            mock_help.assert_called_once()
-            self.mock_query_pipeline.query.assert_not_called()
-
-    def test_process_query_quit_command(self):
-        """Test processing quit command."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
-        result = interface.process_query("/quit")
-
-        assert result is False  # Stop chatting
-        self.mock_query_pipeline.query.assert_not_called()
-
-    def test_process_query_exit_command(self):
-        """Test processing exit command."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
-        result = interface.process_query("/exit")
-
-        assert result is False  # Stop chatting
-        self.mock_query_pipeline.query.assert_not_called()
-
-    def test_process_query_history_command(self):
-        """Test processing history command."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+    def test_process_query_stores_escaped_history_preview(self, interface):
+        """Test that history entries carry pre-escaped, truncated display markup."""
+        self.mock_query_pipeline.query.return_value = {
+            "query": "What is [bold]?",
+            "answer": "x" * 250,
+            "sources": [],
+        }
 
-        # Add some history
+        with patch.object(interface, "display_answer"):
+            interface.process_query("What is [bold]?")
+
+        entry = interface.history[0]
+        assert entry["query"] == "What is [bold]?"
+        assert entry["query_markup"] == "What is \\[bold]?"
+        assert entry["answer_markup"] == "x" * 200 + "..."
+
+    def test_process_query_streams_answer(self, interface):
+        """Test that streamed answer pieces are shown while the answer is generated."""
+        result = self.mock_query_pipeline.query.return_value
+        shown = []
+
+        def query(question, streaming_callback):
+            for token in ("test ", "answer"):
+                streaming_callback(token)
+                shown.append(str(live.update.call_args.args[0].renderable))
+            return result
+
+        self.mock_query_pipeline.query.side_effect = query
+        with (
+            patch("src.chat_interface.Live") as mock_live,
+            patch.object(interface, "display_answer") as mock_display,
+        ):
+            live = mock_live.return_value.__enter__.return_value
+            interface.process_query("What is Python?")
+
+        assert shown == ["test ", "test answer"]
+        live.update.assert_called_once()
+        mock_display.assert_called_once_with(result)
+
+    @pytest.mark.parametrize(
+        "command, handler, expected",
+        [
+            ("/help", "display_help", True),
+            ("/history", "display_history", True),
+            ("/clear", "console.clear", True),
+            ("/quit", None, False),
+            ("/exit", None, False),
+        ],
+    )
+    def test_process_query_command(self, interface, command, handler, expected):
+        """Test that commands run their handler instead of querying the pipeline."""
         interface.history = [
             {"query": "question 1", "answer": "answer 1"},
             {"query": "question 2", "answer": "answer 2"},
         ]
 
-        with patch.object(interface, "display_history") as mock_history:
-            result = interface.process_query("/history")
-
-            assert result is True  # Continue chatting
-            mock_history.assert_called_once()
-            self.mock_query_pipeline.query.assert_not_called()
-
-    def test_process_query_clear_command(self):
-        """Test processing clear command."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
-        # Add some history
-        interface.history = [{"query": "test", "answer": "test"}]
+        if handler is None:
+            result = interface.process_query(command)
+        else:
+            owner_path, _, name = handler.rpartition(".")
+            owner = attrgetter(owner_path)(interface) if owner_path else interface
+            with patch.object(owner, name) as mock_handler:
+                result = interface.process_query(command)
+            mock_handler.assert_called_once()
 
-        with patch.object(interface.console, "clear") as mock_clear:
-            result = interface.process_query("/clear")
-
-            assert result is True  # Continue chatting
-            mock_clear.assert_called_once()
-            assert len(interface.history) == 0  # History cleared
+        assert result is expected  # False stops chatting
+        self.mock_query_pipeline.query.assert_not_called()
+        # Only /clear clears the history
+        assert len(interface.history) == (0 if command == "/clear" else 2)
 
-    def test_process_query_empty_input(self):
+    def test_process_query_empty_input(self, interface):
         """Test processing empty input."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
         result = interface.process_query("")
 
         assert result is True  # Continue chatting
         self.mock_query_pipeline.query.assert_not_called()
 
-    def test_process_query_with_error(self):
+    def test_process_query_with_error(self, interface):
         """Test processing query when pipeline raises error."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
         # Mock pipeline to raise exception
         self.mock_query_pipeline.query.side_effect = Exception("Pipeline error")
 
@@ -210,61 +237,53 @@ class TestChatInterface:
 
             assert result is True  # Continue chatting despite error
             # Should display error message
-            assert mock_print.called
-            call_args = str(mock_print.call_args_list)
-            assert "error" in call_args.lower() or "Error" in call_args
+            assert any(
+                "error" in str(c.args[0]).lower() for c in mock_print.call_args_list if c.args
+            )
 
-    def test_display_answer(self):
+    def test_display_answer(self, interface, sample_sources):
         """Test displaying answer with sources."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
         query_result = {
             "query": "test question",
             "answer": "test answer",
-            "sources": [{"content": "source content", "metadata": {"name": "doc.txt"}}],
+            "sources": sample_sources,
         }
 
-        with patch.object(interface.console, "print") as mock_print:
-            interface.display_answer(query_result)
+        interface.console = _StubConsole()
 
-            assert mock_print.called
-            # Check that print was called for answer and sources panels
-            assert len(mock_print.call_args_list) >= 3  # Answer panel, newline, sources panel
+        interface.display_answer(query_result)
 
-    def test_display_history_with_history(self):
-        """Test displaying history when history exists."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+        # Check that print was called for answer and sources panels
+        assert len(interface.console.calls) >= 3  # Answer panel, newline, sources panel
 
+    def test_display_history_with_history(self, interface):
+        """Test displaying history when history exists."""
         interface.history = [
             {"query": "question 1", "answer": "answer 1"},
             {"query": "question 2", "answer": "answer 2"},
         ]
 
-        with patch.object(interface.console, "print") as mock_print:
-            interface.display_history()
+        interface.console = _StubConsole()
+
+        interface.display_history()
 
-            assert mock_print.called
-            # Check that print was called for history panel
-            assert len(mock_print.call_args_list) >= 1
+        # Check that print was called for history panel
+        assert len(interface.console.calls) >= 1
 
-    def test_display_history_empty(self):
+    def test_display_history_empty(self, interface):
         """Test displaying history when no history exists."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
+        interface.console = _StubConsole()
 
-        with patch.object(interface.console, "print") as mock_print:
-            interface.display_history()
+        interface.display_history()
 
-            assert mock_print.called
-            call_args = str(mock_print.call_args_list)
-            assert "no history" in call_args.lower() or "No history" in call_args
+        assert any(
+            "no history" in str(args[0]).lower() for args, _ in interface.console.calls if args
+        )
 
-    @patch("builtins.input")
-    def test_start_chat_loop(self, mock_input):
+    def test_start_chat_loop(self, interface, fake_input):
         """Test the main chat loop."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
         # Simulate user input sequence: question -> quit
-        mock_input.side_effect = ["test question", "/quit"]
+        fake_input.extend(["test question", "/quit"])
 
         with patch.object(interface, "display_welcome") as mock_welcome:
             with patch.object(
@@ -277,10 +296,8 @@ class TestChatInterface:
                 mock_process.assert_any_call("test question")
                 mock_process.assert_any_call("/quit")
 
-    def test_run_method_delegates_to_start(self):
+    def test_run_method_delegates_to_start(self, interface):
         """Test that run method delegates to start."""
-        interface = ChatInterface(self.config, self.mock_query_pipeline)
-
         with patch.object(interface, "start") as mock_start:
             interface.run()
             mock_start.assert_called_once()
@@ -1,9 +1,28 @@
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
+from googleapiclient.errors import HttpError  # type: ignore
 
 from src.config import Config
-from src.document_loader import GoogleDriveLoader
+from src.document_loader import GoogleDriveLoader, _load_credentials
+
+
+@pytest.fixture(scope="module")
+def readonly_config():
+    """Config for the shared loader, detached from the Config singleton."""
+    # Module-scoped fixtures run before the per-test Config reset, so build a fresh instance
+    Config._instance = None
+    config = Config()
+    config.google_credentials_path = "test_credentials.json"
+    Config._instance = None
+    return config
+
+
+@pytest.fixture(scope="module")
+def readonly_loader(readonly_config):
+    """Unauthenticated loader shared by tests that never change it."""
+    return GoogleDriveLoader(readonly_config)
 
 
 class TestGoogleDriveLoader:
@@ -11,18 +30,28 @@ class TestGoogleDriveLoader:
 
     def setup_method(self):
         """Setup test fixtures."""
-        # Reset singleton instance
-        Config._instance = None
         self.config = Config()
         self.config.google_credentials_path = "test_credentials.json"
+        _load_credentials.cache_clear()
 
-    def test_loader_initialization(self):
-        """Test that loader initializes correctly."""
+    @pytest.fixture
+    def authenticated_loader(self, monkeypatch):
+        """Loader authenticated against a mocked Drive service, returned with the service."""
+        mock_service = Mock()
+        monkeypatch.setattr("src.document_loader.build", lambda *args, **kwargs: mock_service)
+        monkeypatch.setattr(
+            "src.document_loader.service_account.Credentials.from_service_account_file",
+            lambda *args, **kwargs: Mock(),
+        )
         loader = GoogleDriveLoader(self.config)
+        loader.authenticate()
+        return loader, mock_service
 
-        assert loader.config == self.config
-        assert loader.credentials_path == "test_credentials.json"
-        assert loader.service is None
+    def test_loader_initialization(self, readonly_loader, readonly_config):
+        """Test that loader initializes correctly."""
+        assert readonly_loader.config is readonly_config
+        assert readonly_loader.credentials_path == "test_credentials.json"
+        assert readonly_loader.service is None
 
     @patch("src.document_loader.build")
     @patch("src.document_loader.service_account.Credentials")
@@ -46,6 +75,16 @@ class TestGoogleDriveLoader:
         )
         mock_build.assert_called_once_with("drive", "v3", credentials=mock_creds)
 
+    @patch("src.document_loader.build")
+    @patch("src.document_loader.service_account.Credentials")
+    def test_authenticate_reuses_credentials(self, mock_credentials, mock_build):
+        """Test that credentials are loaded once and shared across loader instances."""
+        GoogleDriveLoader(self.config).authenticate()
+        GoogleDriveLoader(self.config).authenticate()
+
+        mock_credentials.from_service_account_file.assert_called_once()
+        assert mock_build.call_count == 2
+
     @patch("src.document_loader.service_account.Credentials")
     def test_authenticate_invalid_credentials(self, mock_credentials):
         """Test authentication failure with invalid credentials."""
@@ -56,22 +95,14 @@ class TestGoogleDriveLoader:
         with pytest.raises(Exception, match="Invalid credentials"):
             loader.authenticate()
 
-    def test_list_documents_without_authentication(self):
+    def test_list_documents_without_authentication(self, readonly_loader):
         """Test that listing documents without authentication raises error."""
-        loader = GoogleDriveLoader(self.config)
-
         with pytest.raises(ValueError, match="Not authenticated"):
-            loader.list_documents()
+            readonly_loader.list_documents()
 
-    @patch("src.document_loader.build")
-    @patch("src.document_loader.service_account.Credentials")
-    def test_list_documents_success(self, mock_credentials, mock_build):
+    def test_list_documents_success(self, authenticated_loader):
         """Test successful document listing."""
-        # Setup authentication mocks
-        mock_creds = Mock()
-        mock_credentials.from_service_account_file.return_value = mock_creds
-        mock_service = Mock()
-        mock_build.return_value = mock_service
+        loader, mock_service = authenticated_loader
 
         # Mock API response
         mock_files = Mock()
@@ -90,8 +121,6 @@ class TestGoogleDriveLoader:
             ]
         }
 
-        loader = GoogleDriveLoader(self.config)
-        loader.authenticate()
         documents = loader.list_documents()
 
         assert len(documents) == 3
@@ -101,18 +130,14 @@ class TestGoogleDriveLoader:
 
         mock_files.list.assert_called_once_with(
             q="trashed=false and (mimeType='text/plain' or mimeType='application/pdf' or mimeType='application/vnd.openxmlformats-officedocument.wordprocessingml.document' or mimeType='application/vnd.google-apps.document')",
-            fields="files(id, name, mimeType, modifiedTime)",
+            fields="nextPageToken, files(id, name, mimeType, modifiedTime)",
+            pageSize=GoogleDriveLoader.LIST_PAGE_SIZE,
+            pageToken=None,
         )
 
-    @patch("src.document_loader.build")
-    @patch("src.document_loader.service_account.Credentials")
-    def test_list_documents_with_folder_filter(self, mock_credentials, mock_build):
+    def test_list_documents_with_folder_filter(self, authenticated_loader):
         """Test document listing with folder filter."""
-        # Setup authentication mocks
-        mock_creds = Mock()
-        mock_credentials.from_service_account_file.return_value = mock_creds
-        mock_service = Mock()
-        mock_build.return_value = mock_service
+        loader, mock_service = authenticated_loader
 
         # Mock API response
         mock_files = Mock()
@@ -121,32 +146,25 @@ class TestGoogleDriveLoader:
         mock_files.list.return_value = mock_list
         mock_list.execute.return_value = {"files": []}
 
-        loader = GoogleDriveLoader(self.config)
-        loader.authenticate()
         loader.list_documents(folder_id="test_folder_id")
 
         expected_query = "trashed=false and 'test_folder_id' in parents and (mimeType='text/plain' or mimeType='application/pdf' or mimeType='application/vnd.openxmlformats-officedocument.wordprocessingml.document' or mimeType='application/vnd.google-apps.document')"
         mock_files.list.assert_called_once_with(
-            q=expected_query, fields="files(id, name, mimeType, modifiedTime)"
+            q=expected_query,
+            fields="nextPageToken, files(id, name, mimeType, modifiedTime)",
+            pageSize=GoogleDriveLoader.LIST_PAGE_SIZE,
+            pageToken=None,
         )
 
-    def test_download_document_without_authentication(self):
+    def test_download_document_without_authentication(self, readonly_loader):
         """Test downloading document without authentication raises error."""
-        loader = GoogleDriveLoader(self.config)
-
         with pytest.raises(ValueError, match="Not authenticated"):
-            loader.download_document("test_id")
+            readonly_loader.download_document("test_id")
 
-    @patch("src.document_loader.build")
-    @patch("src.document_loader.service_account.Credentials")
     @patch("src.document_loader.io.BytesIO")
-    def test_download_document_success(self, mock_bytesio, mock_credentials, mock_build):
+    def test_download_document_success(self, mock_bytesio, authenticated_loader):
         """Test successful document download."""
-        # Setup authentication mocks
-        mock_creds = Mock()
-        mock_credentials.from_service_account_file.return_value = mock_creds
-        mock_service = Mock()
-        mock_build.return_value = mock_service
+        loader, mock_service = authenticated_loader
 
         # Mock download
         mock_files = Mock()
@@ -175,24 +193,16 @@ class TestGoogleDriveLoader:
                 (True, Mock(progress=lambda: 1.0)),
             ]
 
-            loader = GoogleDriveLoader(self.config)
-            loader.authenticate()
             content = loader.download_document("test_file_id")
 
             assert content == b"Test document content"
             mock_files.get.assert_called_once_with(fileId="test_file_id")
             mock_files.get_media.assert_called_once_with(fileId="test_file_id")
 
-    @patch("src.document_loader.build")
-    @patch("src.document_loader.service_account.Credentials")
     @patch("src.document_loader.io.BytesIO")
-    def test_download_google_doc(self, mock_bytesio, mock_credentials, mock_build):
+    def test_download_google_doc(self, mock_bytesio, authenticated_loader):
         """Test downloading Google Docs with export_media."""
-        # Setup authentication mocks
-        mock_creds = Mock()
-        mock_credentials.from_service_account_file.return_value = mock_creds
-        mock_service = Mock()
-        mock_build.return_value = mock_service
+        loader, mock_service = authenticated_loader
 
         # Mock files API
         mock_files = Mock()
@@ -220,8 +230,6 @@ class TestGoogleDriveLoader:
                 (True, Mock(progress=lambda: 1.0)),
             ]
 
-            loader = GoogleDriveLoader(self.config)
-            loader.authenticate()
             content = loader.download_document("google_doc_id")
 
             assert content == b"Exported Google Doc content"
@@ -230,18 +238,48 @@ class TestGoogleDriveLoader:
                 fileId="google_doc_id", mimeType="text/plain"
             )
 
-    @patch("src.document_loader.build")
-    @patch("src.document_loader.service_account.Credentials")
-    def test_load_documents_batch(self, mock_credentials, mock_build):
-        """Test loading documents in batches."""
-        # Setup authentication mocks
-        mock_creds = Mock()
-        mock_credentials.from_service_account_file.return_value = mock_creds
+    @patch("src.document_loader.io.BytesIO")
+    def test_download_document_with_known_mime_type(self, mock_bytesio):
+        """Test that a MIME type from the listing skips the metadata request."""
         mock_service = Mock()
-        mock_build.return_value = mock_service
+        mock_files = mock_service.files.return_value
+        mock_bytesio.return_value.getvalue.return_value = b"Test document content"
+
+        with patch("src.document_loader.MediaIoBaseDownload") as mock_download:
+            mock_download.return_value.next_chunk.return_value = (True, None)
+
+            loader = GoogleDriveLoader(self.config)
+            loader.service = mock_service
+            content = loader.download_document("test_file_id", mime_type="text/plain")
+
+        assert content == b"Test document content"
+        assert mock_download.call_args.kwargs["chunksize"] == GoogleDriveLoader.DOWNLOAD_CHUNK_SIZE
+        mock_files.get.assert_not_called()
+        mock_files.get_media.assert_called_once_with(fileId="test_file_id")
+
+    def test_get_folder_structure_uses_large_pages(self):
+        """Test that folders are listed with the largest page size across all pages."""
+        mock_service = Mock()
+        mock_files = mock_service.files.return_value
+        mock_files.list.return_value.execute.side_effect = [
+            {"files": [{"id": "f1"}], "nextPageToken": "token2"},
+            {"files": [{"id": "f2"}]},
+        ]
 
         loader = GoogleDriveLoader(self.config)
-        loader.authenticate()
+        loader.service = mock_service
+
+        folders = loader.get_folder_structure("root")
+
+        assert [folder["id"] for folder in folders] == ["f1", "f2"]
+        assert mock_files.list.call_count == 2
+        for call in mock_files.list.call_args_list:
+            assert call.kwargs["pageSize"] == GoogleDriveLoader.LIST_PAGE_SIZE
+        assert mock_files.list.call_args_list[1].kwargs["pageToken"] == "token2"
+
+    def test_load_documents_batch(self, authenticated_loader):
+        """Test loading documents in batches."""
+        loader, _ = authenticated_loader
 
         # Mock list_documents
         with patch.object(loader, "list_documents") as mock_list:
@@ -252,7 +290,11 @@ class TestGoogleDriveLoader:
 
             # Mock download_document
             with patch.object(loader, "download_document") as mock_download:
-                mock_download.side_effect = [b"Content 1", b"Content 2"]
+                # Downloads run concurrently, so answer by file ID rather than call order
+                mock_download.side_effect = lambda file_id, mime_type: {
+                    "1": b"Content 1",
+                    "2": b"Content 2",
+                }[file_id]
 
                 documents = loader.load_documents(max_documents=2)
 
@@ -262,10 +304,171 @@ class TestGoogleDriveLoader:
                 assert documents[1]["content"] == "Content 2"
                 assert documents[1]["metadata"]["name"] == "test2.txt"
 
-    def test_get_supported_mime_types(self):
-        """Test that loader returns supported MIME types."""
+    def test_iter_folder_documents_streams_and_skips_failures(self):
+        """Test that documents are yielded as downloads finish, skipping failed ones."""
+        loader = GoogleDriveLoader(self.config)
+        loader.service = Mock()
+        loader.max_workers = 1
+        doc_list = [
+            {"id": str(i), "name": f"test{i}.txt", "mimeType": "text/plain"} for i in range(5)
+        ]
+
+        def download(file_id, mime_type):
+            if file_id == "3":
+                raise Exception("Not found")
+            return f"Content {file_id}".encode()
+
+        with (
+            patch.object(loader, "list_documents", return_value=doc_list),
+            patch.object(loader, "_init_download_worker"),
+            patch.object(loader, "download_document", side_effect=download),
+        ):
+            documents = loader.iter_folder_documents(["folder"])
+            _, first = next(documents)
+            rest = [doc for _, doc in documents]
+
+        assert first["content"] == "Content 0"
+        assert sorted(doc["content"] for doc in rest) == ["Content 1", "Content 2", "Content 4"]
+
+    def test_iter_documents_streams_and_skips_failures(self):
+        """Test that documents are yielded as downloads finish, skipping failed ones."""
+        loader = GoogleDriveLoader(self.config)
+        loader.service = Mock()
+        loader.max_workers = 1
+        doc_list = [
+            {"id": str(i), "name": f"test{i}.txt", "mimeType": "text/plain"} for i in range(5)
+        ]
+
+        def download(file_id, mime_type):
+            if file_id == "3":
+                raise Exception("Not found")
+            return f"Content {file_id}".encode()
+
+        with (
+            patch.object(loader, "list_documents", return_value=doc_list),
+            patch.object(loader, "_init_download_worker"),
+            patch.object(loader, "download_document", side_effect=download),
+        ):
+            documents = loader.iter_documents()
+            first = next(documents)
+            rest = list(documents)
+
+        assert first["content"] == "Content 0"
+        assert sorted(doc["content"] for doc in rest) == ["Content 1", "Content 2", "Content 4"]
+
+    def test_list_documents_follows_pages(self):
+        """Test that document listing follows nextPageToken until the last page."""
+        loader = GoogleDriveLoader(self.config)
+        loader.service = Mock()
+        mock_list = loader.service.files.return_value.list
+        mock_list.return_value.execute.side_effect = [
+            {"files": [{"id": "1"}], "nextPageToken": "page2"},
+            {"files": [{"id": "2"}]},
+        ]
+
+        documents = loader.list_documents("folder")
+
+        assert [doc["id"] for doc in documents] == ["1", "2"]
+        assert mock_list.call_args.kwargs["pageToken"] == "page2"
+
+    def test_iter_folder_documents_shares_download_pool(self):
+        """Test that documents from several folders are tagged with their folder and limited."""
+        loader = GoogleDriveLoader(self.config)
+        loader.service = Mock()
+        loader.max_workers = 2
+        listings = {
+            "a": [{"id": "a1", "name": "a1.txt", "mimeType": "text/plain"}],
+            "b": [{"id": f"b{i}", "name": f"b{i}.txt", "mimeType": "text/plain"} for i in range(3)],
+            "c": [{"id": "c1", "name": "c1.txt", "mimeType": "text/plain"}],
+        }
+
+        with (
+            patch.object(loader, "list_documents", side_effect=listings.get) as mock_list,
+            patch.object(loader, "_init_download_worker"),
+            patch.object(loader, "download_document", side_effect=lambda i, m: i.encode()),
+        ):
+            results = list(loader.iter_folder_documents(["a", "b", "c"], max_documents=3))
+
+        assert sorted((folder, doc["content"]) for folder, doc in results) == [
+            ("a", "a1"),
+            ("b", "b0"),
+            ("b", "b1"),
+        ]
+        # The limit was reached in folder b, so folder c is never listed
+        assert [call.args[0] for call in mock_list.call_args_list] == ["a", "b"]
+
+    @patch("src.document_loader.time.sleep")
+    def test_download_with_retry_on_rate_limit(self, mock_sleep):
+        """Test that rate-limited downloads are retried with backoff."""
+        loader = GoogleDriveLoader(self.config)
+        rate_limited = HttpError(Mock(status=429), b"Rate limit exceeded")
+        errors = [Exception("rate limited"), Exception("rate limited")]
+        for error in errors:
+            error.__cause__ = rate_limited
+
+        with patch.object(loader, "download_document") as mock_download:
+            mock_download.side_effect = [*errors, b"Content"]
+
+            content = loader._download_with_retry("file_id")
+
+        assert content == b"Content"
+        assert mock_download.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("src.document_loader.time.sleep")
+    def test_download_with_retry_on_403_rate_limit(self, mock_sleep):
+        """Test that a 403 is retried only when Drive reports a rate limit."""
+        loader = GoogleDriveLoader(self.config)
+        rate_limited = HttpError(
+            Mock(status=403),
+            b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}], "code": 403}}',
+        )
+        error = Exception("rate limited")
+        error.__cause__ = rate_limited
+
+        with patch.object(loader, "download_document") as mock_download:
+            mock_download.side_effect = [error, b"Content"]
+
+            content = loader._download_with_retry("file_id")
+
+        assert content == b"Content"
+        assert mock_sleep.call_count == 1
+
+    @patch("src.document_loader.time.sleep")
+    def test_download_with_retry_gives_up_on_permission_denied(self, mock_sleep):
+        """Test that a 403 without a rate limit reason fails immediately."""
+        loader = GoogleDriveLoader(self.config)
+        forbidden = HttpError(
+            Mock(status=403),
+            b'{"error": {"errors": [{"reason": "insufficientFilePermissions"}], "code": 403}}',
+        )
+        error = Exception("forbidden")
+        error.__cause__ = forbidden
+
+        with patch.object(loader, "download_document") as mock_download:
+            mock_download.side_effect = error
+
+            with pytest.raises(Exception, match="forbidden"):
+                loader._download_with_retry("file_id")
+
+        assert mock_download.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_download_with_retry_gives_up_on_other_errors(self):
+        """Test that non-retryable download errors are raised immediately."""
         loader = GoogleDriveLoader(self.config)
-        mime_types = loader.get_supported_mime_types()
+
+        with patch.object(loader, "download_document") as mock_download:
+            mock_download.side_effect = Exception("Not found")
+
+            with pytest.raises(Exception, match="Not found"):
+                loader._download_with_retry("file_id")
+
+        assert mock_download.call_count == 1
+
+    def test_get_supported_mime_types(self, readonly_loader):
+        """Test that loader returns supported MIME types."""
+        mime_types = readonly_loader.get_supported_mime_types()
 
         expected_types = [
             "text/plain",
@@ -275,3 +478,107 @@ class TestGoogleDriveLoader:
         ]
 
         assert set(mime_types) == set(expected_types)
+
+    def test_get_subfolders_recursive_batches_each_level(self):
+        """Test that each tree level is listed in one batch, following extra pages."""
+        mock_service = Mock()
+        tree = {
+            "root": {"files": [{"id": "a"}, {"id": "b"}]},
+            "a": {"files": [{"id": "c"}]},
+            "b": {"files": [], "nextPageToken": "page2"},
+            "c": {"files": []},
+            "d": {"files": []},
+        }
+        batches = []
+
+        def new_batch(callback):
+            batch = Mock()
+            batch.execute.side_effect = lambda: [
+                callback(c.kwargs["request_id"], tree[c.kwargs["request_id"]], None)
+                for c in batch.add.call_args_list
+            ]
+            batches.append(batch)
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = new_batch
+        mock_service.files.return_value.list.return_value.execute.return_value = {
+            "files": [{"id": "d"}]
+        }
+
+        loader = GoogleDriveLoader(self.config)
+        loader.service = mock_service
+
+        folders = loader.get_subfolders_recursive("root")
+
+        assert [folder["id"] for folder in folders] == ["a", "b", "c", "d"]
+        assert [batch.add.call_count for batch in batches] == [1, 2, 2]
+
+    def _patch_async_client(self, handler):
+        """Route the loader's async HTTP client through a mock transport."""
+        real_client = httpx.AsyncClient
+        return patch(
+            "src.document_loader.httpx.AsyncClient",
+            side_effect=lambda **kwargs: real_client(
+                transport=httpx.MockTransport(handler), **kwargs
+            ),
+        )
+
+    @pytest.mark.asyncio
+    async def test_load_documents_async(self):
+        """Test async loading over a shared HTTP client, including exports and failures."""
+        loader = GoogleDriveLoader(self.config)
+        loader.service = Mock()
+        loader._credentials = Mock(valid=True, token="token")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["Authorization"] == "Bearer token"
+            if request.url.path.endswith("/doc1/export"):
+                return httpx.Response(200, content=b"Exported")
+            if request.url.path.endswith("/file1"):
+                return httpx.Response(200, content=b"Content")
+            return httpx.Response(404)
+
+        doc_list = [
+            {"id": "file1", "name": "a.txt", "mimeType": "text/plain"},
+            {"id": "doc1", "name": "b", "mimeType": "application/vnd.google-apps.document"},
+            {"id": "missing", "name": "c.txt", "mimeType": "text/plain"},
+        ]
+        with (
+            patch.object(loader, "list_documents", return_value=doc_list),
+            self._patch_async_client(handler),
+        ):
+            documents = await loader.load_documents_async("folder")
+
+        assert [doc["content"] for doc in documents] == ["Content", "Exported"]
+        assert documents[1]["metadata"]["source"] == "google_drive"
+        loader._credentials.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_load_documents_async_refreshes_token(self):
+        """Test that expired and rejected tokens are refreshed before downloads continue."""
+        loader = GoogleDriveLoader(self.config)
+        loader.service = Mock()
+        credentials = Mock(valid=False, token="old")
+
+        def refresh(request):
+            credentials.token = f"new{credentials.refresh.call_count}"
+            credentials.valid = True
+
+        credentials.refresh.side_effect = refresh
+        loader._credentials = credentials
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            # The first refreshed token is rejected; the second one is accepted
+            if request.headers["Authorization"] != "Bearer new2":
+                return httpx.Response(401)
+            return httpx.Response(200, content=b"Content")
+
+        doc_list = [{"id": "file1", "name": "a.txt", "mimeType": "text/plain"}]
+        with (
+            patch.object(loader, "list_documents", return_value=doc_list),
+            self._patch_async_client(handler),
+        ):
+            documents = await loader.load_documents_async("folder")
+
+        assert [doc["content"] for doc in documents] == ["Content"]
+        assert credentials.refresh.call_count == 2
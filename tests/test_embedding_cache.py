@@ -0,0 +1,44 @@
+"""Tests for the EmbeddingCache."""
+
+import tempfile
+from pathlib import Path
+
+from src.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test suite for EmbeddingCache."""
+
+    def test_round_trip_persists_across_connections(self):
+        """Test that stored vectors are returned exactly after reopening the cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "cache" / "embeddings.sqlite")
+            cache = EmbeddingCache(path, "mxbai-embed-large")
+            cache.put_many([("first", [0.1, -2.5, 3.0]), ("second", [1.0])])
+            cache.close()
+
+            reopened = EmbeddingCache(path, "mxbai-embed-large")
+            found = reopened.get_many(["first", "second", "missing"])
+            reopened.close()
+
+            assert found == {"first": [0.1, -2.5, 3.0], "second": [1.0]}
+
+    def test_vectors_are_scoped_to_the_model(self):
+        """Test that a vector cached for one model is not returned for another."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "embeddings.sqlite")
+            EmbeddingCache(path, "model-a").put_many([("text", [1.0])])
+
+            assert EmbeddingCache(path, "model-b").get_many(["text"]) == {}
+
+    def test_lookup_spans_several_queries(self):
+        """Test that lookups larger than one query's parameter batch return every hit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCache(str(Path(tmpdir) / "embeddings.sqlite"), "model")
+            texts = [f"text {i}" for i in range(EmbeddingCache.LOOKUP_BATCH_SIZE * 2 + 1)]
+            cache.put_many((text, [float(i)]) for i, text in enumerate(texts))
+
+            found = cache.get_many(texts)
+
+            assert len(found) == len(texts)
+            assert found[texts[-1]] == [float(len(texts) - 1)]
@@ -1,8 +1,10 @@
 """Tests for GitHub repository loader."""
 
+import os
 import subprocess
+import threading
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from haystack import Document
@@ -22,7 +24,7 @@ class TestGitHubRepositoryLoader:
         assert loader.config == config
         assert loader.local_repos_dir == Path.home() / "Coding"
         assert loader.max_file_size_mb == 10.0
-        assert loader.allowed_extensions == [".md"]
+        assert loader.allowed_extensions == frozenset({".md"})
         assert loader.hierarchical_loader is not None
 
     def test_parse_repo_name_valid(self):
@@ -60,6 +62,15 @@ class TestGitHubRepositoryLoader:
         path = loader.get_local_repo_path("owner/repo", custom_dir)
         assert path == custom_dir / "repo"
 
+    def test_get_local_repo_path_follows_local_repos_dir(self):
+        """Test that cached paths still follow changes to the default directory."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        assert loader.get_local_repo_path("owner/repo") == Path.home() / "Coding" / "repo"
+        loader.local_repos_dir = Path("/other/dir")
+        assert loader.get_local_repo_path("owner/repo") == Path("/other/dir/repo")
+
     def test_check_local_repo_exists(self, tmp_path):
         """Test checking if a valid git repository exists."""
         config = Mock(spec=Config)
@@ -91,6 +102,40 @@ class TestGitHubRepositoryLoader:
 
         assert loader.check_local_repo(repo_path) is False
 
+    def test_discard_directory(self, tmp_path):
+        """Test that a directory is moved aside at once and deleted in the background."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        repo_path = tmp_path / "repo"
+        (repo_path / "docs").mkdir(parents=True)
+        (repo_path / "docs" / "README.md").write_text("# Readme")
+
+        with patch("threading.Thread") as mock_thread:
+            loader._discard_directory(repo_path)
+
+        assert not repo_path.exists()
+        trash_path = mock_thread.call_args.kwargs["args"][0]
+        assert trash_path.name.startswith(".repo.trash-")
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_discard_directory_logs_delete_failures(self, tmp_path, caplog):
+        """Test that files the background delete can't remove are logged, not swallowed."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+
+        with patch("threading.Thread") as mock_thread:
+            loader._discard_directory(repo_path)
+
+        onerror = mock_thread.call_args.kwargs["kwargs"]["onerror"]
+        with caplog.at_level("WARNING"):
+            onerror(os.unlink, "/repos/.repo.trash-1/file", (OSError, OSError("busy"), None))
+
+        assert "Could not delete /repos/.repo.trash-1/file: busy" in caplog.text
+
     @patch("subprocess.run")
     def test_clone_repo_success(self, mock_run, tmp_path):
         """Test successful repository cloning."""
@@ -102,10 +147,44 @@ class TestGitHubRepositoryLoader:
         target_dir = tmp_path / "test-repo"
         result = loader.clone_repo("owner/repo", target_dir)
 
+        assert result is True
+        mock_run.assert_called_once_with(
+            [
+                "gh",
+                "repo",
+                "clone",
+                "owner/repo",
+                str(target_dir),
+                "--",
+                "--depth=1",
+                "--single-branch",
+                "--filter=blob:none",
+                "--config",
+                "rag-knowledge-system.managed=true",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+
+    @patch("subprocess.run")
+    def test_clone_repo_full_history(self, mock_run, tmp_path):
+        """Test cloning with full history when shallow cloning is disabled."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+        loader.shallow_clone = False
+
+        mock_run.return_value = Mock(returncode=0, stderr="")
+
+        target_dir = tmp_path / "test-repo"
+        result = loader.clone_repo("owner/repo", target_dir)
+
         assert result is True
         mock_run.assert_called_once_with(
             ["gh", "repo", "clone", "owner/repo", str(target_dir)],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             check=True,
         )
@@ -123,6 +202,44 @@ class TestGitHubRepositoryLoader:
 
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_clone_repo_async(self, tmp_path):
+        """Test cloning a repository through an asyncio subprocess."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        mock_proc = Mock(returncode=0)
+        mock_proc.communicate = AsyncMock(return_value=(b"", b""))
+
+        target_dir = tmp_path / "test-repo"
+        with patch(
+            "asyncio.create_subprocess_exec", AsyncMock(return_value=mock_proc)
+        ) as mock_exec:
+            result = await loader.clone_repo_async("owner/repo", target_dir)
+
+        assert result is True
+        assert mock_exec.call_args.args[:5] == (
+            "gh",
+            "repo",
+            "clone",
+            "owner/repo",
+            str(target_dir),
+        )
+
+    @pytest.mark.asyncio
+    async def test_clone_repo_async_failure(self, tmp_path):
+        """Test failed asyncio repository cloning."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        mock_proc = Mock(returncode=1)
+        mock_proc.communicate = AsyncMock(return_value=(b"", b"Error"))
+
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=mock_proc)):
+            result = await loader.clone_repo_async("owner/repo", tmp_path / "test-repo")
+
+        assert result is False
+
     @patch("subprocess.run")
     def test_update_repo_success(self, mock_run, tmp_path):
         """Test successful repository update."""
@@ -138,11 +255,65 @@ class TestGitHubRepositoryLoader:
         assert result is True
         mock_run.assert_called_once_with(
             ["git", "-C", str(repo_path), "pull", "--ff-only"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             check=True,
         )
 
+    @patch("subprocess.run")
+    def test_update_repo_shallow(self, mock_run, tmp_path):
+        """Test updating a shallow clone fetches only the latest commit."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        mock_run.return_value = Mock(returncode=0, stderr="")
+
+        repo_path = tmp_path / "test-repo"
+        (repo_path / ".git").mkdir(parents=True)
+        (repo_path / ".git" / "shallow").write_text("abc123\n")
+        (repo_path / ".git" / "config").write_text("[rag-knowledge-system]\n\tmanaged = true\n")
+        result = loader.update_repo(repo_path)
+
+        assert result is True
+        assert mock_run.call_args_list[0][0][0] == [
+            "git",
+            "-C",
+            str(repo_path),
+            "fetch",
+            "--depth=1",
+            "--filter=blob:none",
+            "origin",
+            "HEAD",
+        ]
+        assert mock_run.call_args_list[1][0][0] == [
+            "git",
+            "-C",
+            str(repo_path),
+            "reset",
+            "--hard",
+            "FETCH_HEAD",
+        ]
+
+    @patch("subprocess.run")
+    def test_update_repo_shallow_not_cloned_by_loader(self, mock_run, tmp_path):
+        """Test that a shallow checkout the loader didn't create is only fast-forwarded."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        mock_run.return_value = Mock(returncode=0, stderr="")
+
+        repo_path = tmp_path / "test-repo"
+        (repo_path / ".git").mkdir(parents=True)
+        (repo_path / ".git" / "shallow").write_text("abc123\n")
+        (repo_path / ".git" / "config").write_text("[core]\n\tbare = false\n")
+        result = loader.update_repo(repo_path)
+
+        assert result is True
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        assert commands[1] == ["git", "-C", str(repo_path), "merge", "--ff-only", "FETCH_HEAD"]
+        assert not any("reset" in cmd for cmd in commands)
+
     @patch("subprocess.run")
     def test_update_repo_failure(self, mock_run, tmp_path):
         """Test failed repository update."""
@@ -157,6 +328,56 @@ class TestGitHubRepositoryLoader:
 
         assert result is False
 
+    @patch("subprocess.run")
+    def test_is_up_to_date(self, mock_run, tmp_path):
+        """Test comparing the local HEAD with the remote HEAD."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        mock_run.side_effect = [
+            Mock(returncode=0, stdout="abc123\n"),
+            Mock(returncode=0, stdout="abc123\tHEAD\n"),
+            Mock(returncode=0, stdout="abc123\n"),
+            Mock(returncode=0, stdout="def456\tHEAD\n"),
+        ]
+
+        assert loader.is_up_to_date(tmp_path) is True
+        assert loader.is_up_to_date(tmp_path) is False
+        assert mock_run.call_args_list[1][0][0] == [
+            "git",
+            "-C",
+            str(tmp_path),
+            "ls-remote",
+            "origin",
+            "HEAD",
+        ]
+
+    @patch("subprocess.run")
+    def test_is_up_to_date_error(self, mock_run, tmp_path):
+        """Test that an unreadable remote is treated as needing an update."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        mock_run.side_effect = subprocess.CalledProcessError(128, "git", stderr="Error")
+
+        assert loader.is_up_to_date(tmp_path) is False
+
+    @pytest.mark.asyncio
+    async def test_is_up_to_date_async(self, tmp_path):
+        """Test comparing HEADs through asyncio subprocesses."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        local_proc = Mock(returncode=0)
+        local_proc.communicate = AsyncMock(return_value=(b"abc123\n", b""))
+        remote_proc = Mock(returncode=0)
+        remote_proc.communicate = AsyncMock(return_value=(b"abc123\tHEAD\n", b""))
+
+        with patch(
+            "asyncio.create_subprocess_exec", AsyncMock(side_effect=[local_proc, remote_proc])
+        ):
+            assert await loader.is_up_to_date_async(tmp_path) is True
+
     def test_load_repository_not_exists(self):
         """Test loading from non-existent repository."""
         config = Mock(spec=Config)
@@ -189,8 +410,33 @@ class TestGitHubRepositoryLoader:
         # Check that original categories were preserved as subcategories
         assert "src" in docs[0].meta["subcategory"]
 
+    @pytest.mark.asyncio
+    async def test_process_repository_async_discards_off_event_loop(self, tmp_path):
+        """Test that the in-place delete fallback of a forced re-clone runs off the loop."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+        (tmp_path / "repo" / ".git").mkdir(parents=True)
+
+        deleted_on = []
+        with (
+            patch("src.github_loader.os.rename", side_effect=OSError("cross-device")),
+            patch(
+                "src.github_loader.shutil.rmtree",
+                side_effect=lambda path: deleted_on.append(threading.current_thread()),
+            ),
+            patch.object(loader, "clone_repo_async", return_value=False),
+        ):
+            docs, status = await loader.process_repository_async(
+                "owner/repo", tmp_path, force_clone=True
+            )
+
+        assert docs == []
+        assert "Failed to clone" in status
+        assert len(deleted_on) == 1
+        assert deleted_on[0] is not threading.main_thread()
+
     @patch.object(GitHubRepositoryLoader, "check_local_repo")
-    @patch.object(GitHubRepositoryLoader, "clone_repo")
+    @patch.object(GitHubRepositoryLoader, "clone_repo_async")
     @patch.object(GitHubRepositoryLoader, "load_repository")
     def test_process_repository_local_exists(self, mock_load, mock_clone, mock_check, tmp_path):
         """Test processing repository that exists locally."""
@@ -207,8 +453,24 @@ class TestGitHubRepositoryLoader:
         assert "Found local" in status
         mock_clone.assert_not_called()
 
+    @patch.object(GitHubRepositoryLoader, "check_local_repo", return_value=True)
+    @patch.object(GitHubRepositoryLoader, "is_up_to_date_async", return_value=True)
+    @patch.object(GitHubRepositoryLoader, "update_repo_async")
+    @patch.object(GitHubRepositoryLoader, "load_repository", return_value=[])
+    def test_process_repository_skips_update_when_current(
+        self, mock_load, mock_update, mock_current, mock_check, tmp_path
+    ):
+        """Test that an unchanged repository is not fetched again."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        loader.process_repository("owner/repo", tmp_path)
+
+        mock_current.assert_called_once_with(tmp_path / "repo")
+        mock_update.assert_not_called()
+
     @patch.object(GitHubRepositoryLoader, "check_local_repo")
-    @patch.object(GitHubRepositoryLoader, "clone_repo")
+    @patch.object(GitHubRepositoryLoader, "clone_repo_async")
     @patch.object(GitHubRepositoryLoader, "load_repository")
     def test_process_repository_needs_clone(self, mock_load, mock_clone, mock_check, tmp_path):
         """Test processing repository that needs cloning."""
@@ -237,17 +499,49 @@ class TestGitHubRepositoryLoader:
 
         # Mock process_repository
         with patch.object(loader, "process_repository") as mock_process:
-            mock_process.side_effect = [
-                ([Document(content="Doc1", meta={})], "Status1"),
-                ([Document(content="Doc2", meta={})], "Status2"),
-            ]
+            # Repositories are processed concurrently, so answer by identifier
+            mock_process.side_effect = lambda repo, *args: {
+                "owner1/repo1": ([Document(content="Doc1", meta={})], "Status1"),
+                "owner2/repo2": ([Document(content="Doc2", meta={})], "Status2"),
+            }[repo]
 
             docs, statuses = loader.process_repositories_from_file(repos_file, tmp_path)
 
-            assert len(docs) == 2
-            assert len(statuses) == 2
+            assert [doc.content for doc in docs] == ["Doc1", "Doc2"]
+            assert statuses[0].startswith("[1/2] Status1")
+            assert statuses[1].startswith("[2/2] Status2")
             assert mock_process.call_count == 2
 
+    def test_iter_repositories_from_file(self, tmp_path):
+        """Test streaming per-repository results, including failures."""
+        config = Mock(spec=Config)
+        loader = GitHubRepositoryLoader(config)
+
+        repos_file = tmp_path / "repos.txt"
+        repos_file.write_text("owner1/repo1\nowner2/repo2\nowner3/repo3\n")
+
+        def process(repo, *args):
+            if repo == "owner2/repo2":
+                raise RuntimeError("clone failed")
+            return [Document(content=repo, meta={})], "Status"
+
+        with patch.object(loader, "process_repository", side_effect=process):
+            results = sorted(
+                loader.iter_repositories_from_file(repos_file, tmp_path, max_workers=1),
+                key=lambda result: result.index,
+            )
+
+        assert [result.repo_identifier for result in results] == [
+            "owner1/repo1",
+            "owner2/repo2",
+            "owner3/repo3",
+        ]
+        assert [doc.content for doc in results[0].documents] == ["owner1/repo1"]
+        assert results[1].documents == []
+        assert isinstance(results[1].error, RuntimeError)
+        assert "clone failed" in results[1].status
+        assert results[2].error is None
+
     def test_process_repositories_from_file_not_exists(self):
         """Test processing from non-existent file."""
         config = Mock(spec=Config)
@@ -263,7 +557,7 @@ class TestGitHubRepositoryLoader:
         loader = GitHubRepositoryLoader(config)
 
         # Verify only .md is in allowed extensions
-        assert loader.allowed_extensions == [".md"]
+        assert loader.allowed_extensions == frozenset({".md"})
         assert ".py" not in loader.allowed_extensions
         assert ".js" not in loader.allowed_extensions
         assert ".txt" not in loader.allowed_extensions
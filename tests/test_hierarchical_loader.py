@@ -1,6 +1,9 @@
 """Tests for the HierarchicalDocumentLoader."""
 
+import mmap
+import os
 import tempfile
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
@@ -105,6 +108,20 @@ class TestHierarchicalDocumentLoader:
             doc_categories = {doc.meta["category"] for doc in documents}
             assert doc_categories == set(categories)
 
+    def test_repeated_metadata_values_are_shared(self):
+        """Test that folder metadata repeated across files uses one string object."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            nutrition_dir = root / "Health" / "Nutrition"
+            nutrition_dir.mkdir(parents=True)
+            (nutrition_dir / "a.txt").write_text("A")
+            (nutrition_dir / "b.txt").write_text("B")
+
+            first, second = self.loader.load_from_directory(root)
+
+            for key in ("category", "subcategory", "hierarchy_path", "file_type"):
+                assert first.meta[key] is second.meta[key]
+
     def test_empty_folders_handled(self):
         """Test that empty folders are handled gracefully."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -151,6 +168,69 @@ class TestHierarchicalDocumentLoader:
             assert doc.meta["hierarchy_level"] == 5
             assert "Level1/Level2/Level3/Level4/Level5" in doc.meta["hierarchy_path"]
 
+    def test_parallel_loading_matches_serial(self):
+        """Test that threaded loading returns the same documents in the same order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for folder in ("A", "B", "C"):
+                (root / folder).mkdir()
+                for i in range(10):
+                    (root / folder / f"doc{i}.md").write_text(f"{folder} {i}")
+
+            serial = HierarchicalDocumentLoader(max_workers=1).load_from_directory(root)
+            parallel = HierarchicalDocumentLoader(max_workers=8).load_from_directory(root)
+
+            assert len(parallel) == 30
+            assert [doc.content for doc in parallel] == [doc.content for doc in serial]
+
+    def test_thread_pool_shared_across_loads(self):
+        """Test that one thread pool serves every load until the loader is closed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "notes.md").write_text("Notes")
+
+            with HierarchicalDocumentLoader(max_workers=2) as loader:
+                loader.load_from_directory(root)
+                executor = loader._get_executor()
+                loader.load_from_directory(root)
+
+                assert loader._get_executor() is executor
+
+            assert loader._executor is None
+            with pytest.raises(RuntimeError):
+                executor.submit(print)
+
+    def test_iter_from_directory_reads_ahead_boundedly(self):
+        """Test that streaming only loads a bounded window of files ahead of the consumer."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for i in range(20):
+                (root / f"doc{i}.md").write_text(f"Doc {i}")
+
+            loader = HierarchicalDocumentLoader(max_workers=2)
+            with patch.object(
+                loader, "_read_file_content", wraps=loader._read_file_content
+            ) as mock_read:
+                documents = loader.iter_from_directory(root)
+                first = next(documents)
+
+                assert first.content.startswith("Doc ")
+                assert mock_read.call_count <= 5
+                assert len(list(documents)) == 19
+
+    def test_directory_symlink_cycle_not_followed(self):
+        """Test that a symlinked directory pointing back up the tree is not descended into."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            nested = root / "Docs" / "Nested"
+            nested.mkdir(parents=True)
+            (nested / "notes.txt").write_text("Notes")
+            (nested / "loop").symlink_to(root, target_is_directory=True)
+
+            documents = self.loader.load_from_directory(root)
+
+            assert [doc.meta["file_name"] for doc in documents] == ["notes.txt"]
+
     def test_file_type_filtering(self):
         """Test that only supported file types are loaded."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -176,9 +256,44 @@ class TestHierarchicalDocumentLoader:
             assert "image_file.jpg" not in loaded_files
             assert "binary_file.exe" not in loaded_files
 
+    def test_file_type_filtering_is_case_insensitive(self):
+        """Test that extension filtering ignores case on both sides."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "upper.MD").write_text("# Upper")
+            (root / "lower.md").write_text("# Lower")
+            (root / "notes.txt").write_text("Text")
+
+            documents = self.loader.load_from_directory(root, allowed_extensions=[".Md"])
+
+            loaded_files = {doc.meta["file_name"] for doc in documents}
+            assert loaded_files == {"upper.MD", "lower.md"}
+
+    def test_build_folder_hierarchy_from_drive_paths(self):
+        """Test that Drive folder paths are resolved through shared and deep ancestor chains."""
+        folders = [
+            {"id": "health", "name": "Health", "parents": ["root_id"]},
+            {"id": "nutrition", "name": "Nutrition", "parents": ["health"]},
+            {"id": "vitamins", "name": "Vitamins", "parents": ["nutrition"]},
+            {"id": "exercise", "name": "Exercise", "parents": ["health"]},
+            {"id": "orphan", "name": "Orphan", "parents": ["elsewhere"]},
+        ]
+        folders += [
+            {"id": f"deep{i}", "name": f"D{i}", "parents": [f"deep{i - 1}" if i else "root_id"]}
+            for i in range(2000)
+        ]
+
+        folder_map = self.loader._build_folder_hierarchy_from_drive(folders, "root_id")
+
+        assert folder_map["root_id"]["path"] == "root"
+        assert folder_map["vitamins"]["path"] == "Health/Nutrition/Vitamins"
+        assert folder_map["exercise"]["path"] == "Health/Exercise"
+        assert folder_map["orphan"]["path"] == "Orphan"
+        assert folder_map["deep1999"]["path"] == "/".join(f"D{i}" for i in range(2000))
+
     def test_google_drive_integration(self):
         """Test loading hierarchical structure from Google Drive."""
-        with patch("src.hierarchical_loader.GoogleDriveLoader") as mock_gdrive:
+        with patch("src.document_loader.GoogleDriveLoader") as mock_gdrive:
             # Mock Google Drive loader
             mock_loader = MagicMock()
             mock_gdrive.return_value = mock_loader
@@ -191,22 +306,22 @@ class TestHierarchicalDocumentLoader:
                     {"id": "folder2", "name": "Nutrition", "parents": ["folder1"]},
                 ]
 
-                # Mock load_documents to return different results per folder
-                # First call for root_folder_id, second for folder1, third for folder2
-                mock_loader.load_documents.side_effect = [
-                    [],  # root folder - no documents
-                    [],  # folder1 (Health) - no documents
-                    [  # folder2 (Nutrition) - has the document
-                        {
-                            "content": "Diet content",
-                            "metadata": {
-                                "name": "diet.txt",
-                                "id": "doc1",
-                                "mimeType": "text/plain",
+                # Only folder2 (Nutrition) lists a document
+                mock_loader.iter_folder_documents.return_value = iter(
+                    [
+                        (
+                            "folder2",
+                            {
+                                "content": "Diet content",
+                                "metadata": {
+                                    "name": "diet.txt",
+                                    "id": "doc1",
+                                    "mimeType": "text/plain",
+                                },
                             },
-                        }
-                    ],
-                ]
+                        )
+                    ]
+                )
 
                 # Load from Google Drive
                 config = Mock()
@@ -216,6 +331,11 @@ class TestHierarchicalDocumentLoader:
                 doc = documents[0]
                 # The document is in folder2 which should map to Health/Nutrition
                 assert doc.meta["source"] == "google_drive"
+                assert doc.meta["category"] == "Health"
+                assert doc.meta["subcategory"] == "Nutrition"
+                mock_loader.iter_folder_documents.assert_called_once_with(
+                    ["root_folder_id", "folder1", "folder2"], None
+                )
 
     def test_metadata_preservation(self):
         """Test that existing metadata is preserved when adding hierarchical metadata."""
@@ -255,7 +375,7 @@ class TestHierarchicalDocumentLoader:
             (restricted_dir / "file.txt").write_text("Content")
 
             # Mock permission error
-            with patch("pathlib.Path.iterdir", side_effect=PermissionError("Access denied")):
+            with patch("os.scandir", side_effect=PermissionError("Access denied")):
                 with pytest.raises(PermissionError, match="Access denied"):
                     self.loader.load_from_directory(root)
 
@@ -279,6 +399,127 @@ class TestHierarchicalDocumentLoader:
             assert len(documents) == 1
             assert documents[0].meta["file_name"] == "normal.txt"
 
+    def test_large_file_not_read(self):
+        """Test that oversized files are skipped without reading their content."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "large.md").write_bytes(b"x" * (2 * 1024 * 1024))
+            (root / "small.md").write_text("Small content")
+
+            with patch.object(
+                self.loader, "_read_file_content", return_value="Small content"
+            ) as mock_read:
+                documents = self.loader.load_from_directory(root, max_file_size_mb=1)
+
+            mock_read.assert_called_once_with(root / "small.md", len("Small content"))
+            assert documents[0].meta["file_size_bytes"] == len("Small content")
+
+    def test_empty_file_not_opened(self):
+        """Test that zero-byte files are skipped from their size without being read."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "empty.md").write_text("")
+            (root / ".md").write_text("Hidden file without an extension")
+            (root / "notes.md").write_text("Notes")
+
+            with patch.object(
+                self.loader, "_read_file_content", wraps=self.loader._read_file_content
+            ) as mock_read:
+                documents = self.loader.load_from_directory(root)
+
+            mock_read.assert_called_once_with(root / "notes.md", len("Notes"))
+            assert [doc.meta["file_name"] for doc in documents] == ["notes.md"]
+
+    def test_directory_entry_stat_reused(self):
+        """Test that the stat result cached on the directory entry is passed to the loader."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "notes.md").write_text("Notes")
+
+            with patch.object(self.loader, "_load_file", wraps=self.loader._load_file) as mock_load:
+                documents = self.loader.load_from_directory(root)
+
+            file_stats = mock_load.call_args.args[-1]
+            assert isinstance(file_stats, os.stat_result)
+            assert documents[0].meta["file_size_bytes"] == file_stats.st_size
+
+    def test_timestamps_keep_full_precision(self):
+        """Test that file timestamps are stored as ISO strings without truncation."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "notes.md"
+            file_path.write_text("Notes")
+            os.utime(file_path, (1700000000.75, 1700000000.75))
+
+            documents = self.loader.load_from_directory(Path(tmpdir))
+
+            assert documents[0].meta["modified_date"] == (
+                datetime.fromtimestamp(1700000000.75).isoformat()
+            )
+
+    def test_read_file_content_normalizes_newlines(self):
+        """Test that text files are decoded with universal newlines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "notes.md"
+            file_path.write_bytes("line one\r\nline two\rcaf\xc3\xa9".encode("latin-1"))
+
+            content = self.loader._read_file_content(file_path)
+
+            assert content == "line one\nline two\ncafé"
+
+    def test_read_file_content_memory_maps_large_files(self):
+        """Test that files above the mmap threshold decode the same as small ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "notes.md"
+            file_path.write_bytes(b"line one\r\ncaf\xc3\xa9 \xff" * 1000)
+            expected = self.loader._read_file_content(file_path)
+
+            with patch.object(self.loader, "MMAP_THRESHOLD", 1024):
+                with patch("src.hierarchical_loader.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+                    content = self.loader._read_file_content(file_path)
+
+            mock_mmap.assert_called_once()
+            assert content == expected == "line one\ncafé " * 1000
+
+    def test_known_file_size_skips_fstat(self):
+        """Test that the size from the directory walk is reused instead of an fstat per file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "notes.md").write_text("Notes")
+
+            with patch("src.hierarchical_loader.os.fstat", side_effect=AssertionError):
+                documents = self.loader.load_from_directory(root)
+
+            assert [doc.content for doc in documents] == ["Notes"]
+
+    def test_read_pdf_placeholder_reads_only_the_start(self):
+        """Test that without pypdf, PDFs keep a raw-text placeholder read from the file start."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "scan.pdf"
+            raw = b"%PDF-1.4 \xff\xfe caf\xc3\xa9 " * 20000
+            file_path.write_bytes(raw)
+
+            with (
+                patch("src.hierarchical_loader._pdf_reader_class", return_value=None),
+                patch.object(self.loader, "PREFIX_READ_SIZE", 1000),
+                patch.object(self.loader, "_decode_file", side_effect=AssertionError),
+            ):
+                content = self.loader._read_file_content(file_path)
+
+            assert content == raw.decode("utf-8", errors="ignore")[:1000]
+
+    def test_read_pdf_with_pypdf(self):
+        """Test that PDF text is extracted page by page when pypdf is available."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "report.pdf"
+            file_path.write_bytes(b"%PDF-1.4")
+            pages = [Mock(**{"extract_text.return_value": text}) for text in ("Page 1", None)]
+            mock_reader_class = Mock(return_value=Mock(pages=pages))
+
+            with patch("src.hierarchical_loader._pdf_reader_class", return_value=mock_reader_class):
+                content = self.loader._read_file_content(file_path)
+
+            assert content == "Page 1\n"
+
     def test_duplicate_file_names_different_folders(self):
         """Test handling of duplicate file names in different folders."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -92,6 +92,51 @@ class TestHierarchicalDocumentSplitter:
             parent_exists = any(p.meta["chunk_id"] == parent_id for p in parents)
             assert parent_exists, f"Child chunk has invalid parent_id: {parent_id}"
 
+    def test_parent_assignment_picks_largest_overlap(self):
+        """Test that each chunk gets the earliest parent with the largest word overlap."""
+        content = " ".join(["word" + str(i) for i in range(5321)])
+        doc = Document(content=content, meta={"file_name": "test.txt"})
+
+        chunks = self.splitter.split_documents([doc])
+
+        by_level = {
+            level: [c for c in chunks if c.meta["chunk_level"] == level]
+            for level in ("parent", "child", "grandchild")
+        }
+        for level, parent_level in (("child", "parent"), ("grandchild", "child")):
+            for chunk in by_level[level]:
+                start, end = chunk.meta["chunk_start"], chunk.meta["chunk_end"]
+                overlaps = [
+                    min(end, p.meta["chunk_end"]) - max(start, p.meta["chunk_start"])
+                    for p in by_level[parent_level]
+                ]
+                expected = by_level[parent_level][overlaps.index(max(overlaps))]
+                assert chunk.meta["parent_id"] == expected.meta["chunk_id"]
+
+    def test_total_chunks_matches_level_count(self):
+        """Test that every chunk records how many chunks its level has."""
+        for word_count in (151, 500, 1999, 2000, 5321):
+            doc = Document(content=" ".join(["word"] * word_count))
+
+            chunks = self.splitter.split_documents([doc])
+
+            for level in ("parent", "child", "grandchild"):
+                level_chunks = [c for c in chunks if c.meta["chunk_level"] == level]
+                assert all(c.meta["total_chunks"] == len(level_chunks) for c in level_chunks)
+
+    def test_iter_chunks_matches_split_documents(self):
+        """Test that lazily splitting yields the same chunks as split_documents."""
+        docs = [
+            Document(content=" ".join(["word"] * 2500)),
+            Document(content=" ".join(["word"] * 100)),
+        ]
+
+        chunks = self.splitter.iter_chunks(iter(docs))
+
+        assert [(c.content, c.meta) for c in chunks] == [
+            (c.content, c.meta) for c in self.splitter.split_documents(docs)
+        ]
+
     def test_chunk_overlap(self):
         """Test that chunks have proper overlap."""
         # Create content where we can verify overlap
@@ -205,6 +250,21 @@ class TestHierarchicalDocumentSplitter:
         # All IDs should be unique
         assert len(chunk_ids) == len(set(chunk_ids))
 
+    def test_doc_id_independent_of_batch_position(self):
+        """Test that chunk IDs come from the document hash, not its position in the batch."""
+        first = Document(content=" ".join(["alpha"] * 600), meta={"file_name": "a.md"})
+        second = Document(content=" ".join(["beta"] * 600), meta={"file_name": "a.md"})
+
+        # Each document is first in its own batch, as when the GitHub path splits in batches
+        first_ids = {c.meta["chunk_id"] for c in self.splitter.split_documents([first])}
+        second_ids = {c.meta["chunk_id"] for c in self.splitter.split_documents([second])}
+
+        assert first_ids.isdisjoint(second_ids)
+        assert self.splitter._generate_doc_id(first) == self.splitter._generate_doc_id(
+            Document(content=first.content, meta={"file_name": "a.md"})
+        )
+        assert self.splitter._generate_doc_id(first).startswith("a.md_")
+
     def test_auto_merging_preparation(self):
         """Test that chunks are prepared for auto-merging retrieval."""
         doc = Document(
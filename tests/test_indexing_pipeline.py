@@ -1,9 +1,17 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
+from haystack import Document
+from haystack_integrations.document_stores.qdrant.converters import (
+    convert_haystack_documents_to_qdrant_points,
+)
+from qdrant_client import models
 
 from src.config import Config
-from src.indexing_pipeline import IndexingPipeline
+from src.indexing_pipeline import IndexingPipeline, _to_qdrant_batch
 
 
 class TestIndexingPipeline:
@@ -11,8 +19,6 @@ class TestIndexingPipeline:
 
     def setup_method(self):
         """Setup test fixtures."""
-        # Reset singleton instance
-        Config._instance = None
         self.config = Config()
         self.config.qdrant_url = "http://localhost:6333"
         self.config.qdrant_collection_name = "test_collection"
@@ -44,8 +50,47 @@ class TestIndexingPipeline:
             embedding_dim=1024,  # mxbai-embed-large dimension
             wait_result_from_api=True,
             recreate_index=False,
+            payload_fields_to_index=[
+                {"field_name": "meta.mimeType", "field_schema": models.PayloadSchemaType.KEYWORD},
+                {"field_name": "meta.category", "field_schema": models.PayloadSchemaType.KEYWORD},
+                {"field_name": "meta.file_type", "field_schema": models.PayloadSchemaType.KEYWORD},
+            ],
         )
 
+    @patch("src.indexing_pipeline.QdrantDocumentStore")
+    def test_setup_document_store_recreate(self, mock_qdrant):
+        """Test that recreate clears the collection with a single store setup."""
+        mock_store = Mock()
+        mock_qdrant.return_value = mock_store
+
+        pipeline = IndexingPipeline(self.config)
+        pipeline.setup_document_store(recreate=True)
+
+        mock_qdrant.assert_called_once()
+        assert mock_qdrant.call_args.kwargs["recreate_index"] is True
+        mock_store._initialize_client.assert_called_once()
+
+    @patch("src.indexing_pipeline.QdrantDocumentStore")
+    def test_setup_document_store_with_quantization(self, mock_qdrant):
+        """Test that configured quantization is passed to the document store."""
+        self.config.qdrant_quantization = "scalar"
+
+        pipeline = IndexingPipeline(self.config)
+        pipeline.setup_document_store()
+
+        quantization_config = mock_qdrant.call_args.kwargs["quantization_config"]
+        assert isinstance(quantization_config, models.ScalarQuantization)
+        assert quantization_config.scalar.type == models.ScalarType.INT8
+        assert mock_qdrant.call_args.kwargs["on_disk"] is True
+
+    def test_get_quantization_config_invalid(self):
+        """Test that an unknown quantization setting raises error."""
+        self.config.qdrant_quantization = "product"
+        pipeline = IndexingPipeline(self.config)
+
+        with pytest.raises(ValueError, match="Unsupported quantization"):
+            pipeline.get_quantization_config()
+
     @patch("src.indexing_pipeline.Pipeline")
     @patch("src.indexing_pipeline.OllamaDocumentEmbedder")
     @patch("src.indexing_pipeline.DocumentSplitter")
@@ -72,8 +117,12 @@ class TestIndexingPipeline:
 
         # Verify component creation
         mock_embedder.assert_called_once_with(
-            model="mxbai-embed-large", url="http://localhost:11434"
+            model="mxbai-embed-large",
+            url="http://localhost:11434",
+            batch_size=self.config.ollama_embedding_batch_size,
+            progress_bar=False,
         )
+        assert pipeline._embedder == mock_embedder_instance
         mock_splitter.assert_called_once_with(split_by="word", split_length=500, split_overlap=50)
         mock_writer.assert_called_once_with(document_store=pipeline.document_store)
 
@@ -81,6 +130,34 @@ class TestIndexingPipeline:
         assert mock_pipeline_instance.add_component.call_count == 3
         assert mock_pipeline_instance.connect.call_count == 2
 
+    @patch("src.indexing_pipeline.Pipeline")
+    @patch("src.indexing_pipeline.OllamaDocumentEmbedder")
+    @patch("src.indexing_pipeline.DocumentSplitter")
+    @patch("src.indexing_pipeline.DocumentWriter")
+    def test_create_indexing_pipeline_reuses_built_pipeline(
+        self, mock_writer, mock_splitter, mock_embedder, mock_pipeline
+    ):
+        """Test that the pipeline is only rebuilt when its store or settings change."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+
+        pipeline.create_indexing_pipeline()
+        pipeline.create_indexing_pipeline()
+        assert mock_pipeline.call_count == 1
+
+        self.config.chunk_size = 300
+        pipeline.create_indexing_pipeline()
+        assert mock_pipeline.call_count == 2
+
+        pipeline.document_store = Mock()
+        pipeline.create_indexing_pipeline()
+        assert mock_pipeline.call_count == 3
+
+        pipeline.cleanup()
+        pipeline.document_store = Mock()
+        pipeline.create_indexing_pipeline()
+        assert mock_pipeline.call_count == 4
+
     def test_create_pipeline_without_document_store(self):
         """Test that creating pipeline without document store raises error."""
         pipeline = IndexingPipeline(self.config)
@@ -188,6 +265,44 @@ class TestIndexingPipeline:
         assert result["documents_written"] == 2
         mock_pipeline.run.assert_called_once()
 
+    def test_process_documents_bulk_mode_restores_indexing(self):
+        """Test that bulk mode pauses HNSW indexing and restores it even if the run fails."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+        pipeline.pipeline = Mock(**{"run.side_effect": RuntimeError("Ollama unavailable")})
+        raw_documents = [{"content": "Test", "metadata": {"mimeType": "text/plain"}}]
+
+        with (
+            patch.object(pipeline, "get_indexing_threshold", return_value=12345),
+            patch.object(pipeline, "set_indexing_threshold") as mock_threshold,
+        ):
+            with pytest.raises(RuntimeError):
+                pipeline.process_documents(raw_documents, bulk_mode=True)
+
+        assert [c.args for c in mock_threshold.call_args_list] == [(0,), (12345,)]
+
+    def test_process_documents_streaming(self):
+        """Test that a raw document stream is run through the pipeline in batches."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.pipeline = Mock()
+        pipeline.pipeline.run.side_effect = lambda data: {
+            "writer": {"documents_written": 2 * len(data["splitter"]["documents"])}
+        }
+        raw_documents = (
+            {"content": f"Doc {i}".encode(), "metadata": {"mimeType": mime_type}}
+            for i, mime_type in enumerate(["text/plain"] * 4 + ["image/png"] + ["text/plain"])
+        )
+
+        result = pipeline.process_documents_streaming(raw_documents, batch_size=2)
+
+        batches = [c.args[0]["splitter"]["documents"] for c in pipeline.pipeline.run.call_args_list]
+        assert [[doc.content for doc in batch] for batch in batches] == [
+            ["Doc 0", "Doc 1"],
+            ["Doc 2", "Doc 3"],
+            ["Doc 5"],
+        ]
+        assert result == {"documents_processed": 5, "documents_written": 10}
+
     def test_get_collection_info_without_document_store(self):
         """Test getting collection info without document store raises error."""
         pipeline = IndexingPipeline(self.config)
@@ -235,3 +350,259 @@ class TestIndexingPipeline:
 
         assert pipeline.document_store is None
         assert pipeline.pipeline is None
+
+    @patch("src.indexing_pipeline.OllamaDocumentEmbedder")
+    def test_process_documents_hierarchical_reuses_embedder(self, mock_embedder):
+        """Test that hierarchical batches share one batching embedder."""
+        self.config.ollama_embedding_batch_size = 64
+        mock_embedder.return_value.run.side_effect = lambda docs: {"documents": docs}
+
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+        with patch.object(pipeline, "_write_documents", return_value=1):
+            for _ in range(2):
+                pipeline.process_documents_hierarchical([Document(content="Some content")])
+
+        mock_embedder.assert_called_once_with(
+            model="mxbai-embed-large",
+            url="http://localhost:11434",
+            batch_size=64,
+            progress_bar=False,
+        )
+        assert mock_embedder.return_value.run.call_count == 2
+
+    def test_process_documents_hierarchical_writes_in_slabs(self):
+        """Test that chunks are embedded and written a slab at a time."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+        pipeline.CHUNK_SLAB_SIZE = 4
+        documents = [Document(content=" ".join([f"doc{i}"] * 50)) for i in range(10)]
+
+        with (
+            patch.object(pipeline, "_embed_documents", side_effect=lambda docs: docs) as embed,
+            patch.object(pipeline, "_write_documents", side_effect=len) as write,
+        ):
+            result = pipeline.process_documents_hierarchical(documents)
+
+        assert [len(c.args[0]) for c in embed.call_args_list] == [4, 4, 2]
+        assert write.call_count == 3
+        assert result["chunks_created"] == 10
+        assert result["chunks_written"] == 10
+
+    def test_process_documents_hierarchical_overlaps_embedding_and_writing(self):
+        """Test that the next slab is embedded while the previous one is being written."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+        pipeline.CHUNK_SLAB_SIZE = 2
+        documents = [Document(content=" ".join([f"doc{i}"] * 50)) for i in range(4)]
+        embeds = []
+        second_embed_started = threading.Event()
+        overlapped = []
+
+        def embed(docs):
+            embeds.append(docs)
+            if len(embeds) == 2:
+                second_embed_started.set()
+            return docs
+
+        def write(docs):
+            if docs is embeds[0]:
+                overlapped.append(second_embed_started.wait(timeout=5))
+            return len(docs)
+
+        with (
+            patch.object(pipeline, "_embed_documents", side_effect=embed),
+            patch.object(pipeline, "_write_documents", side_effect=write),
+        ):
+            result = pipeline.process_documents_hierarchical(documents)
+
+        assert overlapped == [True]
+        assert result["chunks_written"] == 4
+
+    def test_embed_documents_embeds_repeated_text_once(self):
+        """Test that chunks with identical text are embedded once and share the vector."""
+        documents = [Document(content=text) for text in ("a b", "c d", "a b", "a b")]
+
+        def embed(batch):
+            for doc in batch:
+                doc.embedding = [float(len(doc.content))]
+            return {"documents": batch}
+
+        pipeline = IndexingPipeline(self.config)
+        pipeline._embedder = Mock(**{"run.side_effect": embed})
+
+        embedded = pipeline._embed_documents(documents)
+
+        assert embedded == documents
+        assert all(doc.embedding == [3.0] for doc in embedded)
+        assert [doc.content for doc in pipeline._embedder.run.call_args.args[0]] == ["a b", "c d"]
+
+    def test_embed_documents_skips_cached_text(self, tmp_path):
+        """Test that only texts missing from the embedding cache are sent to the embedder."""
+        self.config.embedding_cache_path = str(tmp_path / "embeddings.sqlite")
+
+        def embed(batch):
+            for doc in batch:
+                doc.embedding = [float(len(doc.content))]
+            return {"documents": batch}
+
+        mock_embedder = Mock(**{"run.side_effect": embed})
+        pipeline = IndexingPipeline(self.config)
+        pipeline._embedder = mock_embedder
+        pipeline._embed_documents([Document(content="cached")])
+
+        embedded = pipeline._embed_documents(
+            [Document(content="cached"), Document(content="new text")]
+        )
+        pipeline.cleanup()
+
+        assert [doc.embedding for doc in embedded] == [[6.0], [8.0]]
+        sent = [[doc.content for doc in c.args[0]] for c in mock_embedder.run.call_args_list]
+        assert sent == [["cached"], ["new text"]]
+
+    def test_write_documents_upserts_batches(self):
+        """Test that embedded chunks are upserted in fixed-size batches."""
+        self.config.qdrant_write_batch_size = 64
+        self.config.qdrant_write_concurrency = 2
+        documents = [Document(content=f"Chunk {i}", embedding=[0.1, 0.2]) for i in range(150)]
+
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock(use_sparse_embeddings=False)
+        mock_client = pipeline.document_store._client
+
+        written = pipeline._write_documents(documents)
+
+        assert written == 150
+        batches = [c.kwargs["points"] for c in mock_client.upsert.call_args_list]
+        assert sorted(len(batch.ids) for batch in batches) == [22, 64, 64]
+        upserted = [payload for batch in batches for payload in batch.payloads]
+        assert {p["content"] for p in upserted} == {doc.content for doc in documents}
+        assert all(
+            c.kwargs["collection_name"] == "test_collection"
+            for c in mock_client.upsert.call_args_list
+        )
+
+    def test_to_qdrant_batch_matches_point_conversion(self):
+        """Test that the column-oriented batch carries the same data as per-document points."""
+        documents = [
+            Document(content="First", meta={"category": "Health"}, embedding=[0.1, 0.2]),
+            Document(content="Second", meta={"chunk_level": "child"}, embedding=[0.3, 0.4]),
+        ]
+
+        batch = _to_qdrant_batch(documents)
+
+        points = convert_haystack_documents_to_qdrant_points(documents, use_sparse_embeddings=False)
+        assert batch.ids == [p.id for p in points]
+        assert batch.vectors == [p.vector for p in points]
+        assert batch.payloads == [p.payload for p in points]
+
+    def test_embed_documents_runs_batches_concurrently(self):
+        """Test that embedding batches run in parallel and come back in input order."""
+        self.config.ollama_embedding_batch_size = 2
+        self.config.ollama_concurrency = 3
+        documents = [Document(content=f"Chunk {i}") for i in range(7)]
+        running = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def embed(batch):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            time.sleep(0.05)
+            for doc in batch:
+                doc.embedding = [float(doc.content.split()[1])]
+            with lock:
+                running["now"] -= 1
+            return {"documents": batch}
+
+        pipeline = IndexingPipeline(self.config)
+        pipeline._embedder = Mock(**{"run.side_effect": embed})
+
+        embedded = pipeline._embed_documents(documents)
+
+        assert [doc.embedding for doc in embedded] == [[float(i)] for i in range(7)]
+        assert pipeline._embedder.run.call_count == 4
+        assert 1 < running["max"] <= 3
+
+    def test_process_documents_hierarchical_batched(self):
+        """Test that documents are indexed in batches with HNSW indexing paused in bulk mode."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+
+        with (
+            patch.object(pipeline, "process_documents_hierarchical") as mock_process,
+            patch.object(pipeline, "get_indexing_threshold", return_value=12345),
+            patch.object(pipeline, "set_indexing_threshold") as mock_threshold,
+        ):
+            mock_process.side_effect = lambda batch: {
+                "documents_processed": len(batch),
+                "chunks_created": len(batch) * 3,
+                "chunks_written": len(batch) * 3,
+            }
+
+            result = pipeline.process_documents_hierarchical_batched(
+                (Mock() for _ in range(5)), batch_size=2, bulk_mode=True
+            )
+
+        assert [len(c.args[0]) for c in mock_process.call_args_list] == [2, 2, 1]
+        assert result == {"documents_processed": 5, "chunks_created": 15, "chunks_written": 15}
+        # The collection's own threshold is restored, not Qdrant's default
+        assert [c.args for c in mock_threshold.call_args_list] == [(0,), (12345,)]
+
+    def test_get_indexing_threshold(self):
+        """Test reading the collection threshold, falling back to Qdrant's default."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+        collection = pipeline.document_store._client.get_collection.return_value
+
+        collection.config.optimizer_config.indexing_threshold = 5000
+        assert pipeline.get_indexing_threshold() == 5000
+
+        collection.config.optimizer_config.indexing_threshold = None
+        assert pipeline.get_indexing_threshold() == IndexingPipeline.DEFAULT_INDEXING_THRESHOLD
+
+    def test_process_documents_hierarchical_batched_with_workers(self):
+        """Test that batches are dispatched to worker pipelines and totals aggregated."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+
+        def thread_pool(max_workers, mp_context, initializer, initargs):
+            return ThreadPoolExecutor(max_workers, initializer=initializer, initargs=initargs)
+
+        with (
+            patch("src.indexing_pipeline.ProcessPoolExecutor", side_effect=thread_pool),
+            patch.object(IndexingPipeline, "setup_document_store"),
+            patch.object(IndexingPipeline, "set_indexing_threshold"),
+            patch.object(IndexingPipeline, "process_documents_hierarchical") as mock_process,
+        ):
+            mock_process.side_effect = lambda batch: {
+                "documents_processed": len(batch),
+                "chunks_created": len(batch) * 2,
+                "chunks_written": len(batch) * 2,
+                "result": {},
+            }
+
+            result = pipeline.process_documents_hierarchical_batched(
+                (Mock() for _ in range(7)), batch_size=2, workers=2
+            )
+
+        assert mock_process.call_count == 4
+        assert result == {"documents_processed": 7, "chunks_created": 14, "chunks_written": 14}
+
+    def test_process_documents_hierarchical_batched_without_bulk_mode(self):
+        """Test that HNSW indexing settings are left alone outside bulk mode."""
+        pipeline = IndexingPipeline(self.config)
+        pipeline.document_store = Mock()
+
+        with (
+            patch.object(pipeline, "process_documents_hierarchical") as mock_process,
+            patch.object(pipeline, "set_indexing_threshold") as mock_threshold,
+        ):
+            mock_process.return_value = {
+                "documents_processed": 1,
+                "chunks_created": 1,
+                "chunks_written": 1,
+            }
+            pipeline.process_documents_hierarchical_batched([Mock()])
+
+        mock_threshold.assert_not_called()
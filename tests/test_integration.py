@@ -1,6 +1,7 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from qdrant_client import models
 
 from src.chat_interface import ChatInterface
 from src.config import Config
@@ -14,8 +15,6 @@ class TestIntegration:
 
     def setup_method(self):
         """Setup test fixtures."""
-        # Reset singleton instance
-        Config._instance = None
         self.config = Config()
         self.config.google_credentials_path = "test_credentials.json"
         self.config.qdrant_url = "http://localhost:6333"
@@ -125,6 +124,10 @@ class TestIntegration:
             embedding_dim=1024,
             wait_result_from_api=True,
             recreate_index=False,
+            payload_fields_to_index=[
+                {"field_name": field, "field_schema": models.PayloadSchemaType.KEYWORD}
+                for field in IndexingPipeline.PAYLOAD_INDEX_FIELDS
+            ],
         )
 
         mock_query_qdrant.assert_called_once_with(
@@ -184,9 +187,6 @@ class TestIntegration:
             ]
         }
 
-        mock_prompt_builder = Mock()
-        mock_prompt_builder.run.return_value = {"prompt": "Generated prompt"}
-
         mock_generator = Mock()
         mock_generator.run.return_value = {
             "replies": ["This is a test answer about Python programming."]
@@ -194,7 +194,6 @@ class TestIntegration:
 
         query_pipeline.embedder = mock_embedder
         query_pipeline.retriever = mock_retriever
-        query_pipeline.prompt_builder = mock_prompt_builder
         query_pipeline.generator = mock_generator
         # No need to set pipeline - we use direct component calls
 
@@ -302,9 +301,6 @@ class TestIntegration:
                     ]
                 }
 
-                mock_prompt_builder = Mock()
-                mock_prompt_builder.run.return_value = {"prompt": "Generated prompt"}
-
                 mock_generator = Mock()
                 mock_generator.run.return_value = {
                     "replies": ["Python is a programming language known for simplicity."]
@@ -312,7 +308,6 @@ class TestIntegration:
 
                 query_pipeline.embedder = mock_embedder
                 query_pipeline.retriever = mock_retriever
-                query_pipeline.prompt_builder = mock_prompt_builder
                 query_pipeline.generator = mock_generator
                 # No need to set pipeline - we use direct component calls
 
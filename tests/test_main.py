@@ -72,13 +72,14 @@ class TestRAGSystem:
     @patch("src.main.GoogleDriveLoader")
     def test_load_and_index_documents_no_documents(self, mock_loader, orchestrator):
         """Test document loading with no documents found."""
-        # Setup pipelines
+        # Setup pipelines; indexing consumes the document stream like the real pipeline
         orchestrator.indexing_pipeline = Mock()
+        orchestrator.indexing_pipeline.process_documents_streaming.side_effect = list
         orchestrator.query_pipeline = Mock()
 
         # Setup loader mock
         mock_loader_instance = Mock()
-        mock_loader_instance.load_documents.return_value = []
+        mock_loader_instance.iter_documents.return_value = iter([])
         mock_loader.return_value = mock_loader_instance
 
         # Load documents
@@ -87,35 +88,38 @@ class TestRAGSystem:
         # Verify
         assert result is False
         mock_loader.assert_called_once_with(orchestrator.config)
-        mock_loader_instance.load_documents.assert_called_once_with("folder_id", max_documents=None)
+        mock_loader_instance.iter_documents.assert_called_once_with("folder_id", max_documents=None)
 
     @patch("src.main.GoogleDriveLoader")
     def test_load_and_index_documents_success(self, mock_loader, orchestrator):
         """Test successful document loading and indexing."""
         # Setup pipelines
         orchestrator.indexing_pipeline = Mock()
-        orchestrator.indexing_pipeline.process_documents = Mock()
+        orchestrator.indexing_pipeline.process_documents_streaming.side_effect = list
         orchestrator.query_pipeline = Mock()
 
         # Setup loader mock
         mock_loader_instance = Mock()
         mock_loader_instance.authenticate = Mock()  # Add authenticate mock
-        mock_loader_instance.load_documents.return_value = [
-            {"name": "doc1.txt", "content": "content1", "mime_type": "text/plain"},
-            {"name": "doc2.pdf", "content": "content2", "mime_type": "application/pdf"},
-        ]
+        mock_loader_instance.iter_documents.return_value = iter(
+            [
+                {"name": "doc1.txt", "content": "content1", "mime_type": "text/plain"},
+                {"name": "doc2.pdf", "content": "content2", "mime_type": "application/pdf"},
+            ]
+        )
         mock_loader.return_value = mock_loader_instance
 
         # Load documents
-        with patch.object(orchestrator, "_display_loaded_documents"):
+        with patch.object(orchestrator, "_display_loaded_documents") as mock_display:
             result = orchestrator.load_and_index_documents("folder_id", max_docs=10)
 
         # Verify
         assert result is True
         mock_loader.assert_called_once_with(orchestrator.config)
         mock_loader_instance.authenticate.assert_called_once()  # Verify authenticate was called
-        mock_loader_instance.load_documents.assert_called_once_with("folder_id", max_documents=10)
-        orchestrator.indexing_pipeline.process_documents.assert_called_once()
+        mock_loader_instance.iter_documents.assert_called_once_with("folder_id", max_documents=10)
+        orchestrator.indexing_pipeline.process_documents_streaming.assert_called_once()
+        assert mock_display.call_args.kwargs["total"] == 2
 
     def test_display_loaded_documents(self, orchestrator):
         """Test document display table."""
@@ -1,9 +1,12 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from haystack.components.builders import PromptBuilder
+from haystack.dataclasses import StreamingChunk
+from qdrant_client import models
 
 from src.config import Config
-from src.query_pipeline import QueryPipeline
+from src.query_pipeline import QueryPipeline, _prompt_format
 
 
 class TestQueryPipeline:
@@ -11,8 +14,6 @@ class TestQueryPipeline:
 
     def setup_method(self):
         """Setup test fixtures."""
-        # Reset singleton instance
-        Config._instance = None
         self.config = Config()
         self.config.qdrant_url = "http://localhost:6333"
         self.config.qdrant_collection_name = "test_collection"
@@ -49,10 +50,8 @@ class TestQueryPipeline:
     @patch("src.query_pipeline.OllamaGenerator")
     @patch("src.query_pipeline.OllamaTextEmbedder")
     @patch("src.query_pipeline.QdrantEmbeddingRetriever")
-    @patch("src.query_pipeline.PromptBuilder")
     def test_create_query_pipeline(
         self,
-        mock_prompt_builder,
         mock_retriever,
         mock_embedder,
         mock_generator,
@@ -65,8 +64,6 @@ class TestQueryPipeline:
         mock_retriever.return_value = mock_retriever_instance
         mock_generator_instance = Mock()
         mock_generator.return_value = mock_generator_instance
-        mock_prompt_builder_instance = Mock()
-        mock_prompt_builder.return_value = mock_prompt_builder_instance
 
         pipeline = QueryPipeline(self.config)
         pipeline.document_store = Mock()  # Mock document store
@@ -79,7 +76,6 @@ class TestQueryPipeline:
         assert pipeline.embedder == mock_embedder_instance
         assert pipeline.retriever == mock_retriever_instance
         assert pipeline.generator == mock_generator_instance
-        assert pipeline.prompt_builder == mock_prompt_builder_instance
 
         # Verify component creation
         mock_embedder.assert_called_once_with(
@@ -89,7 +85,6 @@ class TestQueryPipeline:
         mock_generator.assert_called_once_with(
             model="llama3.2:latest", url="http://localhost:11434"
         )
-        mock_prompt_builder.assert_called_once()
 
     def test_create_pipeline_without_document_store(self):
         """Test that creating pipeline without document store raises error."""
@@ -123,9 +118,6 @@ class TestQueryPipeline:
             ]
         }
 
-        mock_prompt_builder = Mock()
-        mock_prompt_builder.run.return_value = {"prompt": "Generated prompt with context"}
-
         mock_generator = Mock()
         mock_generator.run.return_value = {
             "replies": ["This is the generated answer based on the context."]
@@ -135,7 +127,6 @@ class TestQueryPipeline:
         pipeline.setup_document_store()
         pipeline.embedder = mock_embedder
         pipeline.retriever = mock_retriever
-        pipeline.prompt_builder = mock_prompt_builder
         pipeline.generator = mock_generator
         # No need to mock pipeline anymore - we use direct component calls
 
@@ -150,8 +141,9 @@ class TestQueryPipeline:
         # Verify component calls
         mock_embedder.run.assert_called_once_with(text="What is the capital of France?")
         mock_retriever.run.assert_called_once()
-        mock_prompt_builder.run.assert_called_once()
         mock_generator.run.assert_called_once()
+        prompt = mock_generator.run.call_args.kwargs["prompt"]
+        assert "Question: What is the capital of France?" in prompt
 
     @patch("src.query_pipeline.QdrantDocumentStore")
     def test_query_with_no_sources(self, mock_qdrant):
@@ -166,9 +158,6 @@ class TestQueryPipeline:
         mock_retriever = Mock()
         mock_retriever.run.return_value = {"documents": []}
 
-        mock_prompt_builder = Mock()
-        mock_prompt_builder.run.return_value = {"prompt": "Generated prompt without context"}
-
         mock_generator = Mock()
         mock_generator.run.return_value = {
             "replies": ["I could not find relevant information to answer your question."]
@@ -178,7 +167,6 @@ class TestQueryPipeline:
         pipeline.setup_document_store()
         pipeline.embedder = mock_embedder
         pipeline.retriever = mock_retriever
-        pipeline.prompt_builder = mock_prompt_builder
         pipeline.generator = mock_generator
         # No need to mock pipeline anymore - we use direct component calls
 
@@ -210,9 +198,6 @@ class TestQueryPipeline:
         mock_retriever = Mock()
         mock_retriever.run.return_value = {"documents": []}
 
-        mock_prompt_builder = Mock()
-        mock_prompt_builder.run.return_value = {"prompt": "Generated prompt"}
-
         mock_generator = Mock()
         mock_generator.run.return_value = {"replies": ["Answer"]}
 
@@ -220,7 +205,6 @@ class TestQueryPipeline:
         pipeline.setup_document_store()
         pipeline.embedder = mock_embedder
         pipeline.retriever = mock_retriever
-        pipeline.prompt_builder = mock_prompt_builder
         pipeline.generator = mock_generator
         # No need to mock pipeline anymore - we use direct component calls
 
@@ -230,6 +214,18 @@ class TestQueryPipeline:
         retriever_call_args = mock_retriever.run.call_args[1]
         assert retriever_call_args["top_k"] == 10
 
+    def test_query_with_filters(self):
+        """Test that metadata filters are passed through to the retriever."""
+        pipeline = QueryPipeline(self.config)
+        pipeline.embedder = Mock(**{"run.return_value": {"embedding": [0.1, 0.2, 0.3]}})
+        pipeline.retriever = Mock(**{"run.return_value": {"documents": []}})
+        pipeline.generator = Mock(**{"run.return_value": {"replies": ["Answer"]}})
+        filters = {"field": "meta.category", "operator": "==", "value": "Health"}
+
+        pipeline.query("test query", filters=filters)
+
+        assert pipeline.retriever.run.call_args.kwargs["filters"] == filters
+
     def test_get_collection_info_without_document_store(self):
         """Test getting collection info without document store raises error."""
         pipeline = QueryPipeline(self.config)
@@ -297,9 +293,6 @@ class TestQueryPipeline:
         mock_retriever = Mock()
         mock_retriever.run.return_value = {"documents": mock_docs}
 
-        mock_prompt_builder = Mock()
-        mock_prompt_builder.run.return_value = {"prompt": "Generated prompt with context"}
-
         mock_generator = Mock()
         mock_generator.run.return_value = {"replies": ["Generated answer"]}
 
@@ -307,7 +300,6 @@ class TestQueryPipeline:
         pipeline.setup_document_store()
         pipeline.embedder = mock_embedder
         pipeline.retriever = mock_retriever
-        pipeline.prompt_builder = mock_prompt_builder
         pipeline.generator = mock_generator
         # No need to mock pipeline anymore - we use direct component calls
 
@@ -320,8 +312,113 @@ class TestQueryPipeline:
         retriever_call_args = mock_retriever.run.call_args[1]
         assert retriever_call_args["top_k"] == 5
 
-        # Verify prompt builder call with formatted context
-        prompt_builder_call_args = mock_prompt_builder.run.call_args[1]
-        assert prompt_builder_call_args["question"] == "test query"
-        assert "Document 1 content" in prompt_builder_call_args["context"]
-        assert "Document 2 content" in prompt_builder_call_args["context"]
+        # Verify the prompt sent to the generator has the question and formatted context
+        prompt = mock_generator.run.call_args.kwargs["prompt"]
+        assert "Question: test query" in prompt
+        assert "Document 1 content" in prompt
+        assert "Document 2 content" in prompt
+
+    def test_query_streams_answer(self):
+        """Test that generated answer pieces are passed to the streaming callback."""
+
+        def generate(prompt, streaming_callback):
+            for token in ("Streamed ", "answer"):
+                streaming_callback(StreamingChunk(content=token))
+            return {"replies": ["Streamed answer"]}
+
+        pipeline = QueryPipeline(self.config)
+        pipeline.embedder = Mock(**{"run.return_value": {"embedding": [0.1, 0.2, 0.3]}})
+        pipeline.retriever = Mock(**{"run.return_value": {"documents": []}})
+        pipeline.generator = Mock(**{"run.side_effect": generate})
+        tokens = []
+
+        result = pipeline.query("test query", streaming_callback=tokens.append)
+
+        assert tokens == ["Streamed ", "answer"]
+        assert result["answer"] == "Streamed answer"
+
+    def test_prompt_format_matches_prompt_builder(self):
+        """Test that the format-string prompt renders exactly like the Jinja PromptBuilder."""
+        pipeline = QueryPipeline(self.config)
+        template = pipeline.get_default_prompt_template()
+        context = "[Document 1]\nSome {braced} text with {{ jinja }} syntax\n"
+
+        expected = PromptBuilder(template=template).run(question="Why {x}?", context=context)
+
+        prompt = _prompt_format(template).format(context=context, question="Why {x}?")
+        assert prompt == expected["prompt"]
+
+    @patch("src.query_pipeline.QdrantClient")
+    def test_query_batch(self, mock_client_class):
+        """Test that batch queries retrieve documents for every question in one request."""
+        mock_client = mock_client_class.return_value
+        mock_client.query_batch_points.return_value = [
+            Mock(
+                points=[
+                    models.ScoredPoint(
+                        id=i,
+                        version=0,
+                        score=0.9,
+                        payload={"content": f"Content {i}", "meta": {"name": f"doc{i}.txt"}},
+                    )
+                ]
+            )
+            for i in range(2)
+        ]
+
+        mock_embedder = Mock()
+        # One embedder returns a plain list, the other a dict, as query() accepts both
+        mock_embedder.run.side_effect = [
+            {"embedding": [0.1, 0.2]},
+            {"embedding": {"a": 0.3, "b": 0.4}},
+        ]
+        mock_generator = Mock()
+        mock_generator.run.side_effect = [{"replies": ["Answer 1"]}, {"replies": ["Answer 2"]}]
+
+        pipeline = QueryPipeline(self.config)
+        pipeline.embedder = mock_embedder
+        pipeline.retriever = Mock()
+        pipeline.generator = mock_generator
+
+        filters = {"field": "meta.category", "operator": "==", "value": "Health"}
+        results = pipeline.query_batch(["first question", "second question"], 3, filters)
+
+        assert [r["answer"] for r in results] == ["Answer 1", "Answer 2"]
+        assert results[1]["sources"][0]["metadata"]["name"] == "doc1.txt"
+
+        requests = mock_client.query_batch_points.call_args.kwargs["requests"]
+        assert [r.query for r in requests] == [[0.1, 0.2], [0.3, 0.4]]
+        assert all(r.limit == 3 and r.filter is not None for r in requests)
+        mock_client_class.assert_called_once_with(url=self.config.qdrant_url)
+        pipeline.retriever.run.assert_not_called()
+
+    def test_query_reuses_embedding_for_repeated_question(self):
+        """Test that asking the same question again skips the embedder."""
+        mock_embedder = Mock()
+        mock_embedder.run.side_effect = lambda text: {"embedding": [float(len(text))]}
+        mock_retriever = Mock()
+        mock_retriever.run.return_value = {"documents": []}
+        mock_generator = Mock()
+        mock_generator.run.return_value = {"replies": ["Answer"]}
+
+        pipeline = QueryPipeline(self.config)
+        pipeline.embedder = mock_embedder
+        pipeline.retriever = mock_retriever
+        pipeline.generator = mock_generator
+
+        for question in ("first question", "second", "first question"):
+            pipeline.query(question)
+
+        assert [c.kwargs["text"] for c in mock_embedder.run.call_args_list] == [
+            "first question",
+            "second",
+        ]
+        query_embeddings = [c.kwargs["query_embedding"] for c in mock_retriever.run.call_args_list]
+        assert query_embeddings == [[14.0], [6.0], [14.0]]
+
+        pipeline.cleanup()
+        pipeline.embedder = mock_embedder
+        pipeline.retriever = mock_retriever
+        pipeline.generator = mock_generator
+        pipeline.query("first question")
+        assert mock_embedder.run.call_count == 3